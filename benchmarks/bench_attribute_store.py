@@ -0,0 +1,106 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Memory kept for the attributes of a whole database of players, as PlayerAttributes objects
+and in an AttributeStore, and the cost of the bulk operations on each of them.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_attribute_store
+"""
+import gc
+import time
+import tracemalloc
+import uuid
+
+from ofm.core.db.generators import PlayerAttributeGenerator
+from ofm.core.football.attribute_store import AttributeStore
+from ofm.core.football.player_attributes import PlayerAttributes
+from ofm.core.football.positions import Positions
+
+NUM_PLAYERS = 20_000
+
+
+def measure(label: str, create):
+    gc.collect()
+    tracemalloc.start()
+    result = create()
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {memory / NUM_PLAYERS:8.1f} bytes per player")
+    return result, memory
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1e3:8.1f} ms")
+    return elapsed
+
+
+def main():
+    attr_gen = PlayerAttributeGenerator(99)
+    positions = list(Positions)
+    attributes_dicts = [
+        attr_gen.generate([positions[i % 4]], 50, 20).serialize()
+        for i in range(NUM_PLAYERS)
+    ]
+    player_ids = [uuid.uuid4() for _ in range(NUM_PLAYERS)]
+
+    def create_objects():
+        return [PlayerAttributes.get_from_dict(d) for d in attributes_dicts]
+
+    def create_store():
+        store = AttributeStore()
+        views = []
+        for player_id, attributes in zip(player_ids, create_objects()):
+            store.add(player_id, attributes)
+            views.append(store.get_attributes(player_id))
+        return store, views
+
+    _, before = measure("PlayerAttributes", create_objects)
+    (store, _), after = measure("AttributeStore + views", create_store)
+    print(
+        f"{'AttributeStore rows only':<40} {store.nbytes / NUM_PLAYERS:8.1f} bytes per player"
+    )
+    print(f"Memory per player: {before / after:.1f}x less")
+
+    def objects_overalls():
+        for attrs in create_objects():
+            for position in positions:
+                attrs.get_overall(position)
+
+    def store_overalls():
+        for position in positions:
+            store.get_overalls(position)
+
+    # Includes creating the objects, as the overalls are cached after the first call
+    timed("PlayerAttributes overalls (+ creation)", objects_overalls)
+    timed("PlayerAttributes creation only", create_objects)
+    timed("AttributeStore.get_overalls", store_overalls)
+    timed(
+        "AttributeStore.sort_by_overall",
+        lambda: store.sort_by_overall(player_ids, Positions.FW),
+    )
+    timed(
+        "AttributeStore.progress", lambda: store.progress(dict.fromkeys(player_ids, 1))
+    )
+
+
+if __name__ == "__main__":
+    main()
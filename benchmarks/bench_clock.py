@@ -0,0 +1,94 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Cost of the LiveGame clock (add_minutes and transition_game_status) over a match that goes
+to extra time, with and without the simulation engine.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_clock
+"""
+import time
+import uuid
+from datetime import timedelta
+
+from benchmarks.bench_estimator import get_teams
+from ofm.core.simulation import PitchPosition
+from ofm.core.simulation.event_type import EventType
+from ofm.core.simulation.events.pass_event import PassEvent
+from ofm.core.simulation.fixture import Fixture
+from ofm.core.simulation.game_state import GameState, SimulationStatus
+from ofm.core.simulation.simulation import LiveGame
+
+MATCHES = 20
+CLOCK_MATCHES = 2000
+
+
+def get_live_game(i: int) -> LiveGame:
+    home_team, away_team = get_teams()
+    fixture = Fixture(
+        uuid.UUID(int=i + 1),
+        uuid.uuid4(),
+        home_team.club.club_id,
+        away_team.club.club_id,
+        home_team.club.stadium,
+    )
+    live_game = LiveGame(fixture, home_team, away_team, True, True, True)
+    # Every match goes to extra time
+    live_game.is_tied = lambda: True
+    return live_game
+
+
+def play_until_penalty_shootout(live_game: LiveGame, with_engine: bool) -> int:
+    ticks = 0
+    while live_game.state.status != SimulationStatus.PENALTY_SHOOTOUT:
+        if with_engine:
+            live_game.engine.run()
+        live_game.add_minutes()
+        live_game.transition_game_status()
+        ticks += 1
+    return ticks
+
+
+def main():
+    live_games = [get_live_game(i) for i in range(MATCHES)]
+    start = time.perf_counter()
+    ticks = sum(play_until_penalty_shootout(game, True) for game in live_games)
+    match = (time.perf_counter() - start) / MATCHES
+
+    clock_game = get_live_game(0)
+    event = PassEvent(EventType.PASS, clock_game.state.copy())
+    event.duration = 5
+    clock_ticks = 0
+    elapsed = 0.0
+    for _ in range(CLOCK_MATCHES):
+        clock_game.engine.last_event = event
+        clock_game.state = GameState(
+            timedelta(0), SimulationStatus.NOT_STARTED, PitchPosition.MIDFIELD_CENTER
+        )
+        start = time.perf_counter()
+        clock_ticks += play_until_penalty_shootout(clock_game, False)
+        elapsed += time.perf_counter() - start
+
+    print(
+        f"{'Full match with extra time':<40} {match * 1e3:8.3f} ms ({ticks // MATCHES} events)"
+    )
+    print(f"{'Clock only, per tick':<40} {elapsed / clock_ticks * 1e6:8.3f} us")
+    print(f"{'Clock only, per match':<40} {elapsed / CLOCK_MATCHES * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Per-event cost of the commentary: formatting it right away, keeping it as templates, and
+not keeping it at all.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_commentary
+"""
+from benchmarks.bench_estimator import get_teams
+from benchmarks.bench_game_state import bench
+from ofm.core.simulation.commentary import (
+    CommentaryTemplate,
+    get_commentary,
+    no_commentary,
+)
+
+
+def main():
+    home_team, _ = get_teams()
+    player, receiving_player = home_team.formation.players[:2]
+
+    def formatted():
+        commentary = []
+        commentary.append(f"{player} passed the ball to {receiving_player}")
+        return commentary
+
+    def templates():
+        commentary = get_commentary()
+        commentary.add(CommentaryTemplate.PASS, player, receiving_player)
+        return commentary
+
+    before = bench("f-string (old)", formatted)
+    after = bench("Commentary.add", templates)
+    with no_commentary():
+        disabled = bench("Commentary.add, no commentary", templates)
+    bench("Commentary.render", templates().render)
+    print(
+        f"Commentary speedup: {before / after:.1f}x ({before / disabled:.1f}x disabled)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Time to play a 128-club cup, and several smaller cups at the same time with play_cups, in
+the current process and across a process pool.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_cup
+"""
+import json
+import os
+import time
+import uuid
+
+from ofm.core.db.generators import TeamGenerator
+from ofm.core.football.cup import Cup, play_cups
+from ofm.core.settings import Settings
+
+NUM_CLUBS = 128
+NUM_CUPS = 8
+# Not a power of two, so the best seeds get a bye
+CLUBS_PER_CUP = 12
+
+
+def main():
+    settings = Settings()
+    with open(settings.clubs_def, "r", encoding="utf-8") as fp:
+        clubs_def = json.load(fp)[:NUM_CLUBS]
+    with open(settings.fifa_conf, "r", encoding="utf-8") as fp:
+        fifa_conf = json.load(fp)
+
+    cpu_count = os.cpu_count() or 1
+    print(f"{cpu_count} CPUs")
+    for max_workers in sorted({1, cpu_count}):
+        # Matches played in the current process change the clubs, start from new ones
+        clubs = TeamGenerator(clubs_def, fifa_conf, seed=0).generate(1)
+        cup = Cup(uuid.UUID(int=0), "Cup", clubs, seed=0)
+        start = time.perf_counter()
+        winner = cup.play(max_workers)
+        elapsed = time.perf_counter() - start
+        num_matches = sum(len(results) for results in cup.results)
+        print(
+            f"{NUM_CLUBS} clubs, {max_workers:>3} workers {elapsed:8.2f} s "
+            f"({num_matches} matches, winner {cup.clubs[winner].name})"
+        )
+
+        clubs = TeamGenerator(clubs_def, fifa_conf, seed=0).generate(1)
+        cups = [
+            Cup(
+                uuid.UUID(int=i), f"Cup {i}", clubs[i::NUM_CUPS][:CLUBS_PER_CUP], seed=i
+            )
+            for i in range(NUM_CUPS)
+        ]
+        start = time.perf_counter()
+        play_cups(cups, max_workers)
+        elapsed = time.perf_counter() - start
+        num_matches = sum(len(results) for cup in cups for results in cup.results)
+        print(
+            f"{len(cups)} cups of {len(cups[0].clubs)} clubs, {max_workers:>3} workers "
+            f"{elapsed:8.2f} s ({num_matches} matches)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Cost of DB.load_club_objects for a generated database, compared to the old loader, which
+scanned every player for each club and read the squads file once per club. Also compares
+the JSON files with SQLiteDB for loading a single club and saving after a matchday, and
+loading the two clubs of a match with and without a ClubRepository.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_db_load
+"""
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from ofm.core.db.database import DB
+from ofm.core.db.repository import ClubRepository
+from ofm.core.db.sqlite_database import SQLiteDB
+from ofm.core.football.club import Club
+from ofm.core.football.player import Player, PlayerTeam
+from ofm.core.settings import Settings
+
+NUM_CLUBS = 200
+
+
+def load_club_objects_old(db: DB, clubs: list[dict], players: list[dict]) -> list:
+    _clubs = []
+    for club in clubs:
+        players_ = [
+            Player.get_from_dict(player)
+            for player in players
+            if player["id"] in club["squad"]
+        ]
+        squad = []
+        for playerteam_dict in db.load_club_squads(club["id"]):
+            for player in players_:
+                if player.player_id.int == playerteam_dict["player_id"]:
+                    squad.append(PlayerTeam.get_from_dict(playerteam_dict, players_))
+                    break
+        _clubs.append(Club.get_from_dict(club, squad))
+    return _clubs
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1e3:10.1f} ms")
+    return elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        settings = Settings(tmp_path, tmp_path / "settings.yaml")
+        default_settings = Settings()
+        settings.db = tmp_path
+        settings.squads_file = str(tmp_path / "squads.json")
+        settings.players_file = str(tmp_path / "players.json")
+        settings.clubs_file = str(tmp_path / "clubs.json")
+        settings.fifa_conf = default_settings.fifa_conf
+        with open(default_settings.clubs_def, "r", encoding="utf-8") as fp:
+            clubs_def = json.load(fp)[:NUM_CLUBS]
+
+        db = DB(settings)
+        db.generate_teams_and_squads(clubs_def)
+        clubs = db.load_clubs()
+        players = db.load_players()
+        print(f"{NUM_CLUBS} clubs, {len(players)} players")
+        club_objects = db.load_club_objects(clubs, players)
+
+        before = timed(
+            "load_club_objects (old)", lambda: load_club_objects_old(db, clubs, players)
+        )
+        after = timed("load_club_objects", lambda: db.load_club_objects(clubs, players))
+        print(f"Loading speedup: {before / after:.1f}x")
+
+        def load_match_clubs(repository: ClubRepository):
+            return repository.get_clubs(random.sample(repository.get_club_ids(), 2))
+
+        timed(
+            "Match clubs, whole database (old)",
+            lambda: db.load_club_objects(
+                random.sample(db.load_clubs(), 2), db.load_players()
+            ),
+        )
+        repository = ClubRepository(db)
+        timed(
+            "Match clubs, ClubRepository (first)", lambda: load_match_clubs(repository)
+        )
+        timed(
+            "Match clubs, ClubRepository (next)", lambda: load_match_clubs(repository)
+        )
+
+        with SQLiteDB(settings) as sqlite_db:
+            timed("SQLiteDB.save_clubs", lambda: sqlite_db.save_clubs(club_objects))
+            timed(
+                "SQLiteDB.load_club_objects",
+                lambda: sqlite_db.load_club_objects(
+                    sqlite_db.load_clubs(), sqlite_db.load_players()
+                ),
+            )
+
+            club = club_objects[0]
+            timed(
+                "DB: load one club (all files)",
+                lambda: db.load_club_objects(
+                    [clubs[0]], db.load_players(), db.load_squads_file()
+                ),
+            )
+            timed("SQLiteDB.load_club", lambda: sqlite_db.load_club(club.club_id))
+            sqlite_repository = ClubRepository(sqlite_db)
+            timed(
+                "Match clubs, ClubRepository (SQLite)",
+                lambda: load_match_clubs(sqlite_repository),
+            )
+
+            # A match only changes the players of the two clubs that played
+            changed = [
+                player.details for club in club_objects[:2] for player in club.squad
+            ]
+            timed(
+                "DB: save after a match (all files)",
+                lambda: db.save_clubs(club_objects),
+            )
+            timed(
+                "SQLiteDB.save_players (one match)",
+                lambda: sqlite_db.save_players(changed),
+            )
+
+
+if __name__ == "__main__":
+    main()
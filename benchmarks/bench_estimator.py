@@ -0,0 +1,90 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Cost of estimating a fixture's outcome with MatchOutcomeEstimator, compared to running
+LiveGame once per replication.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_estimator
+"""
+import json
+import random
+import time
+import uuid
+from copy import deepcopy
+
+from ofm.core.db.generators import TeamGenerator
+from ofm.core.football.formation import Formation
+from ofm.core.football.team_simulation import TeamSimulation
+from ofm.core.settings import Settings
+from ofm.core.simulation.batch import simulate_match
+from ofm.core.simulation.estimator import MatchOutcomeEstimator
+from ofm.core.simulation.fixture import Fixture
+
+MATCHES = 20
+REPLICATIONS = 10_000
+
+
+def get_teams() -> list[TeamSimulation]:
+    settings = Settings()
+    with open(settings.fifa_conf, "r", encoding="utf-8") as fp:
+        confederations = json.load(fp)
+    with open(settings.clubs_def, "r", encoding="utf-8") as fp:
+        clubs_def = json.load(fp)[:2]
+
+    teams = []
+    for club in TeamGenerator(clubs_def, confederations).generate():
+        formation = Formation(club.default_formation)
+        formation.get_best_players(list(club.squad))
+        teams.append(TeamSimulation(club, formation))
+    return teams
+
+
+def main():
+    random.seed(1)
+    home_team, away_team = get_teams()
+
+    start = time.perf_counter()
+    for i in range(MATCHES):
+        fixture = Fixture(
+            uuid.UUID(int=i + 1),
+            uuid.uuid4(),
+            home_team.club.club_id,
+            away_team.club.club_id,
+            home_team.club.stadium,
+        )
+        simulate_match(fixture, deepcopy(home_team), deepcopy(away_team))
+    live_game = (time.perf_counter() - start) / MATCHES
+
+    start = time.perf_counter()
+    estimate = MatchOutcomeEstimator(home_team, away_team, seed=1).estimate(
+        REPLICATIONS
+    )
+    estimator = (time.perf_counter() - start) / REPLICATIONS
+
+    print(f"{'LiveGame':<40} {live_game * 1e3:8.3f} ms per match")
+    print(f"{'MatchOutcomeEstimator':<40} {estimator * 1e3:8.3f} ms per replication")
+    print(
+        f"Home {estimate.home_win_probability:.3f}, "
+        f"draw {estimate.draw_probability:.3f}, "
+        f"away {estimate.away_win_probability:.3f}"
+    )
+    print(f"Estimator speedup: {live_game / estimator:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
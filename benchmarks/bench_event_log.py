@@ -0,0 +1,73 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Memory kept for the events of a whole match, with the engine's event_history and with the
+compact EventLog.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_event_log
+"""
+import gc
+import time
+import tracemalloc
+import uuid
+from typing import Optional
+
+from benchmarks.bench_estimator import get_teams
+from ofm.core.simulation.event_log import EventLog
+from ofm.core.simulation.fixture import Fixture
+from ofm.core.simulation.simulation import LiveGame
+
+
+def get_live_game(event_log: Optional[EventLog]) -> LiveGame:
+    home_team, away_team = get_teams()
+    fixture = Fixture(
+        uuid.UUID(int=1),
+        uuid.uuid4(),
+        home_team.club.club_id,
+        away_team.club.club_id,
+        home_team.club.stadium,
+    )
+    return LiveGame(
+        fixture, home_team, away_team, False, False, True, event_log=event_log
+    )
+
+
+def bench(label: str, event_log: Optional[EventLog]) -> int:
+    live_game = get_live_game(event_log)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    live_game.run()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {memory / 1024:10.1f} KiB {elapsed * 1e3:8.1f} ms")
+    return memory
+
+
+def main():
+    # Everything a match allocates besides its events (stats, game events, ...)
+    baseline = bench("EventLog, sink only", EventLog(lambda record: None, False))
+    before = bench("event_history", None) - baseline
+    after = bench("EventLog", EventLog()) - baseline
+    print(f"Memory kept for the events: {before / after:.1f}x less")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Per-event cost of copying the GameState in EventFactory.get_event.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_game_state
+"""
+import timeit
+from copy import deepcopy
+from datetime import timedelta
+
+from ofm.core.simulation import PitchPosition
+from ofm.core.simulation.event_type import EventType
+from ofm.core.simulation.events import EventFactory
+from ofm.core.simulation.game_state import GameState, SimulationStatus
+
+NUMBER = 100_000
+
+
+def get_state() -> GameState:
+    return GameState(
+        timedelta(minutes=37, seconds=12),
+        SimulationStatus.FIRST_HALF,
+        PitchPosition.MIDFIELD_CENTER,
+        False,
+        timedelta(0),
+    )
+
+
+def bench(label: str, stmt) -> float:
+    per_call = min(timeit.repeat(stmt, number=NUMBER, repeat=5)) / NUMBER
+    print(f"{label:<40} {per_call * 1e6:8.3f} us")
+    return per_call
+
+
+def main():
+    state = get_state()
+    event_factory = EventFactory()
+
+    before = bench("deepcopy(state) (old)", lambda: deepcopy(state))
+    after = bench("state.copy()", state.copy)
+    bench(
+        "state.evolve(position=...)",
+        lambda: state.evolve(position=PitchPosition.OFF_BOX),
+    )
+    bench(
+        "EventFactory.get_event(state, PASS)",
+        lambda: event_factory.get_event(state, EventType.PASS),
+    )
+    print(f"State copy speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
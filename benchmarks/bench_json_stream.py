@@ -0,0 +1,87 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Peak memory and time of reading players.json and clubs_def.json whole with json.load and
+one element at a time with the streaming reader.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_json_stream
+"""
+import gc
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ofm.core.db.database import DB
+from ofm.core.db.generators import PlayerGenerator
+from ofm.core.settings import Settings
+
+NUM_PLAYERS = 10_000
+
+
+def measure(label: str, func) -> int:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {peak / 1024 ** 2:8.1f} MiB peak {elapsed * 1e3:8.1f} ms")
+    return peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        settings = Settings()
+        settings.players_file = str(tmp_path / "players.json")
+        db = DB(settings)
+
+        player_gen = PlayerGenerator()
+        player_gen.generate(NUM_PLAYERS)
+        with open(db.players_file, "w", encoding="utf-8") as fp:
+            json.dump(player_gen.get_players_dictionaries(), fp)
+        del player_gen
+
+        # Only the Player objects are kept
+        before = measure(
+            "players: json.load", lambda: db.load_player_objects(db.load_players())
+        )
+        after = measure(
+            "players: streaming", lambda: db.load_player_objects(db.iter_players())
+        )
+        print(f"Players peak memory: {before / after:.1f}x less")
+
+        before = measure(
+            "50 club definitions: json.load",
+            lambda: random.sample(db.load_club_definitions(), 50),
+        )
+        after = measure(
+            "50 club definitions: streaming",
+            lambda: db.sample_club_definitions(50),
+        )
+        print(f"Club definitions peak memory: {before / after:.1f}x less")
+
+        measure("names: PlayerGenerator", PlayerGenerator)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Time to simulate a whole 20-club league season (380 matches), in the current process and
+across a process pool.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_league [number of clubs]
+"""
+import json
+import os
+import sys
+import time
+import uuid
+
+from ofm.core.db.generators import TeamGenerator
+from ofm.core.football.league import League
+from ofm.core.settings import Settings
+
+
+def main():
+    num_clubs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    settings = Settings()
+    with open(settings.clubs_def, "r", encoding="utf-8") as fp:
+        clubs_def = json.load(fp)[:num_clubs]
+    with open(settings.fifa_conf, "r", encoding="utf-8") as fp:
+        fifa_conf = json.load(fp)
+
+    cpu_count = os.cpu_count() or 1
+    print(f"{num_clubs} clubs, {cpu_count} CPUs")
+    for max_workers in sorted({1, cpu_count}):
+        # Matches played in the current process change the clubs, start from new ones
+        clubs = TeamGenerator(clubs_def, fifa_conf, seed=0).generate(1)
+        league = League(uuid.UUID(int=0), "League", clubs, seed=0)
+        start = time.perf_counter()
+        results = league.play_season(max_workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{max_workers:>3} workers {elapsed:8.2f} s "
+            f"({elapsed / len(results) * 1e3:.1f} ms per match)"
+        )
+
+    print("Final table:")
+    for position, entry in enumerate(league.get_standings(), 1):
+        print(
+            f"{position:>3}. {league.clubs[entry.club_id].name:<30} {entry.points:>3} pts "
+            f"{entry.goal_difference:>+4}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Memory kept by a simulated match: bytes per match, and memory blocks kept per event (the
+event itself, its state, commentary, stats, ...). Also shows the size of a single instance
+of the objects created the most during a match.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_memory
+"""
+import gc
+import sys
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks.bench_estimator import get_teams
+from benchmarks.bench_event_log import get_live_game
+from ofm.core.football.player import PlayerStats
+from ofm.core.football.team_simulation import GameEvent, GameEventType, TeamStats
+from ofm.core.simulation import PitchPosition
+from ofm.core.simulation.event_type import EventType
+from ofm.core.simulation.events import PassEvent
+from ofm.core.simulation.game_state import GameState, SimulationStatus
+
+NUM_MATCHES = 5
+
+
+def get_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def bench_match() -> tuple[int, int, int]:
+    live_game = get_live_game(None)
+    gc.collect()
+    tracemalloc.start()
+    live_game.run()
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    statistics = snapshot.statistics("filename")
+    memory = sum(stat.size for stat in statistics)
+    blocks = sum(stat.count for stat in statistics)
+    return memory, blocks, len(live_game.engine.event_history)
+
+
+def main():
+    home_team, _ = get_teams()
+    player = home_team.formation.players[0]
+    state = GameState(0, SimulationStatus.FIRST_HALF, PitchPosition.MIDFIELD_CENTER)
+    objects = {
+        "PlayerSimulation": player,
+        "PlayerStats": PlayerStats(player.player.details.player_id),
+        "TeamStats": TeamStats(player.player.details.player_id),
+        "GameState": state,
+        "GameEvent": GameEvent(player, timedelta(minutes=10), GameEventType.GOAL),
+        "PassEvent": PassEvent(EventType.PASS, state),
+    }
+    for name, obj in objects.items():
+        print(f"{name:<40} {get_size(obj):8d} bytes")
+
+    memory = blocks = events = 0
+    for _ in range(NUM_MATCHES):
+        match_memory, match_blocks, match_events = bench_match()
+        memory += match_memory
+        blocks += match_blocks
+        events += match_events
+    print(f"{'Memory per match':<40} {memory / NUM_MATCHES / 1024:8.1f} KiB")
+    print(f"{'Events per match':<40} {events / NUM_MATCHES:8.1f}")
+    print(f"{'Memory blocks per event':<40} {blocks / events:8.1f}")
+    print(f"{'Bytes per event':<40} {memory / events:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Cost of PlayerAttributes.get_overall: cached, recalculated after a change, and the old
+dataclasses.asdict version.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_overall
+"""
+from dataclasses import asdict
+
+from benchmarks.bench_game_state import bench
+from ofm.core.db.generators import PlayerGenerator
+from ofm.core.football.positions import Positions
+
+
+def main():
+    attributes = PlayerGenerator().generate_player().attributes
+    groups = (
+        attributes.offensive,
+        attributes.physical,
+        attributes.defensive,
+        attributes.intelligence,
+        attributes.gk,
+    )
+
+    def old_overall():
+        overalls = []
+        for group in groups:
+            attrs = asdict(group)
+            overalls.append(int(sum(attrs.values()) / len(attrs)))
+        return int((overalls[0] * 3 + overalls[1] + overalls[2] + overalls[3] * 2) / 7)
+
+    def recalculated():
+        attributes.offensive.invalidate_overall()
+        return attributes.get_overall(Positions.FW)
+
+    before = bench("asdict overall (old)", old_overall)
+    bench("get_overall after a change", recalculated)
+    after = bench("get_overall, cached", lambda: attributes.get_overall(Positions.FW))
+    print(f"Overall speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
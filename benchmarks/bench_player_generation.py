@@ -0,0 +1,80 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Time to generate players one at a time with PlayerGenerator.generate_player and in bulk
+with PlayerGenerator.generate_players, with and without an AttributeStore.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_player_generation
+"""
+import random
+import statistics
+import time
+
+from ofm.core.db.generators import PlayerGenerator
+from ofm.core.football.attribute_store import AttributeStore
+from ofm.core.football.positions import Positions
+
+NUM_PLAYERS = 20_000
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1e3:10.1f} ms")
+    return elapsed, result
+
+
+def mean_overall(players) -> float:
+    return statistics.fmean(
+        player.attributes.get_overall(player.positions[0]) for player in players
+    )
+
+
+def main():
+    random.seed(42)
+    player_gen = PlayerGenerator(rng=random.Random(42))
+    positions = [[random.choice(list(Positions))] for _ in range(NUM_PLAYERS)]
+    nationalities = [None] * NUM_PLAYERS
+
+    print(f"{NUM_PLAYERS} players")
+    before, players = timed(
+        "generate_player",
+        lambda: [
+            player_gen.generate_player(None, 50, 20, player_positions)
+            for player_positions in positions
+        ],
+    )
+    after, bulk_players = timed(
+        "generate_players",
+        lambda: player_gen.generate_players(positions, nationalities),
+    )
+    store_time, _ = timed(
+        "generate_players (AttributeStore)",
+        lambda: player_gen.generate_players(
+            positions, nationalities, store=AttributeStore()
+        ),
+    )
+    print(
+        f"Mean overall: {mean_overall(players):.2f} vs {mean_overall(bulk_players):.2f}"
+    )
+    print(f"Speedup: {before / after:.1f}x, {before / store_time:.1f}x with a store")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Peak memory of DB.generate_teams_and_squads, which writes each club as it is generated,
+compared to generating every club and dumping the whole lists. Also compares saving the
+whole world after a matchday with ClubRepository.save, which only writes the players that
+changed.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_save
+"""
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ofm.core.db.database import DB
+from ofm.core.db.generators import TeamGenerator
+from ofm.core.db.repository import ClubRepository
+from ofm.core.db.sqlite_database import SQLiteDB
+from ofm.core.settings import Settings
+
+NUM_CLUBS = 200
+# Clubs that played in the matchday
+NUM_PLAYED = 20
+
+
+def get_settings(tmp_path: Path) -> Settings:
+    settings = Settings(tmp_path, tmp_path / "settings.yaml")
+    default_settings = Settings()
+    settings.db = tmp_path
+    settings.squads_file = str(tmp_path / "squads.json")
+    settings.players_file = str(tmp_path / "players.json")
+    settings.clubs_file = str(tmp_path / "clubs.json")
+    settings.snapshot_file = str(tmp_path / "world.ofms")
+    settings.database_file = str(tmp_path / "world.db")
+    settings.fifa_conf = default_settings.fifa_conf
+    return settings
+
+
+def save_lists(db: DB, clubs_def: list[dict]) -> None:
+    # Old save path: every club is generated first and each file is dumped as a list
+    clubs = TeamGenerator(clubs_def, db.load_fifa_conf()).generate(1)
+    for file, records in (
+        (db.clubs_file, [club.serialize() for club in clubs]),
+        (
+            db.players_file,
+            [player.details.serialize() for club in clubs for player in club.squad],
+        ),
+        (
+            db.squads_file,
+            [player.serialize() for club in clubs for player in club.squad],
+        ),
+    ):
+        with open(file, "w", encoding="utf-8") as fp:
+            json.dump(records, fp)
+
+
+def measure(label: str, func) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {elapsed * 1e3:10.1f} ms {peak / 2**20:10.1f} MiB peak")
+
+
+def timed(label: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1e3:10.1f} ms")
+
+
+def play_matchday(repository: ClubRepository) -> None:
+    for club in repository.get_clubs(repository.get_club_ids()[:NUM_PLAYED]):
+        for player in club.squad[:16]:
+            player.details.stamina = max(player.details.stamina - 30.0, 0.0)
+            player.details.fitness = max(player.details.fitness - 5.0, 0.0)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings = get_settings(Path(tmp_dir))
+        with open(Settings().clubs_def, "r", encoding="utf-8") as fp:
+            clubs_def = json.load(fp)[:NUM_CLUBS]
+
+        db = DB(settings)
+        print(f"{NUM_CLUBS} clubs, {NUM_PLAYED} played in the matchday")
+        measure("Generate and dump lists", lambda: save_lists(db, clubs_def))
+        measure(
+            "Generate and stream (JSON + snapshot)",
+            lambda: db.generate_teams_and_squads(clubs_def),
+        )
+
+        clubs = db.load_club_objects(db.load_clubs(), db.load_players())
+        for backend in (DB, SQLiteDB):
+            database = backend(settings)
+            if backend is SQLiteDB:
+                database.save_clubs(clubs)
+            repository = ClubRepository(database, max_clubs=NUM_PLAYED)
+            play_matchday(repository)
+            name = backend.__name__
+            timed(f"{name}: ClubRepository.save", repository.save)
+            timed(f"{name}: save the whole world", lambda: database.save_clubs(clubs))
+
+
+if __name__ == "__main__":
+    main()
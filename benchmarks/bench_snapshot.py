@@ -0,0 +1,90 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Time to load the whole world from the JSON files and from the binary snapshot, and to load
+a single club from the snapshot.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_snapshot
+"""
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from ofm.core.db.database import DB
+from ofm.core.settings import Settings
+
+NUM_CLUBS = 200
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1e3:10.1f} ms")
+    return elapsed, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        settings = Settings(tmp_path, tmp_path / "settings.yaml")
+        default_settings = Settings()
+        settings.db = tmp_path
+        settings.squads_file = str(tmp_path / "squads.json")
+        settings.players_file = str(tmp_path / "players.json")
+        settings.clubs_file = str(tmp_path / "clubs.json")
+        settings.snapshot_file = str(tmp_path / "world.ofms")
+        settings.fifa_conf = default_settings.fifa_conf
+        with open(default_settings.clubs_def, "r", encoding="utf-8") as fp:
+            clubs_def = json.load(fp)[:NUM_CLUBS]
+
+        db = DB(settings)
+        db.generate_teams_and_squads(clubs_def)
+        json_size = sum(
+            os.path.getsize(file)
+            for file in (db.clubs_file, db.players_file, db.squads_file)
+        )
+        print(f"{NUM_CLUBS} clubs")
+        print(f"{'JSON files':<40} {json_size / 1024:10.1f} KiB")
+        print(f"{'Snapshot':<40} {os.path.getsize(db.snapshot_file) / 1024:10.1f} KiB")
+
+        before, clubs = timed(
+            "Load world (JSON)",
+            lambda: db.load_club_objects(db.load_clubs(), db.load_players()),
+        )
+
+        def load_snapshot():
+            with db.open_snapshot() as snapshot:
+                return snapshot.load_clubs()
+
+        after, _ = timed("Load world (snapshot)", load_snapshot)
+        timed("Save world (JSON + snapshot)", lambda: db.save_clubs(clubs))
+        timed("Save snapshot", lambda: db.save_snapshot(clubs))
+
+        def load_club():
+            with db.open_snapshot() as snapshot:
+                return snapshot.get_club_by_id(clubs[-1].club_id)
+
+        timed("Load one club (snapshot)", load_club)
+        print(f"World load speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
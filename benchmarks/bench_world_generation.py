@@ -0,0 +1,53 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Time to generate the clubs of clubs_def.json with TeamGenerator.generate in the current
+process and across a process pool.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_world_generation [number of clubs]
+"""
+import json
+import os
+import sys
+import time
+
+from ofm.core.db.generators import TeamGenerator
+from ofm.core.settings import Settings
+
+
+def main():
+    settings = Settings()
+    with open(settings.clubs_def, "r", encoding="utf-8") as fp:
+        clubs_def = json.load(fp)
+    with open(settings.fifa_conf, "r", encoding="utf-8") as fp:
+        fifa_conf = json.load(fp)
+    if len(sys.argv) > 1:
+        clubs_def = clubs_def[: int(sys.argv[1])]
+
+    team_gen = TeamGenerator(clubs_def, fifa_conf, seed=0)
+    cpu_count = os.cpu_count() or 1
+    print(f"{len(clubs_def)} clubs, {cpu_count} CPUs")
+    for max_workers in sorted({1, 2, cpu_count}):
+        start = time.perf_counter()
+        team_gen.generate(max_workers)
+        elapsed = time.perf_counter() - start
+        print(f"{max_workers:>3} workers {elapsed * 1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,12 +18,16 @@ import json
 import os
 import random
 import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
 from typing import Optional
 
 from ofm.core.football.club import Club
 from ofm.core.football.player import Player, PlayerTeam, Positions
 from ofm.core.settings import Settings
 from .generators import PlayerGenerator, TeamGenerator
+from .json_stream import JSONArrayWriter, iter_json_file, write_json_file
+from .snapshot import SnapshotError, SnapshotWriter, WorldSnapshot, write_snapshot
 
 
 class DatabaseLoadError(Exception):
@@ -50,6 +54,10 @@ class DB:
     def clubs_file(self) -> str:
         return self.settings.clubs_file
 
+    @property
+    def snapshot_file(self) -> str:
+        return self.settings.snapshot_file
+
     @property
     def clubs_def_file(self) -> str:
         return self.settings.clubs_def
@@ -67,13 +75,52 @@ class DB:
             return json.load(fp)
 
     def load_players(self) -> list[dict]:
+        """
+        Loads every player at once. Use iter_players if the records are converted or
+        filtered one at a time.
+
+        When every record is kept, e.g. to index the players by id, json.load uses less
+        memory than streaming: it shares the dictionary keys between all the records,
+        while each streamed record gets its own keys.
+        """
         with open(self.players_file, "r", encoding="utf-8") as fp:
             return json.load(fp)
 
+    def iter_players(self) -> Iterator[dict]:
+        """
+        Yields the players one at a time, without loading the whole file.
+        """
+        return iter_json_file(self.players_file)
+
     def load_club_definitions(self) -> list[dict]:
+        """
+        Loads every club definition at once, e.g. for TeamGenerator, which needs a list it
+        can index from its worker processes. Use sample_club_definitions to only keep a
+        sample of them.
+        """
         with open(self.clubs_def_file, "r", encoding="utf-8") as fp:
             return json.load(fp)
 
+    def iter_club_definitions(self) -> Iterator[dict]:
+        """
+        Yields the club definitions one at a time, without loading the whole file.
+        """
+        return iter_json_file(self.clubs_def_file)
+
+    def sample_club_definitions(self, amount: int) -> list[dict]:
+        """
+        Picks a random sample of club definitions while reading the file, so only the
+        sample is kept in memory.
+        """
+        sample: list[dict] = []
+        for i, club_def in enumerate(self.iter_club_definitions()):
+            if i < amount:
+                sample.append(club_def)
+            elif (j := random.randint(0, i)) < amount:
+                sample[j] = club_def
+        random.shuffle(sample)
+        return sample
+
     def load_fifa_codes(self) -> dict:
         with open(self.fifa_codes_file, "r", encoding="utf-8") as fp:
             return json.load(fp)
@@ -86,33 +133,121 @@ class DB:
         with open(self.squads_file, "r") as fp:
             return json.load(fp)
 
-    def load_player_objects(self, players: list[dict]) -> list[Player]:
+    def get_generation(self) -> int:
+        """
+        Generation of the database, written to the snapshot header. The JSON files don't
+        keep one, their modification times tell if the snapshot is current.
+        """
+        return 0
+
+    def save_snapshot(
+        self,
+        clubs: list[Club],
+        players: Iterable[Player] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        if generation is None:
+            generation = self.get_generation()
+        write_snapshot(self.snapshot_file, clubs, players, generation)
+
+    def open_snapshot(self) -> WorldSnapshot:
+        return WorldSnapshot(self.snapshot_file)
+
+    def is_snapshot_current(self) -> bool:
+        """
+        The snapshot is only used if it was written after the last change to the JSON files.
+        """
+        if not os.path.exists(self.snapshot_file):
+            return False
+        snapshot_time = os.path.getmtime(self.snapshot_file)
+        return all(
+            os.path.getmtime(file) <= snapshot_time
+            for file in (self.clubs_file, self.players_file, self.squads_file)
+            if os.path.exists(file)
+        )
+
+    def load_all_club_objects(self) -> list[Club]:
+        """
+        Loads every club from the snapshot if it is up to date. Otherwise, the clubs are
+        loaded from the database and a new snapshot is written for the next load.
+        """
+        if self.is_snapshot_current():
+            try:
+                with self.open_snapshot() as snapshot:
+                    return snapshot.load_clubs()
+            except SnapshotError:
+                # Written by an older version, it is replaced below
+                pass
+
+        # Read before loading, so changes saved while loading make the new snapshot outdated
+        generation = self.get_generation()
+        clubs = self.load_club_objects(self.load_clubs(), self.load_players())
+        self.save_snapshot(clubs, generation=generation)
+        return clubs
+
+    def load_player_objects(self, players: Iterable[dict]) -> list[Player]:
         return [Player.get_from_dict(player) for player in players]
 
-    def load_club_objects(self, clubs: list[dict], players: list[dict]) -> list[Club]:
-        _clubs = []
-        for club in clubs:
-            players_ = [
-                Player.get_from_dict(player)
-                for player in players
-                if player["id"] in club["squad"]
-            ]
-            squad = self.get_player_team_from_dicts(
-                self.load_club_squads(club["id"]), players_
-            )
-            _clubs.append(Club.get_from_dict(club, squad))
+    def load_club_objects(
+        self,
+        clubs: list[dict],
+        players: list[dict],
+        squads: Optional[list[dict]] = None,
+    ) -> list[Club]:
+        """
+        Creates the clubs and their squads from the database dictionaries.
+
+        Players and squads are indexed by id once, so each club only looks up its own
+        players. If squads is not given, the squads file is read once for all the clubs.
+        """
+        if squads is None:
+            squads = self.load_squads_file()
+
+        players_by_id = {player["id"]: player for player in players}
+        squads_by_team = self.get_squads_by_team(squads)
+
+        _clubs = [
+            self.get_club_from_dicts(club, players_by_id, squads_by_team)
+            for club in clubs
+        ]
 
         if not _clubs:
             raise DatabaseLoadError("Could not load clubs from definition")
 
         return _clubs
 
+    def get_club_from_dicts(
+        self,
+        club: dict,
+        players_by_id: dict[int, dict],
+        squads_by_team: dict[int, list[dict]],
+    ) -> Club:
+        """
+        Creates a club and its squad. Only the club's players are created.
+        """
+        players = [
+            Player.get_from_dict(players_by_id[player_id])
+            for player_id in club["squad"]
+            if player_id in players_by_id
+        ]
+        squad = self.get_player_team_from_dicts(
+            squads_by_team.get(club["id"], []), players
+        )
+        return Club.get_from_dict(club, squad)
+
     def load_club_squads(self, team_id: int, squads: Optional[list[dict]] = None):
         if not squads:
             squads = self.load_squads_file()
 
         return [d for d in squads if d["team_id"] == team_id]
 
+    @staticmethod
+    def get_squads_by_team(squads: list[dict]) -> dict[int, list[dict]]:
+        squads_by_team: dict[int, list[dict]] = {}
+        for squad in squads:
+            squads_by_team.setdefault(squad["team_id"], []).append(squad)
+        return squads_by_team
+
     def check_clubs_file(self, amount: Optional[int] = None) -> None:
         if not os.path.exists(self.settings.db):
             os.makedirs(self.settings.db, exist_ok=True)
@@ -129,8 +264,9 @@ class DB:
         if not players:
             raise DatabaseLoadError("Players list cannot be empty!")
 
+        player_id_int = player_id.int
         for player in players:
-            if uuid.UUID(int=player["id"]) == player_id:
+            if player["id"] == player_id_int:
                 return Player.get_from_dict(player)
 
         raise DatabaseLoadError("Player does not exist in database!")
@@ -138,12 +274,17 @@ class DB:
     def get_player_team_from_dicts(
         self, squads_dict: list[dict], players: list[Player]
     ) -> list[PlayerTeam]:
-        squad = []
-        for playerteam_dict in squads_dict:
-            for player in players:
-                if player.player_id.int == playerteam_dict["player_id"]:
-                    squad.append(PlayerTeam.get_from_dict(playerteam_dict, players))
-                    break
+        if not players:
+            raise PlayerTeamLoadError("Squad not found in database of players!")
+
+        players_by_id = {player.player_id.int: player for player in players}
+        squad = [
+            PlayerTeam.get_from_dict(
+                playerteam_dict, [players_by_id[playerteam_dict["player_id"]]]
+            )
+            for playerteam_dict in squads_dict
+            if playerteam_dict["player_id"] in players_by_id
+        ]
 
         if not squad:
             raise PlayerTeamLoadError("Squad not found in database of players!")
@@ -170,28 +311,94 @@ class DB:
         amount: Optional[int] = None,
     ):
         if clubs_def is None:
-            clubs_def = self.load_club_definitions()
-
-        if amount:
+            if amount:
+                clubs_def = self.sample_club_definitions(amount)
+            else:
+                clubs_def = self.load_club_definitions()
+        elif amount:
             clubs_def = random.sample(clubs_def, amount)
 
         fifa_conf = self.load_fifa_conf()
 
         team_gen = TeamGenerator(clubs_def, fifa_conf, season_start)
-        clubs = team_gen.generate()
-        clubs_dict = [club.serialize() for club in clubs]
-
-        with open(self.clubs_file, "w", encoding="utf-8") as fp:
-            json.dump(clubs_dict, fp)
-
-        with open(self.players_file, "w", encoding="utf-8") as fp:
-            players_dict = []
-            for club in clubs:
-                players_dict.extend(player.details.serialize() for player in club.squad)
-            json.dump(players_dict, fp)
-
-        with open(self.squads_file, "w", encoding="utf-8") as fp:
-            squads_dict = []
-            for club in clubs:
-                squads_dict.extend(player.serialize() for player in club.squad)
-            json.dump(squads_dict, fp)
+        # Each club is written as soon as it is generated, only the compact snapshot
+        # records of the whole world are kept in memory
+        self.save_clubs(team_gen.iter_clubs())
+
+    def save_clubs(self, clubs: Iterable[Club]) -> None:
+        """
+        Writes the clubs, their players and squads to the database files and the snapshot.
+
+        The JSON records are written to temporary files as the clubs are iterated, so clubs
+        can be saved while they are generated. The database files are only replaced once
+        every club was written, if the clubs fail to be produced they are left untouched.
+        The snapshot records are kept until the end, they are much smaller than the clubs.
+        """
+        files = (self.clubs_file, self.players_file, self.squads_file)
+        tmp_files = [f"{file}.tmp" for file in files]
+        snapshot = SnapshotWriter(self.get_generation())
+        try:
+            with ExitStack() as stack:
+                clubs_writer, players_writer, squads_writer = (
+                    stack.enter_context(
+                        JSONArrayWriter(
+                            stack.enter_context(open(tmp_file, "w", encoding="utf-8"))
+                        )
+                    )
+                    for tmp_file in tmp_files
+                )
+                for club in clubs:
+                    clubs_writer.write(club.serialize())
+                    for player in club.squad:
+                        players_writer.write(player.details.serialize())
+                        squads_writer.write(player.serialize())
+                    snapshot.add_club(club)
+        except BaseException:
+            for tmp_file in tmp_files:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+            raise
+
+        for tmp_file, file in zip(tmp_files, files):
+            os.replace(tmp_file, file)
+        snapshot.write(self.snapshot_file)
+
+    def save_players(self, players: Iterable[Player]) -> None:
+        """
+        Writes only the given players, e.g. the ones that changed after a matchday.
+
+        A JSON file can't be changed in place, so the players file is still rewritten, but
+        it is streamed through and only the given players are serialized again.
+        """
+        changed = {player.player_id.int: player.serialize() for player in players}
+        if not changed:
+            return
+        write_json_file(
+            self.players_file,
+            (
+                changed.get(player["id"], player)
+                for player in iter_json_file(self.players_file)
+            ),
+        )
+
+    def save_contracts(self, players: Iterable[PlayerTeam]) -> None:
+        """
+        Writes only the contracts of the given players to the squads file.
+        """
+        changed = {
+            player.details.player_id.int: player.contract.serialize()
+            for player in players
+        }
+        if not changed:
+            return
+        write_json_file(
+            self.squads_file,
+            (
+                (
+                    player | {"contract": changed[player["player_id"]]}
+                    if player["player_id"] in changed
+                    else player
+                )
+                for player in iter_json_file(self.squads_file)
+            ),
+        )
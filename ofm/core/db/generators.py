@@ -13,13 +13,28 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import json
+import gc
+import os
 import random
 import uuid
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Tuple, Union
-
+from functools import cache
+from statistics import NormalDist
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from ofm.core.football.attribute_store import (
+    ATTRIBUTE_GROUPS,
+    GROUP_SLICES,
+    ROW_SIZE,
+    AttributeStore,
+    StoredPlayerAttributes,
+    get_overalls,
+    get_player_attributes_from_row,
+)
 from ofm.core.football.club import Club
 from ofm.core.football.player import Player, PlayerTeam, Positions, PreferredFoot
 from ofm.core.football.player_attributes import (
@@ -33,14 +48,87 @@ from ofm.core.football.player_attributes import (
 from ofm.core.football.playercontract import PlayerContract
 from ofm.defaults import NAMES_FILE
 
+from .json_stream import iter_json_file
+
 
-def generate_skill_values(mu: int, sigma: int) -> int:
-    value = random.gauss(mu, sigma)
+def generate_skill_values(rng: random.Random, mu: int, sigma: int) -> int:
+    value = rng.gauss(mu, sigma)
     value = min(value, 95)
     value = max(value, 25)
     return int(value)
 
 
+SKILL_VALUES = range(25, 96)
+
+
+@cache
+def _get_skill_cum_weights(mu: int, sigma: int) -> tuple[float, ...]:
+    # Probability of each of the values returned by generate_skill_values. Values are
+    # truncated, so each one gets the probability of the interval [value, value + 1).
+    # The lowest and highest values also get the probability of the clipped tails
+    if sigma == 0:
+        value = int(min(max(mu, 25), 95))
+        return tuple(float(skill >= value) for skill in SKILL_VALUES)
+    cdf = NormalDist(mu, sigma).cdf
+    return (*(cdf(value + 1) for value in SKILL_VALUES[:-1]), 1.0)
+
+
+def generate_skill_values_bulk(
+    rng: random.Random, mu: int, sigma: int, amount: int
+) -> bytes:
+    """
+    Same as generate_skill_values, but draws amount values at once.
+
+    The values are drawn from the distribution of the values returned by
+    generate_skill_values, instead of clipping each normal variate.
+    """
+    return bytes(
+        rng.choices(
+            SKILL_VALUES, cum_weights=_get_skill_cum_weights(mu, sigma), k=amount
+        )
+    )
+
+
+# Skill distribution of the attribute groups that do not follow the player's mu and sigma,
+# same as PlayerAttributeGenerator.get_gk_attributes, get_df_attributes, etc.
+FIXED_SKILL_DISTRIBUTIONS: dict[Positions, dict[str, tuple[int, int]]] = {
+    Positions.GK: {"offensive": (35, 10)},
+    Positions.DF: {"offensive": (45, 10), "gk": (35, 10)},
+    Positions.MF: {"offensive": (50, 20), "gk": (35, 10)},
+    Positions.FW: {"defensive": (45, 10), "gk": (35, 10)},
+}
+
+# Minimum overall for each level of international reputation
+INTERNATIONAL_REPUTATION_LEVELS = (65, 70, 75, 82, 90)
+
+
+def generate_uuid(rng: random.Random) -> uuid.UUID:
+    """
+    Random UUID drawn from rng instead of os.urandom, so that seeding rng also makes the
+    generated ids reproducible.
+    """
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+class RegionNames(NamedTuple):
+    male: tuple[str, ...]
+    surnames: tuple[str, ...]
+
+
+@cache
+def get_names_index() -> dict[str, RegionNames]:
+    """
+    Returns the male names and surnames of each region in the names file.
+
+    The file is only parsed the first time this is called, every generator shares the
+    same index. Female names are not used by the generators, so they are not kept.
+    """
+    return {
+        names["region"]: RegionNames(tuple(names["male"]), tuple(names["surnames"]))
+        for names in iter_json_file(NAMES_FILE)
+    }
+
+
 class Generator(ABC):
     @abstractmethod
     def generate(self, *args):
@@ -52,51 +140,52 @@ class GeneratePlayerError(Exception):
 
 
 class PlayerAttributeGenerator(Generator):
-    def __init__(self, max_skill_lvl):
+    def __init__(self, max_skill_lvl, rng: Optional[random.Random] = None):
         self.max_skill_lvl = max_skill_lvl
+        self.rng: random.Random = rng if rng is not None else random.Random()
 
     def generate_offensive_attributes(self, mu: int, sigma: int) -> OffensiveAttributes:
         return OffensiveAttributes(
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
         )
 
     def generate_defensive_attributes(self, mu: int, sigma: int) -> DefensiveAttributes:
         return DefensiveAttributes(
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
         )
 
     def generate_physical_attributes(self, mu: int, sigma: int) -> PhysicalAttributes:
         return PhysicalAttributes(
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
         )
 
     def generate_intelligence_attributes(
         self, mu: int, sigma: int
     ) -> IntelligenceAttributes:
         return IntelligenceAttributes(
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
         )
 
     def generate_gk_attributes(self, mu: int, sigma: int) -> GkAttributes:
         return GkAttributes(
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
-            generate_skill_values(mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
+            generate_skill_values(self.rng, mu, sigma),
         )
 
     def get_gk_attributes(self, mu: int, sigma: int) -> PlayerAttributes:
@@ -159,6 +248,45 @@ class PlayerAttributeGenerator(Generator):
 
         return attributes
 
+    def generate_rows(
+        self, positions: Sequence[Positions], mu: int = 50, sigma: int = 20
+    ) -> tuple[bytearray, list[int]]:
+        """
+        Generates the attributes of many players at once, one player for each position.
+
+        Returns the attributes as AttributeStore rows, in the same order as the positions,
+        and the overall of each player in its position. The skill values of each attribute
+        group are drawn for every player of a position at once, and the overalls are
+        computed a column at a time.
+        """
+        data = bytearray(len(positions) * ROW_SIZE)
+        overalls = [0] * len(positions)
+        players_by_position: dict[Positions, list[int]] = {}
+        for i, position in enumerate(positions):
+            players_by_position.setdefault(position, []).append(i)
+
+        for position, players in players_by_position.items():
+            amount = len(players)
+            fixed_skills = FIXED_SKILL_DISTRIBUTIONS[position]
+            block = bytearray(amount * ROW_SIZE)
+            for (name, _), (start, end) in zip(ATTRIBUTE_GROUPS, GROUP_SLICES):
+                group_mu, group_sigma = fixed_skills.get(name, (mu, sigma))
+                values = generate_skill_values_bulk(
+                    self.rng, group_mu, group_sigma, amount * (end - start)
+                )
+                for column in range(start, end):
+                    offset = (column - start) * amount
+                    block[column::ROW_SIZE] = values[offset : offset + amount]
+
+            block_overalls = get_overalls(block, position)
+            for row, i in enumerate(players):
+                data[i * ROW_SIZE : (i + 1) * ROW_SIZE] = block[
+                    row * ROW_SIZE : (row + 1) * ROW_SIZE
+                ]
+                overalls[i] = block_overalls[row]
+
+        return data, overalls
+
 
 class PlayerGenerator(Generator):
     def __init__(
@@ -167,6 +295,7 @@ class PlayerGenerator(Generator):
         max_age: int = 35,
         min_age: int = 16,
         max_skill_lvl: int = 99,
+        rng: Optional[random.Random] = None,
     ):
         if min_age > max_age:
             raise GeneratePlayerError(
@@ -174,8 +303,10 @@ class PlayerGenerator(Generator):
             )
 
         self.players_obj: List[Player] = []
-        self.nationalities = self._get_nationalities()
-        self.names = self._get_names()
+        self.rng: random.Random = rng if rng is not None else random.Random()
+        self.attribute_generator = PlayerAttributeGenerator(max_skill_lvl, self.rng)
+        self.names = get_names_index()
+        self.nationalities = tuple(self.names)
 
         year = timedelta(seconds=31556952)  # definition of a Gregorian calendar date
         self.today = today
@@ -183,30 +314,34 @@ class PlayerGenerator(Generator):
         self.min_age = min_age * year
         self.max_skill_lvl = max_skill_lvl
 
-    @staticmethod
-    def _get_nationalities():
-        with open(NAMES_FILE, "r", encoding="utf-8") as fp:
-            data = json.load(fp)
-            return [d["region"] for d in data]
-
-    @staticmethod
-    def _get_names():
-        with open(NAMES_FILE, "r", encoding="utf-8") as fp:
-            return json.load(fp)
-
-    def _get_names_from_region(self, region: str) -> dict:
-        for reg in self.names:
-            return reg if reg["region"] == region else random.choice(self.names)
+    def __getstate__(self) -> dict:
+        # Every generator shares the names index, there is no need to copy it when the
+        # generator is sent to another process
+        state = self.__dict__.copy()
+        del state["names"]
+        del state["nationalities"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.names = get_names_index()
+        self.nationalities = tuple(self.names)
+
+    def _get_names_from_region(self, region: str) -> RegionNames:
+        try:
+            return self.names[region]
+        except KeyError:
+            return self.names[self.rng.choice(self.nationalities)]
 
     def generate_id(self):
-        return uuid.uuid4()
+        return generate_uuid(self.rng)
 
     def generate_nationality(self, nat: Optional[str]) -> str:
         """
         Returns the player's nationality. If you define a nationality for any reason,
         you should get this nationality here.
         """
-        return nat or random.choice(self.nationalities)
+        return nat or self.rng.choice(self.nationalities)
 
     def generate_dob(self) -> datetime:
         """
@@ -216,35 +351,34 @@ class PlayerGenerator(Generator):
         max_year = self.today - self.min_age  # max date for birthday
 
         days_interval = max_year - min_year
-        rand_date = random.randrange(
+        rand_date = self.rng.randrange(
             days_interval.days
         )  # chooses a random date from the max days interval
         return min_year + timedelta(days=rand_date)  # assigns date of birth
 
     def generate_name(self, region: Optional[str]) -> Tuple[str, str, str]:
         if not region:
-            region = random.choice(self.nationalities)
+            region = self.rng.choice(self.nationalities)
         names = self._get_names_from_region(region)
-        first_name = random.choice(names["male"])
-        last_name = random.choice(names["surnames"])
+        first_name = self.rng.choice(names.male)
+        last_name = self.rng.choice(names.surnames)
         short_name = f"{last_name}"
         # TODO: Generate some nicknames for players, but for now just keep it that way
         return first_name, last_name, short_name
 
-    def generate_potential_skill(
-        self, skill: PlayerAttributes, positions: list[Positions], age: int
-    ) -> int:
+    def get_age_diff(self, age: int) -> int:
+        return max(int((self.max_age.days * 365.25) - age), 0)
+
+    def generate_potential_skill(self, ovr: int, age: int) -> int:
         """
-        Generates the player's potential skill.
+        Generates the player's potential skill from the overall of the player's main position.
         """
-        age_diff = int((self.max_age.days * 365.25) - age)
-        age_diff = max(age_diff, 0)
-        ovr = skill.get_overall(positions[0])
+        age_diff = self.get_age_diff(age)
 
         if age_diff == 0:
             potential = ovr
         else:
-            potential = ovr + random.randint(0, 20)
+            potential = ovr + self.rng.randint(0, 20)
             potential = min(potential, 99)
         return potential
 
@@ -256,13 +390,12 @@ class PlayerGenerator(Generator):
         ):  # might be useful if we want to generate teams later, so we don't get entirely random positions
             return desired_pos
         positions = list(Positions)
-        return random.choices(
+        return self.rng.choices(
             positions
         )  # very naive implementation, I will improve it later
 
-    @staticmethod
-    def generate_preferred_foot() -> PreferredFoot:
-        return random.choice(list(PreferredFoot))
+    def generate_preferred_foot(self) -> PreferredFoot:
+        return self.rng.choice(list(PreferredFoot))
 
     def generate_player_value(
         self, skill: int, age: int, potential_skill: int, international_rep: int
@@ -273,10 +406,9 @@ class PlayerGenerator(Generator):
         Right now I'm just going to implement a basic value. It's not too important to come up
         with an algorithm for that at the moment.
         """
-        age_diff = int((self.max_age.days * 365.25) - age)
-        age_diff = max(age_diff, 0)
+        age_diff = self.get_age_diff(age)
         pot_skill = potential_skill
-        base_value = random.randint(55, 80) * 100
+        base_value = self.rng.randint(55, 80) * 100
 
         return round(
             (
@@ -293,18 +425,7 @@ class PlayerGenerator(Generator):
         """
         Returns the player's international reputation. This number ranges from 0 to 5.
         """
-        if max_skill < 65:
-            return 0
-        elif max_skill < 70:
-            return 1
-        elif max_skill < 75:
-            return 2
-        elif max_skill < 82:
-            return 3
-        elif max_skill < 90:
-            return 4
-        else:
-            return 5
+        return bisect_right(INTERNATIONAL_REPUTATION_LEVELS, max_skill)
 
     def get_players_dictionaries(self) -> List[dict]:
         if not self.players_obj:
@@ -312,12 +433,12 @@ class PlayerGenerator(Generator):
         return [player.serialize() for player in self.players_obj]
 
     def generate_player_form(self) -> float:
-        form = round(random.random(), 2)
+        form = round(self.rng.random(), 2)
         form = max(0.1, form)
         return form
 
     def generate_player_fitness(self) -> float:
-        fitness = round(random.random() * 100, 2)
+        fitness = round(self.rng.random() * 100, 2)
         fitness = max(10.0, fitness)
         return fitness
 
@@ -328,7 +449,6 @@ class PlayerGenerator(Generator):
         sigma: Optional[int] = 20,
         desired_pos: Optional[List[Positions]] = None,
     ) -> Player:
-        attr_gen = PlayerAttributeGenerator(self.max_skill_lvl)
         player_id = self.generate_id()
         nationality = self.generate_nationality(region)
         first_name, last_name, short_name = self.generate_name(region)
@@ -336,13 +456,12 @@ class PlayerGenerator(Generator):
         age = int((self.today - dob).days * 0.0027379070)
         positions = self.generate_positions(desired_pos)
         preferred_foot = self.generate_preferred_foot()
-        attributes = attr_gen.generate(positions, mu, sigma)
-        potential_skill = self.generate_potential_skill(attributes, positions, age)
-        international_reputation = self.generate_international_reputation(
-            attributes.get_overall(positions[0]),
-        )
+        attributes = self.attribute_generator.generate(positions, mu, sigma)
+        overall = attributes.get_overall(positions[0])
+        potential_skill = self.generate_potential_skill(overall, age)
+        international_reputation = self.generate_international_reputation(overall)
         value = self.generate_player_value(
-            attributes.get_overall(positions[0]),
+            overall,
             age,
             potential_skill,
             international_reputation,
@@ -368,21 +487,99 @@ class PlayerGenerator(Generator):
             value,
         )
 
+    def generate_players(
+        self,
+        positions: Sequence[list[Positions]],
+        nationalities: Sequence[Optional[str]],
+        mu: int = 50,
+        sigma: int = 20,
+        store: Optional[AttributeStore] = None,
+    ) -> list[Player]:
+        """
+        Generates one player for each list of positions. Much faster than calling
+        generate_player for each player when generating many players.
+
+        The attributes of every player are generated at once as AttributeStore rows, and the
+        values derived from the overall are computed from the rows. If a store is given,
+        the rows are added to it and the players' attributes are views of their rows.
+        Otherwise, each player gets its own PlayerAttributes.
+        """
+        if len(positions) != len(nationalities):
+            raise GeneratePlayerError(
+                "There must be one nationality for each player's positions!"
+            )
+
+        data, overalls = self.attribute_generator.generate_rows(
+            [player_positions[0] for player_positions in positions], mu, sigma
+        )
+        player_ids = [self.generate_id() for _ in positions]
+        if store is not None:
+            first_row = store.add_rows(player_ids, data)
+
+        players = []
+        for i, (player_id, player_positions, nationality, overall) in enumerate(
+            zip(player_ids, positions, nationalities, overalls)
+        ):
+            nationality = self.generate_nationality(nationality)
+            first_name, last_name, short_name = self.generate_name(nationality)
+            dob = self.generate_dob()
+            age = int((self.today - dob).days * 0.0027379070)
+            # Same as generate_player, in the same order, so the same seed gives the
+            # same players
+            potential_skill = self.generate_potential_skill(overall, age)
+            international_reputation = self.generate_international_reputation(overall)
+            value = self.generate_player_value(
+                overall, age, potential_skill, international_reputation
+            )
+            if store is None:
+                attributes = get_player_attributes_from_row(
+                    data[i * ROW_SIZE : (i + 1) * ROW_SIZE]
+                )
+            else:
+                attributes = StoredPlayerAttributes(store, first_row + i)
+
+            players.append(
+                Player(
+                    player_id,
+                    nationality,
+                    dob,
+                    first_name,
+                    last_name,
+                    short_name,
+                    player_positions,
+                    self.generate_player_fitness(),
+                    100.0,
+                    self.generate_player_form(),
+                    attributes,
+                    potential_skill,
+                    international_reputation,
+                    self.generate_preferred_foot(),
+                    value,
+                )
+            )
+        return players
+
     def generate(
         self,
         amount: int,
         region: Optional[str] = None,
         desired_pos: Optional[List[Positions]] = None,
     ):
-        self.players_obj = [
-            self.generate_player(region, desired_pos) for _ in range(amount)
-        ]
+        self.players_obj = self.generate_players(
+            [self.generate_positions(desired_pos) for _ in range(amount)],
+            [region] * amount,
+        )
 
 
 class GenerateSquadError(Exception):
     pass
 
 
+# Generating a club only takes a few milliseconds, so a worker process is only worth
+# starting if it gets at least this many clubs
+MIN_CLUBS_PER_WORKER = 16
+
+
 class TeamGenerator(Generator):
     """
     Teams are defined in a definition file.
@@ -396,11 +593,15 @@ class TeamGenerator(Generator):
         club_definitions: list[dict],
         fifa_confederations: list[dict],
         season_start: date = date.today(),
+        seed: Optional[int] = None,
     ) -> None:
         self.fifa_confederations = fifa_confederations
         self.club_definitions = club_definitions
         self.season_start = season_start
-        self.player_gen = PlayerGenerator()
+        self.seed = seed
+        self.rng = random.Random()
+        self.player_gen = PlayerGenerator(rng=self.rng)
+        self.confederations = self.get_confederations_by_country(fifa_confederations)
 
     def _get_nationalities(
         self, country: str, countries: list
@@ -414,7 +615,7 @@ class TeamGenerator(Generator):
         # foreigner
         foreigner: float = 1 - native
         coeff = int(foreigner / 0.05)
-        mini_list = random.sample(countries, coeff)
+        mini_list = self.rng.sample(countries, coeff)
         for ele in mini_list:
             nationalities.append(ele)
             probabilities.append(foreigner)
@@ -424,7 +625,7 @@ class TeamGenerator(Generator):
     def generate_player_contract(self, player: Player) -> PlayerContract:
         wage = player.value / 12
         contract_started = self.season_start
-        contract_length = random.randint(1, 4) * timedelta(
+        contract_length = self.rng.randint(1, 4) * timedelta(
             seconds=31556952
         )  # pick a contract length in years
         contract_end = contract_started + contract_length
@@ -496,16 +697,17 @@ class TeamGenerator(Generator):
         sigma = squad_definition["sigma"]
         nationalities, probabilities = self._get_nationalities(country, countries)
 
+        players = self.player_gen.generate_players(
+            [[position] for position in needed_positions],
+            self.rng.choices(nationalities, probabilities, k=len(needed_positions)),
+            mu,
+            sigma,
+        )
         return [
-            self.generate_player_team(
-                mu,
-                sigma,
-                random.choices(nationalities, probabilities)[0],
-                team_id,
-                shirt_number[i],
-                [needed_positions[i]],
+            PlayerTeam(
+                player, team_id, shirt_number[i], self.generate_player_contract(player)
             )
-            for i, _ in enumerate(needed_positions)
+            for i, player in enumerate(players)
         ]
 
     def extract_confederation(
@@ -523,18 +725,94 @@ class TeamGenerator(Generator):
             countries_list.remove(country)
         return country_conf, countries_list
 
-    def generate(self, *args) -> list[Club]:
-        clubs = []
-        for club in self.club_definitions:
-            club_id = uuid.uuid4()
-            club.update({"id": club_id.int})
-            country_conf, countries_list = self.extract_confederation(
-                club["country"], self.fifa_confederations
-            )
-            squad = self.generate_squad(
-                club_id, club["country"], club["squads_def"], countries_list
-            )
-            club_obj = Club.get_from_dict(club, squad)
-            clubs.append(club_obj)
+    def get_confederations_by_country(
+        self, confederation: list[dict]
+    ) -> dict[str, Tuple[str, list]]:
+        """
+        Returns the result of extract_confederation for every country in the
+        confederations, so it does not need to scan the confederations for every club.
+        """
+        return {
+            country: self.extract_confederation(country, confederation)
+            for element in confederation
+            for country in element["countries"]
+        }
+
+    def get_confederation(self, country: str) -> Tuple[str, list]:
+        try:
+            return self.confederations[country]
+        except KeyError:
+            return self.extract_confederation(country, self.fifa_confederations)
+
+    def generate_club(self, club_definition: dict, seed: int) -> Club:
+        """
+        Generates a club and its squad from a random generator seeded with the club's
+        seed, so the same seed always generates the same club.
+        """
+        self.rng = random.Random(seed)
+        self.player_gen.rng = self.rng
+        self.player_gen.attribute_generator.rng = self.rng
+        club_id = generate_uuid(self.rng)
+        club = club_definition | {"id": club_id.int}
+        _, countries_list = self.get_confederation(club["country"])
+        squad = self.generate_squad(
+            club_id, club["country"], club["squads_def"], countries_list
+        )
+        return Club.get_from_dict(club, squad)
+
+    def _generate_club_from_index(self, args: Tuple[int, int]) -> Club:
+        index, seed = args
+        return self.generate_club(self.club_definitions[index], seed)
+
+    def iter_clubs(self, max_workers: Optional[int] = None) -> Iterator[Club]:
+        """
+        Yields the clubs in the definitions as they are generated, sharded by club across
+        a process pool.
+
+        Each club is generated from its own seed, drawn from the generator's seed, so the
+        clubs are the same whatever the number of workers. If the generator has no seed,
+        one is drawn from the random module. Each club's "id" is set in its definition.
 
-        return clubs
+        If max_workers is 1, the clubs are generated in the current process instead.
+        """
+        if not self.club_definitions:
+            return
+
+        rng = random.Random(
+            self.seed if self.seed is not None else random.getrandbits(64)
+        )
+        args = [(i, rng.getrandbits(64)) for i in range(len(self.club_definitions))]
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, -(-len(args) // MIN_CLUBS_PER_WORKER), len(args))
+
+        if max_workers == 1:
+            clubs = map(self._generate_club_from_index, args)
+            yield from self._set_club_ids(clubs)
+        else:
+            chunksize = max(1, len(args) // (max_workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                clubs = executor.map(
+                    self._generate_club_from_index, args, chunksize=chunksize
+                )
+                yield from self._set_club_ids(clubs)
+
+    def _set_club_ids(self, clubs: Iterable[Club]) -> Iterator[Club]:
+        for club_definition, club in zip(self.club_definitions, clubs):
+            club_definition["id"] = club.club_id.int
+            yield club
+
+    def generate(self, max_workers: Optional[int] = None) -> list[Club]:
+        """
+        Generates every club in the definitions. See iter_clubs.
+        """
+        # Every club is kept, so garbage collections while the clubs are generated or
+        # unpickled would only scan the same objects again and again
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return list(self.iter_clubs(max_workers))
+        finally:
+            if gc_enabled:
+                gc.enable()
@@ -0,0 +1,173 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Reads and writes the elements of a JSON array one at a time, so big files like
+players.json or clubs_def.json never need to be kept in memory as a whole.
+"""
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any, TextIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Any character that can't be part of a number
+_NUMBER_END = re.compile(r"[^0-9eE.+-]")
+
+
+class _Reader:
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        """
+        Reads the next chunk, dropping what was already decoded. Returns False at the end of
+        the file.
+        """
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self) -> str:
+        """
+        Skips whitespace and returns the next character, or an empty string at the end of
+        the file.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ""
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+def iter_json_array(fp: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yields the elements of the JSON array in the file, decoding one element at a time.
+
+    Only the current chunk of the file and the element being decoded are kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    reader = _Reader(fp, chunk_size)
+
+    if reader.next_char() != "[":
+        raise reader.error("Expecting '['")
+    reader.pos += 1
+
+    if reader.next_char() == "]":
+        return
+
+    while True:
+        if not reader.next_char():
+            raise reader.error("Expecting value")
+        try:
+            element, end = decoder.raw_decode(reader.buffer, reader.pos)
+        except json.JSONDecodeError:
+            # The element doesn't fit in the buffer yet
+            if reader.read_more():
+                continue
+            raise
+        if (
+            isinstance(element, (int, float))
+            and not _NUMBER_END.search(reader.buffer, end)
+            and reader.read_more()
+        ):
+            # A number at the end of the buffer might continue in the next chunk
+            continue
+
+        reader.pos = end
+        yield element
+
+        char = reader.next_char()
+        if char == "]":
+            return
+        if char != ",":
+            raise reader.error("Expecting ',' delimiter")
+        reader.pos += 1
+
+
+def iter_json_file(
+    path: str, encoding: str = "utf-8", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    with open(path, "r", encoding=encoding) as fp:
+        yield from iter_json_array(fp, chunk_size)
+
+
+class JSONArrayWriter:
+    """
+    Writes the elements of a JSON array one at a time, as they are produced. The output is
+    the same as json.dump of a list with the same elements.
+
+    The array is only closed if no exception was raised, so a failed write never looks like
+    a complete file.
+    """
+
+    def __init__(self, fp: TextIO):
+        self.fp = fp
+        self.count = 0
+
+    def __enter__(self) -> "JSONArrayWriter":
+        self.fp.write("[")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.fp.write("]")
+
+    def write(self, element: Any) -> None:
+        if self.count:
+            self.fp.write(", ")
+        self.fp.write(json.dumps(element))
+        self.count += 1
+
+    def write_all(self, elements: Iterable[Any]) -> None:
+        for element in elements:
+            self.write(element)
+
+
+def write_json_file(path: str, elements: Iterable[Any], encoding: str = "utf-8") -> int:
+    """
+    Writes the elements as a JSON array and returns how many were written.
+
+    The array is written to a temporary file first, so elements can be read from the file
+    that is being replaced, e.g. with iter_json_file.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding=encoding) as fp:
+            with JSONArrayWriter(fp) as writer:
+                writer.write_all(elements)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return writer.count
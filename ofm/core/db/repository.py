@@ -0,0 +1,218 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import astuple
+from typing import Optional
+from uuid import UUID
+
+from ofm.core.football.club import Club
+from ofm.core.football.player import PlayerTeam
+
+from .database import DB, DatabaseLoadError
+from .sqlite_database import SQLiteDB
+
+
+def get_player_state(player: PlayerTeam) -> tuple:
+    """
+    The parts of a player that change during the season: stamina, fitness, injury and
+    contract. ClubRepository.save only writes the players whose state changed.
+    """
+    details = player.details
+    return (
+        details.stamina,
+        details.fitness,
+        details.injury_type,
+        astuple(player.contract),
+    )
+
+
+class ClubRepository:
+    """
+    Loads clubs on demand from a DB.
+
+    Club definitions (name, stadium, squad ids, ...) are loaded when the repository is
+    created, but the Player and PlayerTeam objects of a squad are only created the first
+    time the club is requested. Loaded clubs are kept in an identity map, so requesting
+    the same club again returns the same objects.
+
+    The identity map keeps at most max_clubs clubs, and the least recently used ones are
+    dropped first. A dropped club is loaded from the database again the next time it is
+    requested, unless its players have changes that were not saved yet.
+
+    With SQLiteDB, loading a club only reads the club's rows. The JSON files can only be
+    read whole, so the first club loaded from them reads and indexes all the players and
+    squads once, and the following clubs are created from that index.
+
+    save only writes the players whose state (see get_player_state) changed since their
+    club was loaded or last saved, e.g. after a matchday.
+    """
+
+    def __init__(self, db: DB, max_clubs: int = 32):
+        self.db = db
+        self.max_clubs = max_clubs
+        self.clubs: dict[UUID, dict] = {
+            UUID(int=club["id"]): club for club in db.load_clubs()
+        }
+        self._player_clubs: dict[int, UUID] = {
+            player_id: club_id
+            for club_id, club in self.clubs.items()
+            for player_id in club["squad"]
+        }
+        self._loaded_clubs: OrderedDict[UUID, Club] = OrderedDict()
+        # Dropped clubs whose players have unsaved changes
+        self._unsaved_clubs: dict[UUID, Club] = {}
+        self._saved_states: dict[UUID, tuple] = {}
+        self._players_by_id: Optional[dict[int, dict]] = None
+        self._squads_by_team: Optional[dict[int, list[dict]]] = None
+
+    def __len__(self) -> int:
+        return len(self.clubs)
+
+    def __contains__(self, club_id: UUID) -> bool:
+        return club_id in self.clubs
+
+    @property
+    def loaded_clubs(self) -> list[UUID]:
+        return list(self._loaded_clubs)
+
+    def get_club_ids(self) -> list[UUID]:
+        return list(self.clubs)
+
+    def get_club(self, club_id: UUID) -> Club:
+        if (club := self._loaded_clubs.get(club_id)) is not None:
+            self._loaded_clubs.move_to_end(club_id)
+            return club
+
+        if (club := self._unsaved_clubs.pop(club_id, None)) is None:
+            try:
+                club_dict = self.clubs[club_id]
+            except KeyError as e:
+                raise DatabaseLoadError("Club does not exist in database!") from e
+
+            club = self._load_club(club_dict)
+            for player in club.squad:
+                self._saved_states[player.details.player_id] = get_player_state(player)
+
+        self._loaded_clubs[club_id] = club
+        if len(self._loaded_clubs) > self.max_clubs:
+            dropped_id, dropped = self._loaded_clubs.popitem(last=False)
+            if self._get_changed_players(dropped):
+                self._unsaved_clubs[dropped_id] = dropped
+            else:
+                for player in dropped.squad:
+                    del self._saved_states[player.details.player_id]
+        return club
+
+    def get_clubs(self, club_ids: Iterable[UUID]) -> list[Club]:
+        return [self.get_club(club_id) for club_id in club_ids]
+
+    def get_player(self, player_id: UUID) -> PlayerTeam:
+        """
+        Returns the player from its club's squad, loading the club if needed.
+        """
+        try:
+            club_id = self._player_clubs[player_id.int]
+        except KeyError as e:
+            raise DatabaseLoadError("Player does not exist in database!") from e
+
+        for player in self.get_club(club_id).squad:
+            if player.details.player_id == player_id:
+                return player
+
+        raise DatabaseLoadError("Player does not exist in database!")
+
+    def _get_changed_players(self, club: Club) -> list[PlayerTeam]:
+        return [
+            player
+            for player in club.squad
+            if get_player_state(player) != self._saved_states[player.details.player_id]
+        ]
+
+    def get_changed_players(self) -> list[PlayerTeam]:
+        """
+        Returns the players whose state changed since they were loaded or last saved.
+        """
+        return [
+            player
+            for clubs in (self._loaded_clubs, self._unsaved_clubs)
+            for club in clubs.values()
+            for player in self._get_changed_players(club)
+        ]
+
+    def save(self) -> int:
+        """
+        Writes the changed players to the database and returns how many were written. Only
+        the player records are written if the contract didn't change, and vice versa.
+        """
+        changed = self.get_changed_players()
+        changed_details = []
+        changed_contracts = []
+        for player in changed:
+            state = get_player_state(player)
+            saved_state = self._saved_states[player.details.player_id]
+            if state[:-1] != saved_state[:-1]:
+                changed_details.append(player)
+            if state[-1] != saved_state[-1]:
+                changed_contracts.append(player)
+
+        self.db.save_players([player.details for player in changed_details])
+        self.db.save_contracts(changed_contracts)
+        self._update_indexes(changed_details, changed_contracts)
+
+        for player in changed:
+            self._saved_states[player.details.player_id] = get_player_state(player)
+        for club in self._unsaved_clubs.values():
+            for player in club.squad:
+                del self._saved_states[player.details.player_id]
+        self._unsaved_clubs.clear()
+        return len(changed)
+
+    def _update_indexes(
+        self, changed_details: list[PlayerTeam], changed_contracts: list[PlayerTeam]
+    ) -> None:
+        # The JSON indexes are the records that dropped clubs are loaded from again
+        if self._players_by_id is not None:
+            for player in changed_details:
+                self._players_by_id[
+                    player.details.player_id.int
+                ] = player.details.serialize()
+        if self._squads_by_team is not None and changed_contracts:
+            contracts = {
+                player.details.player_id.int: player.contract.serialize()
+                for player in changed_contracts
+            }
+            for squad in self._squads_by_team.values():
+                for player in squad:
+                    if player["player_id"] in contracts:
+                        player["contract"] = contracts[player["player_id"]]
+
+    def _load_club(self, club: dict) -> Club:
+        if isinstance(self.db, SQLiteDB):
+            # Only reads the club's rows
+            return self.db.load_club(UUID(int=club["id"]))
+
+        # The JSON files can only be read whole, but they are only indexed once
+        if self._players_by_id is None or self._squads_by_team is None:
+            self._players_by_id = {
+                player["id"]: player for player in self.db.load_players()
+            }
+            self._squads_by_team = self.db.get_squads_by_team(
+                self.db.load_squads_file()
+            )
+        return self.db.get_club_from_dicts(
+            club, self._players_by_id, self._squads_by_team
+        )
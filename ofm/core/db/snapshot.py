@@ -0,0 +1,452 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Binary snapshot of the whole world: players, clubs, squads and contracts.
+
+The JSON files are still the interchange format, but a snapshot loads much faster: every
+record has a fixed width, strings are stored once in a string table and referenced by
+index, and dates are stored as ordinals instead of strings that need strptime.
+
+Layout (little endian):
+
+    header    HEADER
+    strings   (num_strings + 1) u32 offsets into the UTF-8 blob, then the blob
+    players   num_players PLAYER records
+    clubs     num_clubs CLUB records
+    squads    num_squads SQUAD records, the squad of each club is a contiguous range
+
+The file is read through mmap, and records are only decoded when they are accessed.
+
+The header also holds the generation of the database the snapshot was written from. Backends
+that can't rely on file modification times (e.g. SQLite) use it to tell if the snapshot is
+still current.
+"""
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from ofm.core.football.attribute_store import ATTRIBUTE_GROUPS, GROUP_SLICES
+from ofm.core.football.club import Club
+from ofm.core.football.injury import PlayerInjury
+from ofm.core.football.player import Player, PlayerTeam, Positions, PreferredFoot
+from ofm.core.football.player_attributes import PlayerAttributes
+from ofm.core.football.playercontract import PlayerContract
+
+MAGIC = b"OFMS"
+VERSION = 2
+
+# magic, version, num_strings, num_players, num_clubs, num_squads, database generation,
+# and the offsets of the strings, players, clubs and squads sections
+HEADER = struct.Struct("<4sHxxIIIIQQQQQ")
+# id, nationality, dob, first_name, last_name, short_name, positions, fitness, stamina,
+# form, attributes, potential_skill, international_reputation, preferred_foot, value,
+# injury_type
+PLAYER = struct.Struct("<16sIiIII4sddd22sHBBdB")
+# id, name, country, location, default_formation, stadium, stadium_capacity,
+# first squad record, number of squad records
+CLUB = struct.Struct("<16sIIIIIIII")
+# player index, has team, team_id, shirt_number, wage, contract_started, contract_end,
+# bonus_for_goal, bonus_for_def
+SQUAD = struct.Struct("<IB16sHdiidd")
+OFFSET = struct.Struct("<I")
+
+MAX_POSITIONS = 4
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings: list[str] = []
+        self.index: dict[str, int] = {}
+
+    def add(self, string: str) -> int:
+        if (i := self.index.get(string)) is None:
+            i = len(self.strings)
+            self.strings.append(string)
+            self.index[string] = i
+        return i
+
+    def serialize(self) -> bytes:
+        blobs = [string.encode("utf-8") for string in self.strings]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(blobs)
+
+
+def _pack_player(player: Player, strings: _StringTable) -> bytes:
+    attributes = player.attributes
+    positions = bytes(position.value for position in player.positions[:MAX_POSITIONS])
+    return PLAYER.pack(
+        player.player_id.bytes,
+        strings.add(player.nationality),
+        player.dob.toordinal(),
+        strings.add(player.first_name),
+        strings.add(player.last_name),
+        strings.add(player.short_name),
+        positions,
+        player.fitness,
+        player.stamina,
+        player.form,
+        bytes(
+            value
+            for name, _ in ATTRIBUTE_GROUPS
+            for value in getattr(attributes, name).serialize().values()
+        ),
+        player.potential_skill,
+        player.international_reputation,
+        player.preferred_foot.value,
+        player.value,
+        player.injury_type.value,
+    )
+
+
+class SnapshotWriter:
+    """
+    Builds a snapshot one club or player at a time, so the clubs can be written as they
+    are produced. Only the packed records are kept until the snapshot is written.
+    """
+
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self.strings = _StringTable()
+        self.player_records: list[bytes] = []
+        self.player_index: dict[UUID, int] = {}
+        self.club_records: list[bytes] = []
+        self.squad_records: list[bytes] = []
+
+    def add_player(self, player: Player) -> int:
+        if (i := self.player_index.get(player.player_id)) is None:
+            i = len(self.player_records)
+            self.player_records.append(_pack_player(player, self.strings))
+            self.player_index[player.player_id] = i
+        return i
+
+    def add_club(self, club: Club) -> None:
+        """
+        Adds the club and its squad. Players of the squad are added if they are missing.
+        """
+        strings = self.strings
+        self.club_records.append(
+            CLUB.pack(
+                club.club_id.bytes,
+                strings.add(club.name),
+                strings.add(club.country),
+                strings.add(club.location),
+                strings.add(club.default_formation),
+                strings.add(club.stadium),
+                club.stadium_capacity,
+                len(self.squad_records),
+                len(club.squad),
+            )
+        )
+        for player_team in club.squad:
+            contract = player_team.contract
+            self.squad_records.append(
+                SQUAD.pack(
+                    self.add_player(player_team.details),
+                    player_team.team_id is not None,
+                    player_team.team_id.bytes if player_team.team_id else bytes(16),
+                    player_team.shirt_number,
+                    contract.wage,
+                    contract.contract_started.toordinal(),
+                    contract.contract_end.toordinal(),
+                    contract.bonus_for_goal,
+                    contract.bonus_for_def,
+                )
+            )
+
+    def write(self, path: str) -> None:
+        """
+        Writes the snapshot to a temporary file first, so an existing snapshot is only
+        replaced once the new one is complete.
+        """
+        string_table = self.strings.serialize()
+        strings_offset = HEADER.size
+        players_offset = strings_offset + len(string_table)
+        clubs_offset = players_offset + len(self.player_records) * PLAYER.size
+        squads_offset = clubs_offset + len(self.club_records) * CLUB.size
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(self.strings.strings),
+            len(self.player_records),
+            len(self.club_records),
+            len(self.squad_records),
+            self.generation,
+            strings_offset,
+            players_offset,
+            clubs_offset,
+            squads_offset,
+        )
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fp:
+            fp.write(header)
+            fp.write(string_table)
+            fp.writelines(self.player_records)
+            fp.writelines(self.club_records)
+            fp.writelines(self.squad_records)
+        os.replace(tmp_path, path)
+
+
+def write_snapshot(
+    path: str,
+    clubs: Iterable[Club],
+    players: Iterable[Player] = (),
+    generation: int = 0,
+) -> None:
+    """
+    Writes a snapshot of the clubs, their squads and the players. Players of the squads
+    don't need to be in players, they are added if they are missing.
+    """
+    writer = SnapshotWriter(generation)
+    for player in players:
+        writer.add_player(player)
+    for club in clubs:
+        writer.add_club(club)
+    writer.write(path)
+
+
+class WorldSnapshot:
+    """
+    Read access to a snapshot file.
+
+    Nothing is decoded when the snapshot is opened. Strings and players are decoded the
+    first time they are accessed and then cached, so a player in a squad is the same
+    object returned by get_player.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as fp:
+            try:
+                self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise SnapshotError("Snapshot file is empty!") from e
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise SnapshotError("Snapshot file is truncated!")
+        (
+            magic,
+            version,
+            self.num_strings,
+            self.num_players,
+            self.num_clubs,
+            self.num_squads,
+            self.generation,
+            self._strings_offset,
+            self._players_offset,
+            self._clubs_offset,
+            self._squads_offset,
+        ) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self.close()
+            raise SnapshotError("Not a snapshot file!")
+        if version != VERSION:
+            self.close()
+            raise SnapshotError(f"Unsupported snapshot version {version}!")
+
+        self._blob_offset = self._strings_offset + (self.num_strings + 1) * OFFSET.size
+        self._strings: list[Optional[str]] = [None] * self.num_strings
+        self._players: dict[int, Player] = {}
+        self._player_index: Optional[dict[bytes, int]] = None
+        self._club_index: Optional[dict[bytes, int]] = None
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_string(self, index: int) -> str:
+        if (string := self._strings[index]) is None:
+            offset = self._strings_offset + index * OFFSET.size
+            start, end = struct.unpack_from("<II", self._mmap, offset)
+            string = str(
+                self._mmap[self._blob_offset + start : self._blob_offset + end],
+                "utf-8",
+            )
+            self._strings[index] = string
+        return string
+
+    def get_player(self, index: int) -> Player:
+        if (player := self._players.get(index)) is not None:
+            return player
+        if not 0 <= index < self.num_players:
+            raise IndexError("Player index out of range")
+
+        (
+            player_id,
+            nationality,
+            dob,
+            first_name,
+            last_name,
+            short_name,
+            positions,
+            fitness,
+            stamina,
+            form,
+            attributes,
+            potential_skill,
+            international_reputation,
+            preferred_foot,
+            value,
+            injury_type,
+        ) = PLAYER.unpack_from(self._mmap, self._players_offset + index * PLAYER.size)
+
+        player = Player(
+            UUID(bytes=player_id),
+            self.get_string(nationality),
+            date.fromordinal(dob),
+            self.get_string(first_name),
+            self.get_string(last_name),
+            self.get_string(short_name),
+            [Positions(position) for position in positions if position],
+            fitness,
+            stamina,
+            form,
+            PlayerAttributes(
+                *(
+                    group(*attributes[start:end])
+                    for (_, group), (start, end) in zip(ATTRIBUTE_GROUPS, GROUP_SLICES)
+                )
+            ),
+            potential_skill,
+            international_reputation,
+            PreferredFoot(preferred_foot),
+            value,
+            PlayerInjury(injury_type),
+        )
+        self._players[index] = player
+        return player
+
+    def iter_players(self) -> Iterator[Player]:
+        for index in range(self.num_players):
+            yield self.get_player(index)
+
+    def get_player_by_id(self, player_id: UUID) -> Player:
+        if self._player_index is None:
+            self._player_index = {
+                self._mmap[offset : offset + 16]: index
+                for index, offset in enumerate(
+                    range(
+                        self._players_offset,
+                        self._players_offset + self.num_players * PLAYER.size,
+                        PLAYER.size,
+                    )
+                )
+            }
+        try:
+            return self.get_player(self._player_index[player_id.bytes])
+        except KeyError as e:
+            raise SnapshotError("Player does not exist in snapshot!") from e
+
+    def get_club(self, index: int) -> Club:
+        """
+        Decodes the club and its squad. Clubs are not cached, the squad players are.
+        """
+        if not 0 <= index < self.num_clubs:
+            raise IndexError("Club index out of range")
+
+        (
+            club_id,
+            name,
+            country,
+            location,
+            default_formation,
+            stadium,
+            stadium_capacity,
+            squad_start,
+            squad_count,
+        ) = CLUB.unpack_from(self._mmap, self._clubs_offset + index * CLUB.size)
+
+        squad = []
+        for offset in range(
+            self._squads_offset + squad_start * SQUAD.size,
+            self._squads_offset + (squad_start + squad_count) * SQUAD.size,
+            SQUAD.size,
+        ):
+            (
+                player_index,
+                has_team,
+                team_id,
+                shirt_number,
+                wage,
+                contract_started,
+                contract_end,
+                bonus_for_goal,
+                bonus_for_def,
+            ) = SQUAD.unpack_from(self._mmap, offset)
+            squad.append(
+                PlayerTeam(
+                    self.get_player(player_index),
+                    UUID(bytes=team_id) if has_team else None,
+                    shirt_number,
+                    PlayerContract(
+                        wage,
+                        date.fromordinal(contract_started),
+                        date.fromordinal(contract_end),
+                        bonus_for_goal,
+                        bonus_for_def,
+                    ),
+                )
+            )
+
+        return Club(
+            UUID(bytes=club_id),
+            self.get_string(name),
+            self.get_string(country),
+            self.get_string(location),
+            self.get_string(default_formation),
+            squad,
+            self.get_string(stadium),
+            stadium_capacity,
+        )
+
+    def iter_clubs(self) -> Iterator[Club]:
+        for index in range(self.num_clubs):
+            yield self.get_club(index)
+
+    def load_clubs(self) -> list[Club]:
+        return list(self.iter_clubs())
+
+    def get_club_by_id(self, club_id: UUID) -> Club:
+        if self._club_index is None:
+            self._club_index = {
+                self._mmap[offset : offset + 16]: index
+                for index, offset in enumerate(
+                    range(
+                        self._clubs_offset,
+                        self._clubs_offset + self.num_clubs * CLUB.size,
+                        CLUB.size,
+                    )
+                )
+            }
+        try:
+            return self.get_club(self._club_index[club_id.bytes])
+        except KeyError as e:
+            raise SnapshotError("Club does not exist in snapshot!") from e
@@ -0,0 +1,435 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import json
+import os
+import sqlite3
+import uuid
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+from ofm.core.football.club import Club
+from ofm.core.football.injury import PlayerInjury
+from ofm.core.football.player import Player, PlayerTeam, Positions
+from ofm.core.settings import Settings
+
+from .database import DB, DatabaseLoadError, PlayerTeamLoadError
+from .generators import PlayerGenerator
+from .snapshot import SnapshotError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id BLOB PRIMARY KEY,
+    nationality TEXT NOT NULL,
+    dob TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    short_name TEXT NOT NULL,
+    positions TEXT NOT NULL,
+    fitness REAL NOT NULL,
+    stamina REAL NOT NULL,
+    form REAL NOT NULL,
+    attributes TEXT NOT NULL,
+    potential_skill INTEGER NOT NULL,
+    international_reputation INTEGER NOT NULL,
+    preferred_foot INTEGER NOT NULL,
+    value REAL NOT NULL,
+    injury_type INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS clubs (
+    id BLOB PRIMARY KEY,
+    name TEXT NOT NULL,
+    country TEXT NOT NULL,
+    location TEXT NOT NULL,
+    default_formation TEXT NOT NULL,
+    stadium TEXT NOT NULL,
+    stadium_capacity INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS squads (
+    player_id BLOB PRIMARY KEY REFERENCES players (id),
+    team_id BLOB REFERENCES clubs (id),
+    shirt_number INTEGER NOT NULL,
+    squad_index INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS squads_team_id ON squads (team_id, squad_index);
+
+CREATE TABLE IF NOT EXISTS contracts (
+    player_id BLOB PRIMARY KEY REFERENCES players (id),
+    wage REAL NOT NULL,
+    started TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    bonus_for_goal REAL NOT NULL,
+    bonus_for_def REAL NOT NULL
+) WITHOUT ROWID;
+
+-- Bumped on every write, so the snapshot can tell if it is still current. It starts at 1,
+-- snapshots written from the JSON files have generation 0.
+CREATE TABLE IF NOT EXISTS world (generation INTEGER NOT NULL);
+INSERT INTO world (generation) SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM world);
+"""
+
+PLAYER_COLUMNS = (
+    "id, nationality, dob, first_name, last_name, short_name, positions, fitness, "
+    "stamina, form, attributes, potential_skill, international_reputation, "
+    "preferred_foot, value, injury_type"
+)
+CLUB_COLUMNS = (
+    "id, name, country, location, default_formation, stadium, stadium_capacity"
+)
+SQUAD_COLUMNS = (
+    "squads.player_id, squads.team_id, squads.shirt_number, contracts.wage, "
+    'contracts.started, contracts."end", contracts.bonus_for_goal, '
+    "contracts.bonus_for_def"
+)
+
+INSERT_PLAYER = (
+    f"INSERT OR REPLACE INTO players ({PLAYER_COLUMNS}) VALUES ({', '.join('?' * 16)})"
+)
+INSERT_CLUB = (
+    f"INSERT OR REPLACE INTO clubs ({CLUB_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_SQUAD = "INSERT OR REPLACE INTO squads VALUES (?, ?, ?, ?)"
+INSERT_CONTRACT = "INSERT OR REPLACE INTO contracts VALUES (?, ?, ?, ?, ?, ?)"
+# Referenced tables are emptied first
+DELETE_WORLD = tuple(
+    f"DELETE FROM {table}" for table in ("contracts", "squads", "clubs", "players")
+)
+
+SELECT_GENERATION = "SELECT generation FROM world"
+UPDATE_GENERATION = "UPDATE world SET generation = generation + 1"
+
+SELECT_PLAYERS = f"SELECT {PLAYER_COLUMNS} FROM players"
+SELECT_PLAYER = f"{SELECT_PLAYERS} WHERE id = ?"
+SELECT_CLUB_PLAYERS = (
+    f"SELECT {', '.join('players.' + c for c in PLAYER_COLUMNS.split(', '))} "
+    "FROM squads JOIN players ON players.id = squads.player_id "
+    "WHERE squads.team_id = ? ORDER BY squads.squad_index"
+)
+SELECT_CLUBS = f"SELECT {CLUB_COLUMNS} FROM clubs"
+SELECT_CLUB = f"{SELECT_CLUBS} WHERE id = ?"
+SELECT_SQUADS = (
+    f"SELECT {SQUAD_COLUMNS} FROM squads "
+    "JOIN contracts ON contracts.player_id = squads.player_id "
+    "ORDER BY squads.team_id, squads.squad_index"
+)
+SELECT_CLUB_SQUAD = (
+    f"SELECT {SQUAD_COLUMNS} FROM squads "
+    "JOIN contracts ON contracts.player_id = squads.player_id "
+    "WHERE squads.team_id = ? ORDER BY squads.squad_index"
+)
+SELECT_SQUAD_IDS = "SELECT team_id, player_id FROM squads ORDER BY team_id, squad_index"
+
+
+def _to_blob(id_: Optional[int]) -> Optional[bytes]:
+    return None if id_ is None else id_.to_bytes(16, "big")
+
+
+def _to_int(blob: Optional[bytes]) -> Optional[int]:
+    return None if blob is None else int.from_bytes(blob, "big")
+
+
+def get_player_row(player: dict) -> tuple:
+    return (
+        _to_blob(player["id"]),
+        player["nationality"],
+        player["dob"],
+        player["first_name"],
+        player["last_name"],
+        player["short_name"],
+        json.dumps(player["positions"]),
+        player["fitness"],
+        player["stamina"],
+        player["form"],
+        json.dumps(player["attributes"]),
+        player["potential_skill"],
+        player["international_reputation"],
+        player["preferred_foot"],
+        player["value"],
+        player["injury_type"],
+    )
+
+
+def get_contract_row(squad_player: dict) -> tuple:
+    contract = squad_player["contract"]
+    return (
+        _to_blob(squad_player["player_id"]),
+        contract["wage"],
+        contract["started"],
+        contract["end"],
+        contract["bonus_for_goal"],
+        contract["bonus_for_def"],
+    )
+
+
+def get_player_dict(row: tuple) -> dict:
+    return {
+        "id": _to_int(row[0]),
+        "nationality": row[1],
+        "dob": row[2],
+        "first_name": row[3],
+        "last_name": row[4],
+        "short_name": row[5],
+        "positions": json.loads(row[6]),
+        "fitness": row[7],
+        "stamina": row[8],
+        "form": row[9],
+        "attributes": json.loads(row[10]),
+        "potential_skill": row[11],
+        "international_reputation": row[12],
+        "preferred_foot": row[13],
+        "value": row[14],
+        "injured": PlayerInjury(row[15]) != PlayerInjury.NO_INJURY,
+        "injury_type": row[15],
+    }
+
+
+def get_squad_dict(row: tuple) -> dict:
+    return {
+        "player_id": _to_int(row[0]),
+        "team_id": _to_int(row[1]),
+        "shirt_number": row[2],
+        "contract": {
+            "wage": row[3],
+            "started": row[4],
+            "end": row[5],
+            "bonus_for_goal": row[6],
+            "bonus_for_def": row[7],
+        },
+    }
+
+
+class SQLiteDB(DB):
+    """
+    Database backend that keeps the world in a single SQLite file instead of the three JSON
+    files. It loads the same dictionaries as DB, so everything built on top of DB keeps
+    working, but single clubs and players can also be loaded and saved without touching
+    the rest of the database.
+
+    Players, clubs, squads and contracts have their own tables, keyed by the ids. The
+    connection uses WAL mode, so reading the database doesn't block saving it.
+    """
+
+    def __init__(self, settings: Settings, database_file: Optional[str] = None):
+        super().__init__(settings)
+        self._database_file = database_file
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def database_file(self) -> str:
+        return self._database_file or self.settings.database_file
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.database_file) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.database_file)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_generation(self) -> int:
+        return self.connection.execute(SELECT_GENERATION).fetchone()[0]
+
+    def is_snapshot_current(self) -> bool:
+        """
+        The database file is changed in place, so its modification time can't be trusted.
+        The snapshot is current if it was written from this generation of the database.
+        """
+        if not os.path.exists(self.snapshot_file):
+            return False
+        try:
+            with self.open_snapshot() as snapshot:
+                return snapshot.generation == self.get_generation()
+        except SnapshotError:
+            return False
+
+    def load_clubs(self) -> list[dict]:
+        squads: dict[bytes, list[int]] = {}
+        for team_id, player_id in self.connection.execute(SELECT_SQUAD_IDS):
+            squads.setdefault(team_id, []).append(_to_int(player_id))
+
+        return [
+            {
+                "id": _to_int(row[0]),
+                "name": row[1],
+                "country": row[2],
+                "location": row[3],
+                "default_formation": row[4],
+                "squad": squads.get(row[0], []),
+                "stadium": row[5],
+                "stadium_capacity": row[6],
+            }
+            for row in self.connection.execute(SELECT_CLUBS)
+        ]
+
+    def load_players(self) -> list[dict]:
+        return list(self.iter_players())
+
+    def iter_players(self) -> Iterator[dict]:
+        for row in self.connection.execute(SELECT_PLAYERS):
+            yield get_player_dict(row)
+
+    def load_squads_file(self) -> list[dict]:
+        return [get_squad_dict(row) for row in self.connection.execute(SELECT_SQUADS)]
+
+    def check_clubs_file(self, amount: Optional[int] = None) -> None:
+        if self.connection.execute("SELECT 1 FROM clubs LIMIT 1").fetchone() is None:
+            self.generate_teams_and_squads(clubs_def=None, amount=amount)
+
+    def load_player(self, player_id: uuid.UUID) -> Player:
+        row = self.connection.execute(
+            SELECT_PLAYER, (_to_blob(player_id.int),)
+        ).fetchone()
+        if row is None:
+            raise DatabaseLoadError("Player does not exist in database!")
+        return Player.get_from_dict(get_player_dict(row))
+
+    def load_club(self, club_id: uuid.UUID) -> Club:
+        """
+        Loads a single club and its squad. Only the club's rows are read.
+        """
+        club_blob = _to_blob(club_id.int)
+        row = self.connection.execute(SELECT_CLUB, (club_blob,)).fetchone()
+        if row is None:
+            raise DatabaseLoadError("Club does not exist in database!")
+
+        players = [
+            Player.get_from_dict(get_player_dict(player_row))
+            for player_row in self.connection.execute(SELECT_CLUB_PLAYERS, (club_blob,))
+        ]
+        squads_dict = [
+            get_squad_dict(squad_row)
+            for squad_row in self.connection.execute(SELECT_CLUB_SQUAD, (club_blob,))
+        ]
+        try:
+            squad = self.get_player_team_from_dicts(squads_dict, players)
+        except PlayerTeamLoadError:
+            squad = []
+
+        return Club(
+            club_id,
+            row[1],
+            row[2],
+            row[3],
+            row[4],
+            squad,
+            row[5],
+            row[6],
+        )
+
+    def save_players(self, players: Iterable[Player]) -> None:
+        """
+        Writes only the given players, e.g. the ones that changed after a matchday.
+        """
+        with self.connection:
+            self.connection.executemany(
+                INSERT_PLAYER,
+                (get_player_row(player.serialize()) for player in players),
+            )
+            self.connection.execute(UPDATE_GENERATION)
+
+    def save_contracts(self, players: Iterable[PlayerTeam]) -> None:
+        """
+        Writes only the contracts of the given players.
+        """
+        with self.connection:
+            self.connection.executemany(
+                INSERT_CONTRACT,
+                (get_contract_row(player.serialize()) for player in players),
+            )
+            self.connection.execute(UPDATE_GENERATION)
+
+    def save_clubs(self, clubs: Iterable[Club]) -> None:
+        """
+        Replaces the whole world with the clubs, their players and squads, just like DB
+        rewrites its files. The clubs are written as they are iterated, so clubs can be saved
+        while they are generated.
+
+        Everything happens in a single transaction: if the clubs fail to be produced, the
+        previous world is kept.
+        """
+        with self.connection:
+            for statement in DELETE_WORLD:
+                self.connection.execute(statement)
+            for club in clubs:
+                self._save_club(club)
+            self.connection.execute(UPDATE_GENERATION)
+
+    def _save_club(self, club: Club) -> None:
+        club_dict = club.serialize()
+        club_id = _to_blob(club_dict["id"])
+        player_rows = []
+        squad_rows = []
+        contract_rows = []
+        for index, player in enumerate(club.squad):
+            player_rows.append(get_player_row(player.details.serialize()))
+            squad_dict = player.serialize()
+            squad_rows.append(
+                (
+                    _to_blob(player.details.player_id.int),
+                    _to_blob(squad_dict["team_id"]),
+                    squad_dict["shirt_number"],
+                    index,
+                )
+            )
+            contract_rows.append(get_contract_row(squad_dict))
+
+        self.connection.execute(
+            INSERT_CLUB,
+            (
+                club_id,
+                club_dict["name"],
+                club_dict["country"],
+                club_dict["location"],
+                club_dict["default_formation"],
+                club_dict["stadium"],
+                club_dict["stadium_capacity"],
+            ),
+        )
+        self.connection.executemany(INSERT_PLAYER, player_rows)
+        self.connection.executemany(INSERT_SQUAD, squad_rows)
+        self.connection.executemany(INSERT_CONTRACT, contract_rows)
+
+    def generate_players(
+        self,
+        amount: int = 50 * 22,
+        region: Optional[str] = None,
+        desired_pos: Optional[list[Positions]] = None,
+    ) -> list[dict]:
+        players = PlayerGenerator()
+        players.generate(amount, region, desired_pos)
+        players_dict = players.get_players_dictionaries()
+        with self.connection:
+            self.connection.executemany(
+                INSERT_PLAYER, (get_player_row(player) for player in players_dict)
+            )
+            self.connection.execute(UPDATE_GENERATION)
+        return players_dict
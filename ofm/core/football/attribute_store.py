@@ -0,0 +1,368 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from functools import cache
+from itertools import repeat
+from operator import floordiv, mul
+from typing import TYPE_CHECKING, Union
+from uuid import UUID
+
+from .player_attributes import (
+    Attributes,
+    DefensiveAttributes,
+    GkAttributes,
+    IntelligenceAttributes,
+    OffensiveAttributes,
+    PhysicalAttributes,
+    PlayerAttributes,
+    _get_attribute_names,
+)
+from .positions import Positions
+
+if TYPE_CHECKING:
+    from .player import Player
+
+# Attribute groups, in the order they are stored in a row
+ATTRIBUTE_GROUPS: tuple[tuple[str, type[Attributes]], ...] = (
+    ("offensive", OffensiveAttributes),
+    ("physical", PhysicalAttributes),
+    ("defensive", DefensiveAttributes),
+    ("intelligence", IntelligenceAttributes),
+    ("gk", GkAttributes),
+)
+
+
+def _get_group_slices() -> tuple[tuple[int, int], ...]:
+    slices = []
+    start = 0
+    for _, group in ATTRIBUTE_GROUPS:
+        end = start + len(_get_attribute_names(group))
+        slices.append((start, end))
+        start = end
+    return tuple(slices)
+
+
+GROUP_SLICES = _get_group_slices()
+ROW_SIZE = GROUP_SLICES[-1][1]
+
+# Weight of each group's overall in the overall of a position. Same formulas as
+# PlayerAttributes.get_gk_overall, get_df_overall, etc.
+OVERALL_WEIGHTS: dict[Positions, tuple[int, ...]] = {
+    Positions.GK: (0, 1, 2, 1, 3),
+    Positions.DF: (1, 2, 3, 1, 0),
+    Positions.MF: (1, 2, 1, 3, 0),
+    Positions.FW: (3, 1, 1, 2, 0),
+}
+
+
+def get_overalls(data: Union[bytes, bytearray], position: Positions) -> array:
+    """
+    Returns the overall in the given position of each row in data.
+
+    Each attribute is read as a column (a strided slice of data), so the sums are done a
+    column at a time instead of a player at a time.
+    """
+    num_rows = len(data) // ROW_SIZE
+    weights = OVERALL_WEIGHTS.get(position)
+    if weights is None:
+        return array("B", bytes(num_rows))
+
+    group_overalls = [
+        map(
+            floordiv,
+            map(sum, zip(*(data[column::ROW_SIZE] for column in range(start, end)))),
+            repeat(end - start),
+        )
+        for start, end in GROUP_SLICES
+    ]
+    divisor = sum(weights)
+    return array(
+        "B",
+        (
+            sum(map(mul, overalls, weights)) // divisor
+            for overalls in zip(*group_overalls)
+        ),
+    )
+
+
+def get_player_attributes_from_row(values: Union[bytes, bytearray]) -> PlayerAttributes:
+    """
+    Creates a PlayerAttributes object with the values of a row.
+    """
+    return PlayerAttributes(
+        *(
+            group(*values[start:end])
+            for (_, group), (start, end) in zip(ATTRIBUTE_GROUPS, GROUP_SLICES)
+        )
+    )
+
+
+class _StoredAttributes:
+    """
+    Attribute group that reads and writes its values directly in an AttributeStore row.
+    """
+
+    def __init__(self, data: bytearray, start: int):
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_start", start)
+
+    def __eq__(self, other):
+        if not isinstance(other, Attributes):
+            return NotImplemented
+        return self.serialize() == other.serialize()
+
+    def invalidate_overall(self) -> None:
+        # Nothing is cached, the overall is always read from the row
+        pass
+
+    def get_overall(self) -> int:
+        size = len(_get_attribute_names(type(self)))
+        return sum(self._data[self._start : self._start + size]) // size
+
+
+def _get_stored_attribute(index: int):
+    def getter(self) -> int:
+        return self._data[self._start + index]
+
+    def setter(self, value: int) -> None:
+        self._data[self._start + index] = value
+
+    return property(getter, setter)
+
+
+@cache
+def _get_stored_group_class(group: type[Attributes]) -> type:
+    namespace = {
+        name: _get_stored_attribute(index)
+        for index, name in enumerate(_get_attribute_names(group))
+    }
+    return type(f"Stored{group.__name__}", (_StoredAttributes, group), namespace)
+
+
+def _get_stored_group(index: int):
+    name, group = ATTRIBUTE_GROUPS[index]
+    start = GROUP_SLICES[index][0]
+
+    def getter(self: "StoredPlayerAttributes") -> Attributes:
+        return _get_stored_group_class(group)(
+            self.store.data, self.row * ROW_SIZE + start
+        )
+
+    def setter(self: "StoredPlayerAttributes", attributes: Attributes) -> None:
+        values = attributes.serialize().values()
+        row_start = self.row * ROW_SIZE + start
+        self.store.data[row_start : row_start + len(values)] = bytes(values)
+
+    return property(getter, setter)
+
+
+class StoredPlayerAttributes:
+    """
+    Thin view of a player's attributes in an AttributeStore.
+
+    It can be used anywhere a PlayerAttributes is used. The attribute groups are created on
+    access and read and write the store's row directly, so the view itself only holds the
+    store and the row.
+    """
+
+    __slots__ = ("store", "row")
+
+    offensive = _get_stored_group(0)
+    physical = _get_stored_group(1)
+    defensive = _get_stored_group(2)
+    intelligence = _get_stored_group(3)
+    gk = _get_stored_group(4)
+
+    def __init__(self, store: "AttributeStore", row: int):
+        self.store = store
+        self.row = row
+
+    def __eq__(self, other):
+        if not isinstance(other, (PlayerAttributes, StoredPlayerAttributes)):
+            return NotImplemented
+        return self.serialize() == other.serialize()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.serialize()})"
+
+    def serialize(self) -> dict[str, dict[str, int]]:
+        return {name: getattr(self, name).serialize() for name, _ in ATTRIBUTE_GROUPS}
+
+    def get_overall(self, position: Positions) -> int:
+        return self.store.get_row_overall(self.row, position)
+
+    def get_gk_overall(self) -> int:
+        return self.get_overall(Positions.GK)
+
+    def get_df_overall(self) -> int:
+        return self.get_overall(Positions.DF)
+
+    def get_mf_overall(self) -> int:
+        return self.get_overall(Positions.MF)
+
+    def get_fw_overall(self) -> int:
+        return self.get_overall(Positions.FW)
+
+
+class AttributeStore:
+    """
+    Columnar storage for the attributes of every player in the database.
+
+    Each player is a row of ROW_SIZE bytes in a single bytearray, in the order of
+    ATTRIBUTE_GROUPS, and the index maps the player's id to the row. Attributes range
+    from 0 to 99, so a byte is enough for each one.
+
+    Bulk operations (overalls of every player, sorting, attribute progression) work on the
+    whole bytearray at once instead of going through each player's attribute objects.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.index: dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, player_id: UUID) -> bool:
+        return player_id in self.index
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    def add(
+        self,
+        player_id: UUID,
+        attributes: Union[PlayerAttributes, StoredPlayerAttributes],
+    ) -> int:
+        """
+        Stores the attributes of the player and returns its row. If the player is already
+        in the store, its row is overwritten.
+        """
+        values = bytes(
+            value
+            for name, _ in ATTRIBUTE_GROUPS
+            for value in getattr(attributes, name).serialize().values()
+        )
+        if (row := self.index.get(player_id)) is not None:
+            start = row * ROW_SIZE
+            self.data[start : start + ROW_SIZE] = values
+            return row
+
+        row = len(self.index)
+        self.data += values
+        self.index[player_id] = row
+        return row
+
+    def add_players(self, players: Iterable["Player"]) -> None:
+        """
+        Moves the attributes of the players to the store. Each player's attributes are
+        replaced by a StoredPlayerAttributes view of its row.
+        """
+        for player in players:
+            row = self.add(player.player_id, player.attributes)
+            player.attributes = StoredPlayerAttributes(self, row)
+
+    def add_rows(
+        self, player_ids: Sequence[UUID], data: Union[bytes, bytearray]
+    ) -> int:
+        """
+        Appends the rows in data to the store, one row for each player, and returns the
+        row of the first player. The players must not be in the store yet.
+        """
+        if len(data) != len(player_ids) * ROW_SIZE:
+            raise ValueError("There must be one row of attributes for each player!")
+
+        first_row = len(self.index)
+        index = dict(zip(player_ids, range(first_row, first_row + len(player_ids))))
+        if len(index) != len(player_ids) or not self.index.keys().isdisjoint(index):
+            raise ValueError("Players must not be added to the store twice!")
+
+        self.data += data
+        self.index.update(index)
+        return first_row
+
+    def get_attributes(self, player_id: UUID) -> StoredPlayerAttributes:
+        return StoredPlayerAttributes(self, self.index[player_id])
+
+    def get_row(self, player_id: UUID) -> bytes:
+        start = self.index[player_id] * ROW_SIZE
+        return bytes(self.data[start : start + ROW_SIZE])
+
+    def get_row_overall(self, row: int, position: Positions) -> int:
+        weights = OVERALL_WEIGHTS.get(position)
+        if weights is None:
+            return 0
+        data = self.data
+        offset = row * ROW_SIZE
+        total = 0
+        for weight, (start, end) in zip(weights, GROUP_SLICES):
+            if weight:
+                total += weight * (
+                    sum(data[offset + start : offset + end]) // (end - start)
+                )
+        return total // sum(weights)
+
+    def get_overall(self, player_id: UUID, position: Positions) -> int:
+        return self.get_row_overall(self.index[player_id], position)
+
+    def get_overalls(self, position: Positions) -> array:
+        """
+        Returns the overall of every player in the given position, in row order.
+        """
+        return get_overalls(self.data, position)
+
+    def sort_by_overall(
+        self, player_ids: Iterable[UUID], position: Positions
+    ) -> list[UUID]:
+        """
+        Sorts the players from the best to the worst in the given position.
+        """
+        overalls = self.get_overalls(position)
+        index = self.index
+        return sorted(
+            player_ids, key=lambda player_id: overalls[index[player_id]], reverse=True
+        )
+
+    def progress(
+        self,
+        changes: Mapping[UUID, Union[int, Sequence[int]]],
+        max_value: int = 99,
+    ) -> None:
+        """
+        Applies the attribute changes of each player, e.g. at the end of the season.
+
+        A change can be a single value added to every attribute of the player, or one
+        value per attribute in row order. Attributes are kept between 0 and max_value.
+        """
+        data = self.data
+        tables: dict[int, bytes] = {}
+        for player_id, change in changes.items():
+            start = self.index[player_id] * ROW_SIZE
+            end = start + ROW_SIZE
+            if isinstance(change, int):
+                if (table := tables.get(change)) is None:
+                    table = bytes(
+                        min(max(value + change, 0), max_value) for value in range(256)
+                    )
+                    tables[change] = table
+                data[start:end] = data[start:end].translate(table)
+            else:
+                data[start:end] = bytes(
+                    min(max(value + delta, 0), max_value)
+                    for value, delta in zip(data[start:end], change, strict=True)
+                )
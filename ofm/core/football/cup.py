@@ -13,6 +13,30 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+from uuid import UUID
+
+from ..simulation.batch import MatchResult, MatchSpec, simulate_matches
+from ..simulation.fixture import Fixture
+from .club import Club
+from .team_simulation import get_team_simulation
+
+
+def get_bracket_order(size: int) -> list[int]:
+    """
+    Order of the seeds in the first round of a bracket of the given size, a power of two.
+    The best seeds are spread out, so they can only meet in the last rounds: with 8 clubs,
+    the first round is 1 v 8, 4 v 5, 2 v 7 and 3 v 6 (0-based in the returned list).
+    """
+    order = [0]
+    while len(order) < size:
+        num_seeds = len(order) * 2
+        order = [seed for top in order for seed in (top, num_seeds - 1 - top)]
+    return order
 
 
 class Cup:
@@ -21,6 +45,192 @@ class Cup:
     Copa do Brasil, FA Cup, and others.
 
     This can't be used for the World Cup. Instead, see the @Championship class
+
+    Clubs are seeded in the order they are given. The whole bracket is built when the cup is
+    created: its size is the next power of two, and the best seeds get a bye to the second
+    round if the number of clubs is not a power of two. bracket[r] holds the clubs of round
+    r, and the winner of the tie between slots 2 * i and 2 * i + 1 takes slot i of the next
+    round. The champion is the single slot of the last list.
+
+    Ties are single matches at the ground of the first club of the tie, with extra time (if
+    enabled) and penalties. Every tie of a round is simulated in a single simulate_matches
+    batch, and play_cups batches the rounds of many cups together. The matches are played on
+    copies of the clubs' teams, so the clubs are left untouched however many workers are used.
     """
 
-    pass
+    def __init__(
+        self,
+        cup_id: UUID,
+        name: str,
+        clubs: Sequence[Club],
+        extra_time: bool = True,
+        seed: Optional[int] = None,
+    ):
+        if len(clubs) < 2:
+            raise ValueError("A cup needs at least two clubs!")
+
+        self.cup_id = cup_id
+        self.name = name
+        self.clubs: dict[UUID, Club] = {club.club_id: club for club in clubs}
+        self.extra_time = extra_time
+        self.rng = random.Random(seed)
+        self.bracket = self.generate_bracket([club.club_id for club in clubs])
+        self.current_round = 0
+        self.fixtures: list[list[Fixture]] = []
+        self.results: list[list[MatchResult]] = []
+
+    @staticmethod
+    def generate_bracket(club_ids: Sequence[UUID]) -> list[list[Optional[UUID]]]:
+        size = 1 << (len(club_ids) - 1).bit_length()
+        first_round = [
+            club_ids[seed] if seed < len(club_ids) else None
+            for seed in get_bracket_order(size)
+        ]
+        bracket = [first_round]
+        while len(bracket[-1]) > 1:
+            bracket.append([None] * (len(bracket[-1]) // 2))
+
+        # Byes are always against one of the best seeds, never against another bye
+        second_round = bracket[1]
+        for i in range(len(second_round)):
+            home, away = first_round[2 * i], first_round[2 * i + 1]
+            if away is None:
+                second_round[i] = home
+        return bracket
+
+    @property
+    def num_rounds(self) -> int:
+        return len(self.bracket) - 1
+
+    @property
+    def is_finished(self) -> bool:
+        return self.current_round >= self.num_rounds
+
+    @property
+    def winner(self) -> Optional[UUID]:
+        return self.bracket[-1][0]
+
+    def generate_fixture_id(self) -> UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def get_ties(self) -> list[int]:
+        """
+        Indexes of the ties of the current round that are played, i.e. without a bye.
+        """
+        slots = self.bracket[self.current_round]
+        return [
+            i
+            for i in range(len(slots) // 2)
+            if slots[2 * i] is not None and slots[2 * i + 1] is not None
+        ]
+
+    def get_round_fixtures(self) -> list[Fixture]:
+        """
+        Fixtures of the ties of the current round. They are created the first time they are
+        requested, once the clubs of the round are known.
+        """
+        if self.is_finished:
+            raise ValueError("All rounds of the cup were already played!")
+
+        if len(self.fixtures) == self.current_round:
+            slots = self.bracket[self.current_round]
+            self.fixtures.append(
+                [
+                    Fixture(
+                        self.generate_fixture_id(),
+                        self.cup_id,
+                        slots[2 * i],
+                        slots[2 * i + 1],
+                        self.clubs[slots[2 * i]].stadium,
+                    )
+                    for i in self.get_ties()
+                ]
+            )
+        return self.fixtures[self.current_round]
+
+    def get_match_specs(self, fixtures: Sequence[Fixture]) -> list[MatchSpec]:
+        return [
+            (
+                fixture,
+                get_team_simulation(self.clubs[fixture.home_team]),
+                get_team_simulation(self.clubs[fixture.away_team]),
+            )
+            for fixture in fixtures
+        ]
+
+    def add_round_results(self, results: Sequence[MatchResult]) -> None:
+        """
+        Moves the winner of each tie of the current round to the next round. Results must be
+        in the same order as get_round_fixtures.
+        """
+        ties = self.get_ties()
+        if len(results) != len(ties):
+            raise ValueError("There must be one result for each tie of the round!")
+
+        next_round = self.bracket[self.current_round + 1]
+        for i, result in zip(ties, results):
+            next_round[i] = result.winner
+        self.results.append(list(results))
+        self.current_round += 1
+
+    def play_round(
+        self,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> list[MatchResult]:
+        """
+        Simulates every tie of the current round in a single batch.
+        """
+        results = simulate_matches(
+            self.get_match_specs(self.get_round_fixtures()),
+            possible_extra_time=self.extra_time,
+            possible_penalties=True,
+            max_workers=max_workers,
+            executor=executor,
+        )
+        self.add_round_results(results)
+        return results
+
+    def play(self, max_workers: Optional[int] = None) -> UUID:
+        """
+        Simulates every remaining round and returns the winner.
+        """
+        play_cups([self], max_workers)
+        return self.winner
+
+
+def play_cups(cups: Sequence[Cup], max_workers: Optional[int] = None) -> None:
+    """
+    Plays many cups at the same time. The ties of the current round of every cup are
+    simulated in a single batch, so the process pool is kept busy even in the last rounds
+    of each cup. Cups with and without extra time are batched separately.
+    """
+
+    def play_rounds(executor: Optional[Executor]) -> None:
+        while cups_left := [cup for cup in cups if not cup.is_finished]:
+            for extra_time in (True, False):
+                batch_cups = [cup for cup in cups_left if cup.extra_time == extra_time]
+                fixtures = [cup.get_round_fixtures() for cup in batch_cups]
+                results = simulate_matches(
+                    [
+                        spec
+                        for cup, cup_fixtures in zip(batch_cups, fixtures)
+                        for spec in cup.get_match_specs(cup_fixtures)
+                    ],
+                    possible_extra_time=extra_time,
+                    possible_penalties=True,
+                    max_workers=max_workers,
+                    executor=executor,
+                )
+                start = 0
+                for cup, cup_fixtures in zip(batch_cups, fixtures):
+                    end = start + len(cup_fixtures)
+                    cup.add_round_results(results[start:end])
+                    start = end
+
+    if max_workers == 1:
+        play_rounds(None)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        play_rounds(executor)
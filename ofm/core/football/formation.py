@@ -44,10 +44,17 @@ class Formation:
     bench: list[PlayerSimulation] = field(default_factory=list)
     _players: list[PlayerSimulation] = field(default_factory=list)
     _all_players: list[PlayerSimulation] = field(default_factory=list)
+    revision: int = field(default=0, repr=False, compare=False)
 
     def __post_init__(self):
+        """
+        The revision changes every time the line-up changes or a player can no longer play,
+        so anything derived from the line-up knows when to be recalculated.
+        """
         if not self.validate_formation():
             raise FormationError("Invalid formation string!")
+        for player in self.all_players:
+            player.formation = self
 
     @property
     def players(self):
@@ -111,12 +118,17 @@ class Formation:
             for player in players
         ]
         self.bench.sort(key=lambda x: x.current_position.value)
+        for player in self.bench:
+            player.formation = self
+        self.revision += 1
 
     def add_player(self, position: int, player: Union[PlayerTeam, PlayerSimulation]):
         if isinstance(player, PlayerTeam):
             player_sim = PlayerSimulation(player, Positions.GK)
         else:
             player_sim = player
+        player_sim.formation = self
+        self.revision += 1
         df, mf, fw = self.get_num_players()
         if position == 0:
             self.gk = player_sim
@@ -179,6 +191,7 @@ class Formation:
             raise FormationError("Invalid position!")
 
         player_in.current_position = current_position
+        self.revision += 1
 
     def validate_formation(self) -> bool:
         return self.formation_string in FORMATION_STRINGS
@@ -13,6 +13,87 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from ..simulation.batch import MatchResult, MatchSpec, simulate_matches
+from ..simulation.fixture import Fixture
+from .club import Club
+from .team_simulation import get_team_simulation
+
+
+def get_round_robin_rounds(
+    club_ids: Sequence[UUID],
+) -> list[list[tuple[UUID, UUID]]]:
+    """
+    Pairs the clubs for a single round robin with the circle method. Returns the (home, away)
+    pairs of each round, every club plays every other club once.
+
+    One club stays fixed while the others rotate around it, and the home side of each pair
+    alternates, so no club plays more than two home or away games in a row within the round
+    robin. With an odd number of clubs, one club has a bye in each round.
+    """
+    clubs: list[Optional[UUID]] = list(club_ids)
+    if len(clubs) % 2:
+        clubs.append(None)
+    rotating = len(clubs) - 1
+    fixed = clubs[rotating]
+
+    rounds = []
+    for round_number in range(rotating):
+        pairs = [
+            (fixed, clubs[round_number])
+            if round_number % 2 == 0
+            else (clubs[round_number], fixed)
+        ]
+        for i in range(1, len(clubs) // 2):
+            first = clubs[(round_number + i) % rotating]
+            second = clubs[(round_number - i) % rotating]
+            pairs.append((first, second) if i % 2 == 0 else (second, first))
+        rounds.append(
+            [
+                (home, away)
+                for home, away in pairs
+                if home is not None and away is not None
+            ]
+        )
+    return rounds
+
+
+@dataclass(slots=True)
+class LeagueTableEntry:
+    club_id: UUID
+    played: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    points: int = 0
+
+    @property
+    def goal_difference(self) -> int:
+        return self.goals_for - self.goals_against
+
+    def add_result(
+        self, goals_for: int, goals_against: int, points_for_win: int = 3
+    ) -> None:
+        self.played += 1
+        self.goals_for += goals_for
+        self.goals_against += goals_against
+        if goals_for > goals_against:
+            self.wins += 1
+            self.points += points_for_win
+        elif goals_for == goals_against:
+            self.draws += 1
+            self.points += 1
+        else:
+            self.losses += 1
 
 
 class League:
@@ -20,6 +101,138 @@ class League:
     A League is the standard competition in many countries. Generally we have many divisions of leagues,
     and this can be used for standard national competitions, such as the Liga BBVA, Ligue 1, Premier League,
     Campeonato Brasileiro, and others.
+
+    Every club plays every other club twice, once at home and once away. The schedule is
+    generated with the circle method, and the second half of the season has the same
+    matchdays as the first one with home and away swapped. The second half starts from the
+    first half's second matchday and plays its first matchday last, so no club plays more
+    than two home or away games in a row where the halves meet either.
+
+    The matches of a matchday are simulated concurrently with simulate_matches, and the table
+    is updated with each result. Fixture ids are drawn from the league's seed, and a match is
+    seeded with its fixture id, so the same seed always plays the same season.
+
+    Matches are simulated on copies of the clubs' teams (see simulate_matches), so playing
+    the league leaves the clubs untouched, whether the matches are played in the current
+    process (max_workers=1) or in a process pool.
     """
 
-    pass
+    def __init__(
+        self,
+        league_id: UUID,
+        name: str,
+        clubs: Sequence[Club],
+        points_for_win: int = 3,
+        seed: Optional[int] = None,
+    ):
+        if len(clubs) < 2:
+            raise ValueError("A league needs at least two clubs!")
+
+        self.league_id = league_id
+        self.name = name
+        self.clubs: dict[UUID, Club] = {club.club_id: club for club in clubs}
+        self.points_for_win = points_for_win
+        self.rng = random.Random(seed)
+        self.matchdays: list[list[Fixture]] = self.generate_schedule()
+        self.current_matchday = 0
+        self.table: dict[UUID, LeagueTableEntry] = {
+            club_id: LeagueTableEntry(club_id) for club_id in self.clubs
+        }
+        self.results: list[MatchResult] = []
+
+    @property
+    def is_finished(self) -> bool:
+        return self.current_matchday >= len(self.matchdays)
+
+    def generate_fixture_id(self) -> UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def generate_schedule(self) -> list[list[Fixture]]:
+        first_half = get_round_robin_rounds(list(self.clubs))
+        # Starting the mirrored half from the first half's opening matchday would give
+        # every club a third home or away game in a row with an even number of clubs
+        second_half = [
+            [(away, home) for home, away in pairs]
+            for pairs in first_half[1:] + first_half[:1]
+        ]
+        return [
+            [
+                Fixture(
+                    self.generate_fixture_id(),
+                    self.league_id,
+                    home,
+                    away,
+                    self.clubs[home].stadium,
+                )
+                for home, away in pairs
+            ]
+            for pairs in first_half + second_half
+        ]
+
+    def get_match_specs(self, fixtures: Sequence[Fixture]) -> list[MatchSpec]:
+        return [
+            (
+                fixture,
+                get_team_simulation(self.clubs[fixture.home_team]),
+                get_team_simulation(self.clubs[fixture.away_team]),
+            )
+            for fixture in fixtures
+        ]
+
+    def add_result(self, result: MatchResult) -> None:
+        """
+        Updates the table entries of both clubs with the result.
+        """
+        self.table[result.home_club_id].add_result(
+            result.home_score, result.away_score, self.points_for_win
+        )
+        self.table[result.away_club_id].add_result(
+            result.away_score, result.home_score, self.points_for_win
+        )
+        self.results.append(result)
+
+    def play_matchday(
+        self,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> list[MatchResult]:
+        """
+        Simulates the matches of the current matchday and updates the table.
+        """
+        if self.is_finished:
+            raise ValueError("All matchdays of the league were already played!")
+
+        results = simulate_matches(
+            self.get_match_specs(self.matchdays[self.current_matchday]),
+            max_workers=max_workers,
+            executor=executor,
+        )
+        for result in results:
+            self.add_result(result)
+        self.current_matchday += 1
+        return results
+
+    def play_season(self, max_workers: Optional[int] = None) -> list[MatchResult]:
+        """
+        Simulates every remaining matchday, reusing the same process pool for all of them.
+        """
+        results = []
+        if max_workers == 1:
+            while not self.is_finished:
+                results.extend(self.play_matchday(max_workers=1))
+            return results
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            while not self.is_finished:
+                results.extend(self.play_matchday(executor=executor))
+        return results
+
+    def get_standings(self) -> list[LeagueTableEntry]:
+        """
+        Returns the table entries sorted by points, goal difference and goals scored.
+        """
+        return sorted(
+            self.table.values(),
+            key=lambda entry: (entry.points, entry.goal_difference, entry.goals_for),
+            reverse=True,
+        )
@@ -14,9 +14,9 @@
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum, auto
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 from uuid import UUID
 
 from .injury import PlayerInjury
@@ -24,6 +24,9 @@ from .player_attributes import PlayerAttributes
 from .playercontract import PlayerContract
 from .positions import Positions
 
+if TYPE_CHECKING:
+    from .formation import Formation
+
 
 class PreferredFoot(IntEnum):
     LEFT = auto()
@@ -158,8 +161,38 @@ class Player:
         }
 
 
-@dataclass
+# Player statistics that are also summed up in the team's statistics
+TEAM_AGGREGATED_STATS = frozenset(
+    {
+        "fouls",
+        "goals",
+        "yellow_cards",
+        "red_cards",
+        "goals_conceded",
+        "shots",
+        "shots_on_target",
+        "passes",
+        "passes_missed",
+        "crosses",
+        "crosses_missed",
+        "dribbles",
+        "dribbles_failed",
+        "interceptions",
+        "assists",
+    }
+)
+
+
+@dataclass(slots=True)
 class PlayerStats:
+    """
+    If team_stats is set, every change to one of the TEAM_AGGREGATED_STATS is also applied to
+    the team's statistics, so they never need to be summed up again during a game.
+
+    Copies and unpickled stats restore their values directly, as the team's statistics
+    already include them.
+    """
+
     player_id: UUID
     minutes_played: float = 0.0
     passes: int = 0
@@ -184,6 +217,24 @@ class PlayerStats:
     yellow_cards: int = 0
     red_cards: int = 0
     rating: float = 0.0
+    team_stats: Optional[Any] = field(default=None, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any):
+        # team_stats is the last field, so it is not set yet while the stats are created
+        if (
+            name in TEAM_AGGREGATED_STATS
+            and (team_stats := getattr(self, "team_stats", None)) is not None
+        ):
+            difference = value - getattr(self, name)
+            setattr(team_stats, name, getattr(team_stats, name) + difference)
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
 
 @dataclass
@@ -226,6 +277,18 @@ def get_player_from_player_id(player_id: UUID, players: list[Player]) -> Player:
 
 
 class PlayerSimulation:
+    __slots__ = (
+        "player",
+        "current_position",
+        "_current_skill",
+        "statistics",
+        "initial_stamina",
+        "received_ball",
+        "subbed",
+        "formation",
+        "_able_to_play",
+    )
+
     def __init__(
         self,
         player: PlayerTeam,
@@ -238,7 +301,19 @@ class PlayerSimulation:
         self.initial_stamina = player.details.stamina
         self.received_ball: Optional[PlayerSimulation] = None
         self.subbed = False
-        self.able_to_play = True
+        self.formation: Optional["Formation"] = None
+        self._able_to_play = True
+
+    @property
+    def able_to_play(self) -> bool:
+        return self._able_to_play
+
+    @able_to_play.setter
+    def able_to_play(self, value: bool):
+        if value != self._able_to_play:
+            self._able_to_play = value
+            if self.formation is not None:
+                self.formation.revision += 1
 
     @property
     def stamina(self) -> float:
@@ -14,22 +14,55 @@
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from abc import ABC
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
+from functools import cache
+from typing import Optional
 
 from .positions import Positions
 
 
+@cache
+def _get_attribute_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
 class Attributes(ABC):
+    """
+    Base class of an attribute group.
+
+    The group's overall is cached and invalidated whenever one of its attributes changes
+    (e.g. training or aging). The PlayerAttributes that owns the group is notified as well,
+    so its overalls per position are recalculated.
+    """
+
+    _owner: Optional["PlayerAttributes"] = None
+    _overall: Optional[int] = None
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        # Nothing to invalidate while the group is being created
+        if (self._overall is not None or self._owner is not None) and name[0] != "_":
+            self.invalidate_overall()
+
     @classmethod
     def get_from_dict(cls, attributes: dict[str, int]):
         return cls(**attributes)
 
     def serialize(self) -> dict[str, int]:
-        return asdict(self)
+        return {name: getattr(self, name) for name in _get_attribute_names(type(self))}
+
+    def invalidate_overall(self) -> None:
+        self.__dict__.pop("_overall", None)
+        if self._owner is not None:
+            self._owner.invalidate_overalls()
 
     def get_overall(self) -> int:
-        attrs = asdict(self)
-        return int(sum(attrs.values()) / len(attrs))
+        overall = self._overall
+        if overall is None:
+            names = _get_attribute_names(type(self))
+            overall = int(sum(getattr(self, name) for name in names) / len(names))
+            self._overall = overall
+        return overall
 
 
 @dataclass
@@ -85,6 +118,19 @@ class PlayerAttributes:
     intelligence: IntelligenceAttributes
     gk: GkAttributes
 
+    # Overall per position, created after all the groups are set
+    _overalls = None
+
+    def __post_init__(self):
+        self._overalls = {}
+
+    def __setattr__(self, name: str, value) -> None:
+        if isinstance(value, Attributes):
+            value._owner = self
+        object.__setattr__(self, name, value)
+        if name[0] != "_" and self._overalls:
+            self.invalidate_overalls()
+
     @classmethod
     def get_from_dict(cls, attributes: dict[str, dict[str, int]]):
         offensive = OffensiveAttributes.get_from_dict(attributes["offensive"])
@@ -109,18 +155,29 @@ class PlayerAttributes:
             "gk": self.gk.serialize(),
         }
 
+    def invalidate_overalls(self) -> None:
+        self._overalls.clear()
+
     def get_overall(self, position: Positions) -> int:
+        try:
+            return self._overalls[position]
+        except KeyError:
+            pass
+
         match position:
             case Positions.GK:
-                return self.get_gk_overall()
+                overall = self.get_gk_overall()
             case Positions.DF:
-                return self.get_df_overall()
+                overall = self.get_df_overall()
             case Positions.MF:
-                return self.get_mf_overall()
+                overall = self.get_mf_overall()
             case Positions.FW:
-                return self.get_fw_overall()
+                overall = self.get_fw_overall()
+            case _:
+                overall = 0
 
-        return 0
+        self._overalls[position] = overall
+        return overall
 
     def get_gk_overall(self) -> int:
         return int(
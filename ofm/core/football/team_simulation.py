@@ -14,6 +14,7 @@
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import random
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import timedelta
 from enum import Enum, auto
@@ -23,8 +24,9 @@ from uuid import UUID
 
 from .club import Club
 from .formation import Formation
-from .player import PlayerSimulation
+from .player import TEAM_AGGREGATED_STATS, PlayerSimulation
 from ..simulation import PitchPosition
+from ..simulation.sampling import get_cumulative_weights, weighted_choice
 from ..simulation.team_strategy import TeamStrategy
 
 
@@ -41,20 +43,13 @@ class GameEventType(Enum):
     SUBSTITUTION = auto()
 
 
-@dataclass
-class GameEventAdditionalTime:
-    additional_time: timedelta = timedelta(0)
-
-
-@dataclass
-class GameEventBase:
+@dataclass(slots=True, repr=False)
+class GameEvent:
     player: PlayerSimulation
     minutes: timedelta
     event_type: GameEventType
+    additional_time: timedelta = timedelta(0)
 
-
-@dataclass(repr=False)
-class GameEvent(GameEventAdditionalTime, GameEventBase):
     def __repr__(self):
         minutes = f"{int(self.minutes.total_seconds() / 60)}'"
         if self.additional_time > timedelta(0):
@@ -66,13 +61,14 @@ class GameEvent(GameEventAdditionalTime, GameEventBase):
         return f"{self.player} {minutes}"
 
 
-@dataclass
-class SubstitutionEventBase(GameEventBase):
+@dataclass(slots=True, repr=False)
+class SubstitutionEvent:
+    player: PlayerSimulation
+    minutes: timedelta
+    event_type: GameEventType
     player_subbed_in: PlayerSimulation
+    additional_time: timedelta = timedelta(0)
 
-
-@dataclass(repr=False)
-class SubstitutionEvent(GameEventAdditionalTime, SubstitutionEventBase):
     def __repr__(self):
         minutes = f"{int(self.minutes.total_seconds() / 60)}'"
         if self.additional_time > timedelta(0):
@@ -80,6 +76,35 @@ class SubstitutionEvent(GameEventAdditionalTime, SubstitutionEventBase):
         return f"{self.player} -> {self.player_subbed_in} {minutes}"
 
 
+# Probability of each line (GK, DF, MF, FW) getting involved in a play on each part of the
+# pitch. The GK only takes part in plays inside his own box.
+_DEF_BOX_WEIGHTS = (0.3, 0.5, 0.1, 0.1)
+_DEF_WEIGHTS = (None, 0.6, 0.3, 0.1)
+_MIDFIELD_WEIGHTS = (None, 0.2, 0.5, 0.3)
+_OFF_WEIGHTS = (None, 0.1, 0.3, 0.6)
+
+PLAYER_ON_PITCH_WEIGHTS: dict[PitchPosition, tuple[Optional[float], ...]] = {
+    PitchPosition.DEF_BOX: _DEF_BOX_WEIGHTS,
+    PitchPosition.DEF_LEFT: _DEF_WEIGHTS,
+    PitchPosition.DEF_RIGHT: _DEF_WEIGHTS,
+    PitchPosition.DEF_MIDFIELD_CENTER: _DEF_WEIGHTS,
+    PitchPosition.DEF_MIDFIELD_LEFT: _DEF_WEIGHTS,
+    PitchPosition.DEF_MIDFIELD_RIGHT: _DEF_WEIGHTS,
+    PitchPosition.MIDFIELD_LEFT: _MIDFIELD_WEIGHTS,
+    PitchPosition.MIDFIELD_CENTER: _MIDFIELD_WEIGHTS,
+    PitchPosition.MIDFIELD_RIGHT: _MIDFIELD_WEIGHTS,
+    PitchPosition.OFF_MIDFIELD_CENTER: _MIDFIELD_WEIGHTS,
+    PitchPosition.OFF_MIDFIELD_LEFT: _MIDFIELD_WEIGHTS,
+    PitchPosition.OFF_MIDFIELD_RIGHT: _MIDFIELD_WEIGHTS,
+    PitchPosition.OFF_LEFT: _OFF_WEIGHTS,
+    PitchPosition.OFF_RIGHT: _OFF_WEIGHTS,
+    PitchPosition.OFF_BOX: _OFF_WEIGHTS,
+}
+
+# Players that can be picked and their cumulative weights
+PlayerTable = tuple[Sequence[PlayerSimulation], Sequence[float]]
+
+
 class TeamSimulation:
     def __init__(
         self,
@@ -87,6 +112,7 @@ class TeamSimulation:
         formation: Formation,
         max_substitutions: int = 5,
         strategy: TeamStrategy = TeamStrategy.NORMAL,
+        rng: Optional[random.Random] = None,
     ):
         self.club: Club = club
         self.formation: Formation = formation
@@ -100,8 +126,23 @@ class TeamSimulation:
         self.red_card_history: list[Optional[GameEvent]] = []
         self.yellow_card_history: list[Optional[GameEvent]] = []
         self._score: int = 0
+        self.penalty_shootout_score: int = 0
         self.team_strategy: TeamStrategy = strategy
         self.stats: TeamStats = TeamStats(self.club.club_id)
+        self.link_player_stats()
+        self.rng: random.Random = rng if rng is not None else random.Random()
+        self._player_tables: Optional[
+            dict[PitchPosition, dict[Optional[int], PlayerTable]]
+        ] = None
+        self._tables_formation: Optional[Formation] = None
+        self._tables_revision: int = -1
+
+    def __getstate__(self) -> dict:
+        # Player tables are keyed by object ids, which are not kept between copies
+        state = self.__dict__.copy()
+        state["_player_tables"] = None
+        state["_tables_formation"] = None
+        return state
 
     @property
     def score(self) -> int:
@@ -149,97 +190,125 @@ class TeamSimulation:
         self.red_card_history.append(red_card)
         self.game_events.append(red_card)
 
+    def _build_line_tables(
+        self, weights: tuple[Optional[float], ...]
+    ) -> dict[Optional[int], PlayerTable]:
+        gk_weight, df_weight, mf_weight, fw_weight = weights
+        entries = []
+        if gk_weight is not None:
+            # The GK's weight does not depend on being able to play
+            entries.append((self.formation.gk, gk_weight))
+        for line, weight in (
+            (self.formation.df, df_weight),
+            (self.formation.mf, mf_weight),
+            (self.formation.fw, fw_weight),
+        ):
+            entries.extend(
+                (player, weight if player.able_to_play else 0) for player in line
+            )
+
+        tables = {}
+        for excluded in [None, *(player for player, _ in entries)]:
+            remaining = [(p, w) for p, w in entries if p is not excluded]
+            probabilities = [w for _, w in remaining if w > 0]
+            players = tuple(p for p, _ in remaining if p.able_to_play)
+            if len(probabilities) != len(players):
+                probabilities = [1] * len(players)
+            key = id(excluded) if excluded is not None else None
+            tables[key] = (players, get_cumulative_weights(probabilities))
+
+        return tables
+
+    def build_player_tables(self):
+        """
+        Precalculates, for every part of the pitch, the players that can get involved in a play
+        and their cumulative weights, with and without each player that might have the ball.
+
+        The tables are rebuilt only when the formation's revision changes
+        (substitutions, red cards or injuries).
+        """
+        line_tables = {
+            weights: self._build_line_tables(weights)
+            for weights in set(PLAYER_ON_PITCH_WEIGHTS.values())
+        }
+        self._player_tables = {
+            position: line_tables[weights]
+            for position, weights in PLAYER_ON_PITCH_WEIGHTS.items()
+        }
+        self._tables_formation = self.formation
+        self._tables_revision = self.formation.revision
+
     def get_player_on_pitch(
         self,
         position: PitchPosition,
     ) -> PlayerSimulation:
-        players = self.formation.players.copy()
-        if position == PitchPosition.DEF_BOX:
-            probabilities = [0.3]
-            df_prob = [
-                0.5 if player.able_to_play else 0 for player in self.formation.df
-            ]
-            probabilities.extend(df_prob)
-            mf_prob = [
-                0.1 if player.able_to_play else 0 for player in self.formation.mf
-            ]
-            probabilities.extend(mf_prob)
-            fw_prob = [
-                0.1 if player.able_to_play else 0 for player in self.formation.fw
-            ]
-            probabilities.extend(fw_prob)
-        elif position in [
-            PitchPosition.DEF_RIGHT,
-            PitchPosition.DEF_LEFT,
-            PitchPosition.DEF_MIDFIELD_LEFT,
-            PitchPosition.DEF_MIDFIELD_CENTER,
-            PitchPosition.DEF_MIDFIELD_RIGHT,
-        ]:
-            players.remove(self.formation.gk)
-            probabilities = [
-                0.6 if player.able_to_play else 0 for player in self.formation.df
-            ]
-            mf_prob = [
-                0.3 if player.able_to_play else 0 for player in self.formation.mf
-            ]
-            probabilities.extend(mf_prob)
-            fw_prob = [
-                0.1 if player.able_to_play else 0 for player in self.formation.fw
-            ]
-            probabilities.extend(fw_prob)
-        elif position in [
-            PitchPosition.MIDFIELD_RIGHT,
-            PitchPosition.MIDFIELD_CENTER,
-            PitchPosition.MIDFIELD_LEFT,
-            PitchPosition.OFF_MIDFIELD_RIGHT,
-            PitchPosition.OFF_MIDFIELD_LEFT,
-            PitchPosition.OFF_MIDFIELD_CENTER,
-        ]:
-            players.remove(self.formation.gk)
-            probabilities = [
-                0.2 if player.able_to_play else 0 for player in self.formation.df
-            ]
-            mf_prob = [
-                0.5 if player.able_to_play else 0 for player in self.formation.mf
-            ]
-            probabilities.extend(mf_prob)
-            fw_prob = [
-                0.3 if player.able_to_play else 0 for player in self.formation.fw
-            ]
-            probabilities.extend(fw_prob)
-        else:
-            players.remove(self.formation.gk)
-            probabilities = [
-                0.1 if player.able_to_play else 0 for player in self.formation.df
-            ]
-            mf_prob = [
-                0.3 if player.able_to_play else 0 for player in self.formation.mf
-            ]
-            probabilities.extend(mf_prob)
-            fw_prob = [
-                0.6 if player.able_to_play else 0 for player in self.formation.fw
-            ]
-            probabilities.extend(fw_prob)
-
         if (
-            self.player_in_possession is not None
-            and self.player_in_possession in players
+            self._tables_formation is not self.formation
+            or self._tables_revision != self.formation.revision
         ):
-            idx = players.index(self.player_in_possession)
-            players.pop(idx)
-            probabilities.pop(idx)
-
-        probabilities = list(filter(lambda x: x > 0, probabilities))
-        players = list(filter(lambda x: x.able_to_play, players))
-        if len(probabilities) != len(players):
-            return random.choice(players)
-
-        return random.choices(players, probabilities)[0]
+            self.build_player_tables()
+
+        tables = self._player_tables[position]
+        players, cum_weights = tables[None]
+        if self.player_in_possession is not None:
+            players, cum_weights = tables.get(
+                id(self.player_in_possession), (players, cum_weights)
+            )
+
+        return weighted_choice(self.rng, players, cum_weights)
+
+    def get_player_on_pitch_distribution(
+        self, position: PitchPosition
+    ) -> list[tuple[PlayerSimulation, float]]:
+        """
+        Returns the players that get_player_on_pitch might pick in that position, with the
+        probability of picking each of them (ignoring the player in possession).
+        """
+        if (
+            self._tables_formation is not self.formation
+            or self._tables_revision != self.formation.revision
+        ):
+            self.build_player_tables()
+
+        players, cum_weights = self._player_tables[position][None]
+        total = cum_weights[-1]
+        previous = 0
+        distribution = []
+        for player, cum_weight in zip(players, cum_weights):
+            distribution.append((player, (cum_weight - previous) / total))
+            previous = cum_weight
+        return distribution
+
+    def link_player_stats(self):
+        """
+        Links every player's statistics to the team's statistics, so the team's statistics are
+        updated as soon as a player's statistic changes.
+        """
+        players = self.formation.all_players
+        for player in players:
+            player.statistics.team_stats = self.stats
+        self.stats.update_stats(players)
 
     def update_stats(self):
+        """
+        Recalculates the team's statistics from every player. Not needed during a game,
+        since the statistics are updated incrementally.
+        """
         players = self.formation.all_players
         self.stats.update_stats(players)
 
+    def check_stats(self) -> bool:
+        """
+        Debug consistency check. Returns True if the incrementally updated statistics
+        are the same as recalculating them from every player.
+        """
+        stats = TeamStats(self.club.club_id)
+        stats.update_stats(self.formation.all_players)
+        return all(
+            getattr(stats, name) == getattr(self.stats, name)
+            for name in TEAM_AGGREGATED_STATS
+        )
+
     def sub_player(
         self,
         player_out: PlayerSimulation,
@@ -319,7 +388,17 @@ class TeamSimulation:
             player.update_stamina(duration)
 
 
-@dataclass
+def get_team_simulation(club: Club) -> TeamSimulation:
+    """
+    Picks the best players of the club for its default formation.
+    """
+    formation = Formation(club.default_formation)
+    # get_best_players removes the players from the list
+    formation.get_best_players(list(club.squad))
+    return TeamSimulation(club, formation)
+
+
+@dataclass(slots=True)
 class TeamStats:
     club_id: UUID
     shots: int = 0
@@ -40,6 +40,8 @@ class Settings:
         self.squads_file: str = os.path.join(self.db, "squads.json")
         self.players_file: str = os.path.join(self.db, "players.json")
         self.clubs_file: str = os.path.join(self.db, "clubs.json")
+        self.database_file: str = os.path.join(self.db, "ofm.sqlite3")
+        self.snapshot_file: str = os.path.join(self.db, "world.ofms")
         self.settings_file: str = settings
 
     def get_data(self) -> dict:
@@ -54,6 +56,8 @@ class Settings:
             "squads": self.squads_file,
             "players": self.players_file,
             "clubs": self.clubs_file,
+            "database": self.database_file,
+            "snapshot": self.snapshot_file,
         }
 
     def parse_settings(self, data: dict) -> None:
@@ -67,6 +71,10 @@ class Settings:
         self.squads_file = data["squads"]
         self.players_file = data["players"]
         self.clubs_file = data["clubs"]
+        # Settings files created before the SQLite database and the snapshot were added
+        # don't have them
+        self.database_file = data.get("database", os.path.join(self.db, "ofm.sqlite3"))
+        self.snapshot_file = data.get("snapshot", os.path.join(self.db, "world.ofms"))
 
     def load_settings(self) -> None:
         with open(self.settings_file, "r") as fp:
@@ -0,0 +1,202 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional
+from uuid import UUID
+
+from ..football.team_simulation import (
+    GameEvent,
+    GameEventType,
+    TeamSimulation,
+    TeamStats,
+)
+from .commentary import no_commentary
+from .event_log import EventLog
+from .fixture import Fixture
+from .simulation import LiveGame
+
+MatchSpec = tuple[Fixture, TeamSimulation, TeamSimulation]
+
+
+@dataclass
+class MatchEventRecord:
+    """
+    Compact version of a GameEvent. Only holds ids, so it is cheap to send between processes.
+    """
+
+    club_id: UUID
+    player_id: UUID
+    event_type: GameEventType
+    minutes: timedelta
+    additional_time: timedelta = timedelta(0)
+
+    @classmethod
+    def get_from_game_event(cls, club_id: UUID, game_event: GameEvent):
+        return cls(
+            club_id,
+            game_event.player.player.details.player_id,
+            game_event.event_type,
+            game_event.minutes,
+            game_event.additional_time,
+        )
+
+
+@dataclass
+class MatchResult:
+    fixture_id: UUID
+    home_club_id: UUID
+    away_club_id: UUID
+    home_score: int
+    away_score: int
+    home_stats: TeamStats
+    away_stats: TeamStats
+    events: list[MatchEventRecord] = field(default_factory=list)
+    home_penalty_shootout_score: int = 0
+    away_penalty_shootout_score: int = 0
+
+    @property
+    def is_draw(self) -> bool:
+        return self.home_score == self.away_score
+
+    @property
+    def winner(self) -> Optional[UUID]:
+        """
+        Club that won the match, or the penalty shootout if the match was a draw.
+        """
+        home_score = (self.home_score, self.home_penalty_shootout_score)
+        away_score = (self.away_score, self.away_penalty_shootout_score)
+        if home_score > away_score:
+            return self.home_club_id
+        if away_score > home_score:
+            return self.away_club_id
+        return None
+
+
+def get_match_result(live_game: LiveGame) -> MatchResult:
+    home_team = live_game.engine.home_team
+    away_team = live_game.engine.away_team
+    events = [
+        MatchEventRecord.get_from_game_event(team.club.club_id, game_event)
+        for team in (home_team, away_team)
+        for game_event in team.game_events
+    ]
+    events.sort(key=lambda e: (e.minutes, e.additional_time))
+    return MatchResult(
+        live_game.fixture.fixture_id,
+        home_team.club.club_id,
+        away_team.club.club_id,
+        home_team.score,
+        away_team.score,
+        home_team.stats,
+        away_team.stats,
+        events,
+        home_team.penalty_shootout_score,
+        away_team.penalty_shootout_score,
+    )
+
+
+def simulate_match(
+    fixture: Fixture,
+    home_team: TeamSimulation,
+    away_team: TeamSimulation,
+    possible_extra_time: bool = False,
+    possible_penalties: bool = False,
+    max_substitutions: int = 5,
+) -> MatchResult:
+    """
+    Runs a whole match without breaks or delays and returns only its result.
+
+    Events and their commentary are not kept during the match, the result only needs the
+    teams' game events.
+    """
+    live_game = LiveGame(
+        fixture,
+        home_team,
+        away_team,
+        possible_extra_time,
+        possible_penalties,
+        no_break=True,
+        max_substitutions=max_substitutions,
+        event_log=EventLog(keep_records=False),
+    )
+    with no_commentary():
+        live_game.run()
+    return get_match_result(live_game)
+
+
+def _simulate_match_spec(
+    args: tuple[MatchSpec, bool, bool, int],
+) -> MatchResult:
+    # A chunk of matches is pickled together, so matches of the same chunk share the
+    # worker's copy of a team. Each match gets its own copy, on every path.
+    (fixture, home_team, away_team), extra_time, penalties, max_subs = deepcopy(args)
+    return simulate_match(
+        fixture, home_team, away_team, extra_time, penalties, max_subs
+    )
+
+
+def simulate_matches(
+    matches: list[MatchSpec],
+    possible_extra_time: bool = False,
+    possible_penalties: bool = False,
+    max_substitutions: int = 5,
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> list[MatchResult]:
+    """
+    Simulates a batch of matches (e.g. a whole matchday) across a process pool.
+
+    Each match is simulated on a copy of its teams, so the TeamSimulation objects passed in
+    are never modified, whether the matches run in a pool or in the current process. Only the
+    compact MatchResult records are sent back, the event history of each match stays in the
+    worker. Results are returned in the same order as the matches.
+
+    If max_workers is 1 and no executor is given, the matches are simulated in the current
+    process instead.
+
+    A process pool executor can be passed to reuse the same pool for many batches, e.g. every
+    matchday of a season. It is always used when given, and it is not shut down after the batch.
+    """
+    if not matches:
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(matches))
+
+    args = [
+        (match, possible_extra_time, possible_penalties, max_substitutions)
+        for match in matches
+    ]
+
+    if max_workers == 1 and executor is None:
+        return [_simulate_match_spec(arg) for arg in args]
+
+    if chunksize is None:
+        # A few chunks per worker keeps the load balanced without paying
+        # the IPC overhead for every single match
+        chunksize = max(1, len(matches) // (max_workers * 4))
+
+    if executor is not None:
+        return list(executor.map(_simulate_match_spec, args, chunksize=chunksize))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_simulate_match_spec, args, chunksize=chunksize))
@@ -0,0 +1,133 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any
+
+
+class CommentaryTemplate(Enum):
+    PASS = "{0} passed the ball to {1}"
+    PASS_FAILED = "{0} failed to pass the ball!"
+    CROSS = "{0} crossed the ball to {1}"
+    CROSS_FAILED = "{0} failed to cross the ball!"
+    OFFSIDE = "{0} was offside!"
+    DRIBBLE = "{0} dribbles the defender!"
+    DRIBBLE_FAILED = "{0} steals the ball!"
+    SHOT = "{0} shoots!"
+    SHOT_BLOCKED = "{0} blocked the shot!"
+    SHOT_HIT_POST = "{0} hits the post!"
+    SHOT_SAVED = "{0} saves the shot!"
+    SHOT_SAVED_BALL = "{0} saved the ball!"
+    GOAL = "GOAL! {0} scores!"
+    YELLOW_CARD = "{0} received a yellow card!"
+    SECOND_YELLOW_CARD = "{0} now has 2 yellow cards! That's a send off!"
+    RED_CARD = "{0} received a red card!"
+    FREE_KICK = "{0} goes to the ball to take the free kick!"
+    CORNER_KICK = "{0} goes to the ball to take the corner kick!"
+    GOAL_KICK = "Goal Kick {0}"
+    PENALTY_KICK = "Penalty Kick!"
+    PENALTY_KICK_TAKER = "{0} goes to the ball"
+
+
+# Each thread starts with its own context, so disabling the commentary for a batch
+# simulation doesn't affect a game that is being watched in another thread.
+_commentary_enabled: ContextVar[bool] = ContextVar("commentary_enabled", default=True)
+
+
+class Commentary:
+    """
+    Commentary of a single event, kept as templates and the objects (usually players) that fill
+    them in. The text is only rendered when someone reads it, so simulating a game doesn't pay
+    for formatting commentary that is never shown.
+
+    While the commentary is disabled in the current thread (see no_commentary), nothing is
+    stored at all.
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self):
+        # Most events only have one or two lines, a tuple is smaller than a list for those
+        self.entries: tuple[tuple[CommentaryTemplate, tuple[Any, ...]], ...] = ()
+
+    def add(self, template: CommentaryTemplate, *args: Any):
+        if _commentary_enabled.get():
+            self.entries += ((template, args),)
+
+    def extend(self, commentary: "Commentary"):
+        self.entries += commentary.entries
+
+    def render(self) -> list[str]:
+        return [template.value.format(*args) for template, args in self.entries]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.render())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Commentary):
+            return NotImplemented
+        return self.entries == other.entries
+
+    def __repr__(self) -> str:
+        return f"Commentary({self.render()!r})"
+
+
+class _NoCommentary(Commentary):
+    __slots__ = ()
+
+    def add(self, template: CommentaryTemplate, *args: Any):
+        pass
+
+    def extend(self, commentary: Commentary):
+        pass
+
+
+_NO_COMMENTARY = _NoCommentary()
+
+
+def get_commentary() -> Commentary:
+    """
+    Returns the commentary for a new event. While the commentary is disabled, every event
+    shares the same empty commentary.
+    """
+    if _commentary_enabled.get():
+        return Commentary()
+    return _NO_COMMENTARY
+
+
+def set_commentary_enabled(enabled: bool):
+    """
+    Enables or disables the commentary in the current thread.
+    """
+    _commentary_enabled.set(enabled)
+
+
+@contextmanager
+def no_commentary():
+    """
+    Disables the commentary of every event created in the current thread while in the context,
+    e.g. for batch simulations.
+    """
+    token = _commentary_enabled.set(False)
+    try:
+        yield
+    finally:
+        _commentary_enabled.reset(token)
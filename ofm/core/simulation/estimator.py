@@ -0,0 +1,570 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+from array import array
+from bisect import bisect
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..football.player import PlayerSimulation
+from ..football.team_simulation import TeamSimulation
+from . import OFF_POSITIONS, PITCH_EQUIVALENTS, PitchPosition
+from .events.cross_event import GOAL_KICK_END_POSITIONS
+from .team_strategy import (
+    team_corner_kick_strategy,
+    team_cross_strategy,
+    team_general_strategy_in_position,
+    team_pass_strategy,
+)
+
+# What the team in possession is about to do. Together with the team in possession and the
+# position of the ball, it is the whole state of a replication.
+KICK_OFF = 0
+OPEN_PLAY = 1
+FREE_KICK = 2
+PENALTY_KICK = 3
+CORNER_KICK = 4
+GOAL_KICK = 5
+PHASES = 6
+
+HOME = 0
+AWAY = 1
+
+HALF_TIME = 45 * 60
+FULL_TIME = 90 * 60
+
+PlayerDistribution = list[tuple[PlayerSimulation, float]]
+# (next state, team that scored or None, resets the additional time)
+Transition = tuple[int, Optional[int], bool]
+
+
+def get_state(side: int, phase: int, position: PitchPosition) -> int:
+    return (side * PHASES + phase) * len(PitchPosition) + position.value
+
+
+def _normalize(probabilities: list[float]) -> list[float]:
+    total = sum(probabilities)
+    return [probability / total for probability in probabilities]
+
+
+def _pass_miss(player: PlayerSimulation, distance: int, free_kick: bool) -> float:
+    # Same as PassEvent.get_pass_primary_outcome
+    attributes = player.attributes
+    if free_kick:
+        return (50 + distance) / (
+            100
+            + attributes.intelligence.passing
+            + attributes.intelligence.vision
+            + attributes.offensive.free_kick
+        )
+    return (25 + distance) / (
+        100 + attributes.intelligence.passing + attributes.intelligence.vision
+    )
+
+
+def _cross_miss(player: PlayerSimulation, distance: int, free_kick: bool) -> float:
+    # Same as CrossEvent.get_cross_primary_outcome
+    attributes = player.attributes
+    if free_kick:
+        return (50 + distance) / (
+            100
+            + attributes.intelligence.crossing
+            + attributes.intelligence.vision
+            + attributes.offensive.free_kick
+        )
+    return (25 + distance) / (
+        100 + attributes.intelligence.crossing + attributes.intelligence.vision
+    )
+
+
+def _offside(player: PlayerSimulation) -> float:
+    attributes = player.attributes
+    return 5 / (
+        200 + attributes.offensive.positioning + attributes.intelligence.team_work
+    )
+
+
+def _dribble_success(
+    player: PlayerSimulation, defender: PlayerSimulation, distance: int
+) -> float:
+    # Same as DribbleEvent.get_dribble_primary_outcome
+    intelligence = player.attributes.intelligence
+    if intelligence.skills >= 80:
+        success = (
+            intelligence.ball_control + intelligence.dribbling + intelligence.skills * 3
+        ) / 5
+    else:
+        success = (
+            intelligence.ball_control + intelligence.dribbling + intelligence.skills
+        ) / 3
+    success = max(success - distance, 0)
+    fail = (
+        defender.attributes.defensive.positioning
+        + defender.attributes.defensive.tackling
+        + defender.attributes.physical.strength
+    ) / 3
+    return success / (success + fail)
+
+
+def _shot_on_goal(player: PlayerSimulation, phase: int) -> float:
+    # Same as ShotEvent.calculate_event
+    offensive = player.attributes.offensive
+    if phase == FREE_KICK:
+        return (
+            offensive.shot_accuracy + offensive.shot_power + offensive.free_kick * 2
+        ) / 4
+    if phase == PENALTY_KICK:
+        return (
+            offensive.penalty * 2 + offensive.shot_power + offensive.shot_accuracy
+        ) / 4
+    return (offensive.shot_accuracy + offensive.shot_power) / 2
+
+
+def _gk_skills(gk: PlayerSimulation, phase: int) -> float:
+    attributes = gk.attributes.gk
+    if phase == PENALTY_KICK:
+        return (
+            attributes.penalty * 2 + attributes.jumping + attributes.positioning
+        ) / 4
+    return attributes.get_general_overall()
+
+
+class _TransitionCompiler:
+    """
+    Turns the events of a team in possession into a Markov chain over
+    (team in possession, phase, ball position).
+
+    Every probability comes from the same formulas the events use, averaged over the
+    players that get_player_on_pitch could pick. Cards, injuries, substitutions and
+    stamina are not taken into account.
+    """
+
+    def __init__(self, attacking: TeamSimulation, defending: TeamSimulation, side: int):
+        self.side = side
+        self.other_side = AWAY if side == HOME else HOME
+        self.strategy = attacking.team_strategy
+        self.def_strategy = defending.team_strategy
+        self.pass_matrix = team_pass_strategy(self.strategy)
+        self.cross_matrix = team_cross_strategy(self.strategy)
+        self.attackers = {
+            position: attacking.get_player_on_pitch_distribution(position)
+            for position in PitchPosition
+        }
+        self.defenders = {
+            position: defending.get_player_on_pitch_distribution(position)
+            for position in PitchPosition
+        }
+        self.gk = defending.formation.gk
+        self.own_gk = attacking.formation.gk
+        self.free_kick_taker = attacking.get_best_free_kick_taker()
+        self.penalty_taker = attacking.get_best_penalty_taker()
+        self.corner_pass_taker = attacking.get_best_corner_kick_taker(True)
+        self.corner_cross_taker = attacking.get_best_corner_kick_taker(False)
+
+    def keep(
+        self, transitions: dict, probability: float, phase: int, position: PitchPosition
+    ):
+        state = get_state(self.side, phase, position)
+        transitions[(state, None, False)] += probability
+
+    def lose(
+        self,
+        transitions: dict,
+        probability: float,
+        phase: int,
+        position: PitchPosition,
+        reset: bool = True,
+    ):
+        state = get_state(self.other_side, phase, PITCH_EQUIVALENTS[position])
+        transitions[(state, None, reset)] += probability
+
+    def add_pass(
+        self,
+        transitions: dict,
+        probability: float,
+        start: PitchPosition,
+        end: PitchPosition,
+        attackers: PlayerDistribution,
+        cross: bool = False,
+        free_kick: bool = False,
+        corner_kick: bool = False,
+    ):
+        distance = abs(end.value - start.value)
+        offside_possible = (
+            end in OFF_POSITIONS and start.value < end.value and not corner_kick
+        )
+        miss = _cross_miss if cross else _pass_miss
+        success = 0.0
+        for player, weight in attackers:
+            player_success = 1 - miss(player, distance, free_kick)
+            if offside_possible:
+                player_success *= 1 - _offside(player)
+            success += weight * player_success
+
+        self.keep(transitions, probability * success, OPEN_PLAY, end)
+        self.lose(transitions, probability * (1 - success), OPEN_PLAY, end)
+
+    def add_passes(
+        self,
+        transitions: dict,
+        probability: float,
+        start: PitchPosition,
+        attackers: PlayerDistribution,
+        cross: bool = False,
+        free_kick: bool = False,
+    ):
+        matrix = self.cross_matrix if cross else self.pass_matrix
+        for end, end_probability in zip(PitchPosition, _normalize(matrix[start])):
+            if end_probability > 0:
+                self.add_pass(
+                    transitions,
+                    probability * end_probability,
+                    start,
+                    end,
+                    attackers,
+                    cross,
+                    free_kick,
+                )
+
+    def add_dribbles(self, transitions: dict, probability: float, start: PitchPosition):
+        defenders = self.defenders[start]
+        for end, end_probability in zip(
+            PitchPosition, _normalize(self.pass_matrix[start])
+        ):
+            if end_probability == 0:
+                continue
+            distance = abs(end.value - start.value)
+            success = sum(
+                weight * def_weight * _dribble_success(player, defender, distance)
+                for player, weight in self.attackers[start]
+                for defender, def_weight in defenders
+            )
+            branch = probability * end_probability
+            self.keep(transitions, branch * success, OPEN_PLAY, end)
+            # Losing the ball in a dribble doesn't go through change_possession
+            self.lose(transitions, branch * (1 - success), OPEN_PLAY, end, reset=False)
+
+    def add_shots(
+        self,
+        transitions: dict,
+        probability: float,
+        position: PitchPosition,
+        attackers: PlayerDistribution,
+        phase: int,
+    ):
+        if phase == PENALTY_KICK:
+            defenders = [(self.gk, 1.0)]
+        else:
+            defenders = self.defenders[position]
+        gk_skills = _gk_skills(self.gk, phase)
+
+        for player, weight in attackers:
+            shot_on_goal = _shot_on_goal(player, phase)
+            miss = on_goal = blocked = 0.0
+            for defender, def_weight in defenders:
+                block = 0.0
+                if defender is not self.gk:
+                    block = (
+                        defender.attributes.defensive.positioning
+                        + defender.attributes.defensive.interception
+                    ) / 2
+                total = 100 + block
+                miss += def_weight * (100 - shot_on_goal) / total
+                on_goal += def_weight * shot_on_goal / total
+                blocked += def_weight * block / total
+
+            branch = probability * weight
+            self.lose(transitions, branch * miss, GOAL_KICK, position)
+            self.lose(transitions, branch * blocked / 2, OPEN_PLAY, position)
+            self.keep(transitions, branch * blocked / 2, OPEN_PLAY, position)
+
+            hit_post, saved, goal = _normalize(
+                [110 - shot_on_goal, gk_skills, 120 - gk_skills]
+            )
+            on_goal *= branch
+            box = PitchPosition.OFF_BOX
+            self.keep(transitions, on_goal * hit_post / 3, OPEN_PLAY, box)
+            self.lose(transitions, on_goal * hit_post / 3, OPEN_PLAY, box)
+            self.lose(transitions, on_goal * hit_post / 3, GOAL_KICK, box)
+            self.keep(
+                transitions, on_goal * saved / 3, CORNER_KICK, PitchPosition.OFF_RIGHT
+            )
+            self.keep(
+                transitions, on_goal * saved / 3, CORNER_KICK, PitchPosition.OFF_LEFT
+            )
+            self.lose(transitions, on_goal * saved / 3, OPEN_PLAY, box)
+            kick_off = get_state(
+                self.other_side, KICK_OFF, PitchPosition.MIDFIELD_CENTER
+            )
+            transitions[(kick_off, self.side, True)] += on_goal * goal
+
+    def add_fouls(self, transitions: dict, probability: float, position: PitchPosition):
+        # Offensive fouls also give a free kick to the team in possession
+        if position == PitchPosition.OFF_BOX:
+            self.keep(transitions, probability / 2, FREE_KICK, position)
+            self.keep(transitions, probability / 2, PENALTY_KICK, position)
+        else:
+            self.keep(transitions, probability, FREE_KICK, position)
+
+    def compile_state(self, phase: int, position: PitchPosition) -> dict:
+        transitions = defaultdict(float)
+
+        if phase == KICK_OFF:
+            attackers = self.attackers[PitchPosition.MIDFIELD_CENTER]
+            self.add_passes(transitions, 1.0, position, attackers)
+        elif phase == OPEN_PLAY:
+            event_probabilities = _normalize(
+                team_general_strategy_in_position(
+                    self.strategy, self.def_strategy, position
+                )
+            )
+            (
+                pass_prob,
+                cross_prob,
+                dribble_prob,
+                foul_prob,
+                shot_prob,
+            ) = event_probabilities
+            attackers = self.attackers[position]
+            self.add_passes(transitions, pass_prob, position, attackers)
+            self.add_passes(transitions, cross_prob, position, attackers, cross=True)
+            self.add_dribbles(transitions, dribble_prob, position)
+            self.add_fouls(transitions, foul_prob, position)
+            self.add_shots(transitions, shot_prob, position, attackers, OPEN_PLAY)
+        elif phase == FREE_KICK:
+            if position in OFF_POSITIONS:
+                attackers = [(self.free_kick_taker, 1.0)]
+                kick_probability = 1 / 3
+                self.add_shots(
+                    transitions, kick_probability, position, attackers, FREE_KICK
+                )
+            else:
+                attackers = self.attackers[position]
+                kick_probability = 1 / 2
+            self.add_passes(
+                transitions, kick_probability, position, attackers, free_kick=True
+            )
+            self.add_passes(
+                transitions,
+                kick_probability,
+                position,
+                attackers,
+                cross=True,
+                free_kick=True,
+            )
+        elif phase == PENALTY_KICK:
+            attackers = [(self.penalty_taker, 1.0)]
+            self.add_shots(transitions, 1.0, position, attackers, PENALTY_KICK)
+        elif phase == CORNER_KICK:
+            pass_prob, cross_prob = _normalize(team_corner_kick_strategy(self.strategy))
+            self.add_pass(
+                transitions,
+                pass_prob,
+                position,
+                position,
+                [(self.corner_pass_taker, 1.0)],
+                corner_kick=True,
+            )
+            self.add_pass(
+                transitions,
+                cross_prob,
+                position,
+                PitchPosition.OFF_BOX,
+                [(self.corner_cross_taker, 1.0)],
+                cross=True,
+                corner_kick=True,
+            )
+        elif phase == GOAL_KICK:
+            attackers = [(self.own_gk, 1.0)]
+            self.add_passes(transitions, 1 / 2, position, attackers)
+            end_probability = 1 / (2 * len(GOAL_KICK_END_POSITIONS))
+            for end in GOAL_KICK_END_POSITIONS:
+                self.add_pass(
+                    transitions, end_probability, position, end, attackers, cross=True
+                )
+
+        return transitions
+
+
+@dataclass
+class MatchOutcomeEstimate:
+    """
+    Outcome histograms of all the replications of a fixture.
+    """
+
+    replications: int
+    home_wins: int = 0
+    draws: int = 0
+    away_wins: int = 0
+    home_goals: Counter = field(default_factory=Counter)
+    away_goals: Counter = field(default_factory=Counter)
+    scores: Counter = field(default_factory=Counter)
+
+    @property
+    def home_win_probability(self) -> float:
+        return self.home_wins / self.replications
+
+    @property
+    def draw_probability(self) -> float:
+        return self.draws / self.replications
+
+    @property
+    def away_win_probability(self) -> float:
+        return self.away_wins / self.replications
+
+    @property
+    def expected_home_goals(self) -> float:
+        return (
+            sum(goals * n for goals, n in self.home_goals.items()) / self.replications
+        )
+
+    @property
+    def expected_away_goals(self) -> float:
+        return (
+            sum(goals * n for goals, n in self.away_goals.items()) / self.replications
+        )
+
+
+class MatchOutcomeEstimator:
+    def __init__(
+        self,
+        home_team: TeamSimulation,
+        away_team: TeamSimulation,
+        seed: Optional[int] = None,
+    ):
+        """
+        Estimates the outcome of a match (90 minutes, no extra time) without running the
+        whole simulation engine.
+
+        The events of both teams are compiled into a Markov chain over the team in possession,
+        what it is about to do (kick off, open play, free kick, ...) and the position of the
+        ball. Each replication then only needs a single draw per event, and all the
+        replications advance in lockstep, one event at a time.
+
+        The project has no NumPy, so the lockstep is not vectorized: the state of every
+        replication is kept in compact arrays, but each event of each replication is still
+        a step of a Python loop. The speedup comes from the compiled chain, not from SIMD.
+
+        The game clock, including the additional time, works just like in LiveGame.
+        """
+        self.rng = random.Random(seed)
+        self.home_team = home_team
+        self.away_team = away_team
+        self.cum_weights: list[list[float]] = []
+        self.transitions: list[list[Transition]] = []
+        self.compile()
+
+    def compile(self):
+        states = len(PitchPosition) * PHASES * 2
+        self.cum_weights = [[] for _ in range(states)]
+        self.transitions = [[] for _ in range(states)]
+        compilers = (
+            _TransitionCompiler(self.home_team, self.away_team, HOME),
+            _TransitionCompiler(self.away_team, self.home_team, AWAY),
+        )
+        for side, compiler in enumerate(compilers):
+            for phase in range(PHASES):
+                for position in PitchPosition:
+                    state = get_state(side, phase, position)
+                    transitions = compiler.compile_state(phase, position)
+                    items = [(t, p) for t, p in transitions.items() if p > 0]
+                    total = sum(p for _, p in items)
+                    cum_weight = 0.0
+                    for transition, probability in items:
+                        cum_weight += probability / total
+                        self.cum_weights[state].append(cum_weight)
+                        self.transitions[state].append(transition)
+                    # Avoids float rounding errors, random() is always below 1.0
+                    self.cum_weights[state][-1] = 1.0
+
+    def estimate(self, replications: int = 10000) -> MatchOutcomeEstimate:
+        rng_random = self.rng.random
+        cum_weights = self.cum_weights
+        transitions = self.transitions
+
+        # One slot per replication
+        starting = array("b", (int(rng_random() * 2) for _ in range(replications)))
+        states = array(
+            "H",
+            (
+                get_state(side, KICK_OFF, PitchPosition.MIDFIELD_CENTER)
+                for side in starting
+            ),
+        )
+        seconds = array("l", [0]) * replications
+        second_half = array("b", [0]) * replications
+        # Added time in seconds, or -1 if the game is not in the additional time
+        added_time = array("l", [-1]) * replications
+        additional_time_elapsed = array("l", [0]) * replications
+        goals = (
+            array("H", [0]) * replications,
+            array("H", [0]) * replications,
+        )
+
+        active = list(range(replications))
+        while active:
+            still_active = []
+            for i in active:
+                state = states[i]
+                cum_weight = cum_weights[state]
+                next_state, scored, reset = transitions[state][
+                    bisect(cum_weight, rng_random())
+                ]
+                if scored is not None:
+                    goals[scored][i] += 1
+                if reset:
+                    # Changing possession resets the additional time, see SimulationEvent
+                    added_time[i] = -1
+                    additional_time_elapsed[i] = 0
+
+                elapsed = seconds[i] + 1 + int(rng_random() * 8)
+                end_of_half = FULL_TIME if second_half[i] else HALF_TIME
+                if elapsed >= end_of_half:
+                    additional_time_elapsed[i] += elapsed - end_of_half
+                    elapsed = end_of_half
+                    if added_time[i] < 0:
+                        added_time[i] = int(rng_random() * 6) * 60
+                    elif additional_time_elapsed[i] >= added_time[i]:
+                        if second_half[i]:
+                            continue
+                        second_half[i] = 1
+                        added_time[i] = -1
+                        additional_time_elapsed[i] = 0
+                        # The team that didn't start the game kicks off from where the ball is
+                        position = next_state % len(PitchPosition)
+                        side = 1 - starting[i]
+                        next_state = (side * PHASES + KICK_OFF) * len(
+                            PitchPosition
+                        ) + position
+
+                seconds[i] = elapsed
+                states[i] = next_state
+                still_active.append(i)
+            active = still_active
+
+        estimate = MatchOutcomeEstimate(replications)
+        for home_goals, away_goals in zip(*goals):
+            if home_goals > away_goals:
+                estimate.home_wins += 1
+            elif home_goals < away_goals:
+                estimate.away_wins += 1
+            else:
+                estimate.draws += 1
+            estimate.home_goals[home_goals] += 1
+            estimate.away_goals[away_goals] += 1
+            estimate.scores[(home_goals, away_goals)] += 1
+        return estimate
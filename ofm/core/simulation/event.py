@@ -20,6 +20,7 @@ from enum import Enum, auto
 from typing import Optional
 
 from . import PITCH_EQUIVALENTS, PitchPosition
+from .commentary import Commentary, get_commentary
 from .event_type import EventType
 from .game_state import GameState
 from ..football.player import PlayerSimulation
@@ -66,7 +67,7 @@ class CommentaryImportance(Enum):
     HIGH = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationEvent:
     event_type: EventType
     state: GameState
@@ -74,11 +75,14 @@ class SimulationEvent:
     outcome: Optional[EventOutcome] = None
     attacking_player: Optional[PlayerSimulation] = None
     defending_player: Optional[PlayerSimulation] = None
-    commentary: list[str] = field(default_factory=list)
-    duration: float = 0.0
+    commentary: Commentary = field(default_factory=get_commentary)
+    duration: int = 0
+    rng: Optional[random.Random] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        self.duration = float(random.randint(1, 8))
+        if self.rng is None:
+            self.rng = random.Random()
+        self.duration = self.rng.randint(1, 8)
 
     @abstractmethod
     def calculate_event(
@@ -100,4 +104,8 @@ class SimulationEvent:
         defending_team.in_possession = True
         defending_team.player_in_possession = defending_player
         position = PITCH_EQUIVALENTS[position]
-        return GameState(self.state.minutes, self.state.status, position)
+        return self.state.evolve(
+            position=position,
+            in_additional_time=False,
+            additional_seconds=0,
+        )
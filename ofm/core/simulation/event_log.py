@@ -0,0 +1,159 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from array import array
+from collections.abc import Callable
+from typing import NamedTuple, Optional
+
+from ..football.player import PlayerSimulation
+from ..football.team_simulation import TeamSimulation
+from . import PitchPosition
+from .event import EventOutcome, SimulationEvent
+from .event_type import EventType
+
+EVENT_TYPES = tuple(EventType)
+EVENT_OUTCOMES = tuple(EventOutcome)
+PITCH_POSITIONS = tuple(PitchPosition)
+
+# Fields of a record, in the order they are stored in the log
+RECORD_FIELDS = (
+    "event_type",
+    "outcome",
+    "seconds",
+    "additional_seconds",
+    "position",
+    "team",
+    "attacking_player",
+    "defending_player",
+)
+RECORD_SIZE = len(RECORD_FIELDS)
+
+# Stored instead of an outcome or a player index that is None
+NO_VALUE = -1
+
+HOME_TEAM = 0
+AWAY_TEAM = 1
+
+
+class EventRecord(NamedTuple):
+    """
+    A single event of the log. Players are indices in EventLog.players, so records can be
+    sent between processes without the players.
+    """
+
+    event_type: EventType
+    outcome: Optional[EventOutcome]
+    seconds: int
+    additional_seconds: int
+    position: PitchPosition
+    team: int
+    attacking_player: Optional[int]
+    defending_player: Optional[int]
+
+
+EventSink = Callable[[EventRecord], None]
+
+
+class EventLog:
+    def __init__(self, sink: Optional[EventSink] = None, keep_records: bool = True):
+        """
+        Compact log of the events of a match, to be used instead of keeping every
+        SimulationEvent in SimulationEngine.event_history.
+
+        Each event is stored as a fixed-width record of ints in a single array. If a sink is
+        given, it is called with every record as soon as the event is calculated. With
+        keep_records=False the records are only sent to the sink and not stored at all.
+        """
+        self.sink = sink
+        self.keep_records = keep_records
+        self.records = array("i")
+        self.players: list[PlayerSimulation] = []
+        self._player_indices: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.records) // RECORD_SIZE
+
+    def __getitem__(self, index: int) -> EventRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event log index out of range")
+        start = index * RECORD_SIZE
+        return self.decode(self.records[start : start + RECORD_SIZE])
+
+    def __iter__(self):
+        records = self.records
+        for start in range(0, len(records), RECORD_SIZE):
+            yield self.decode(records[start : start + RECORD_SIZE])
+
+    def register_teams(self, home_team: TeamSimulation, away_team: TeamSimulation):
+        for team in (home_team, away_team):
+            for player in team.formation.all_players:
+                self.get_player_index(player)
+
+    def get_player_index(self, player: Optional[PlayerSimulation]) -> int:
+        if player is None:
+            return NO_VALUE
+        index = self._player_indices.get(id(player))
+        if index is None:
+            index = len(self.players)
+            self._player_indices[id(player)] = index
+            self.players.append(player)
+        return index
+
+    def get_player(self, index: Optional[int]) -> Optional[PlayerSimulation]:
+        if index is None:
+            return None
+        return self.players[index]
+
+    @staticmethod
+    def decode(values) -> EventRecord:
+        (
+            event_type,
+            outcome,
+            seconds,
+            additional_seconds,
+            position,
+            team,
+            attacking_player,
+            defending_player,
+        ) = values
+        return EventRecord(
+            EVENT_TYPES[event_type],
+            EVENT_OUTCOMES[outcome] if outcome != NO_VALUE else None,
+            seconds,
+            additional_seconds,
+            PITCH_POSITIONS[position],
+            team,
+            attacking_player if attacking_player != NO_VALUE else None,
+            defending_player if defending_player != NO_VALUE else None,
+        )
+
+    def add_event(self, event: SimulationEvent, team: int):
+        state = event.state
+        values = (
+            event.event_type.value,
+            event.outcome.value if event.outcome is not None else NO_VALUE,
+            state.seconds,
+            state.additional_seconds,
+            state.position.value,
+            team,
+            self.get_player_index(event.attacking_player),
+            self.get_player_index(event.defending_player),
+        )
+        if self.keep_records:
+            self.records.extend(values)
+        if self.sink is not None:
+            self.sink(self.decode(values))
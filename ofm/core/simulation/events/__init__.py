@@ -14,7 +14,6 @@
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import random
-from copy import deepcopy
 from typing import Optional
 
 from .corner_kick_event import CornerKickEvent
@@ -29,24 +28,23 @@ from .shot_event import ShotEvent
 from .. import PitchPosition
 from ..event import EventOutcome, SimulationEvent
 from ..event_type import EventType, FoulType
-from ..game_state import GameState, SimulationStatus
-from ..team_strategy import team_general_strategy
+from ..game_state import GameState
+from ..match_rules import MATCH_PHASES
+from ..team_strategy import get_event_type
 from ...football.team_simulation import TeamSimulation
 
 
 class EventFactory:
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
+
     def get_event_type(
         self,
         teams: tuple[TeamSimulation, TeamSimulation],
         state: GameState,
         last_event: Optional[SimulationEvent],
     ) -> EventType:
-        if state.status in [
-            SimulationStatus.NOT_STARTED,
-            SimulationStatus.FIRST_HALF_BREAK,
-            SimulationStatus.SECOND_HALF_BREAK,
-            SimulationStatus.FIRST_HALF_EXTRA_TIME_BREAK,
-        ]:
+        if MATCH_PHASES[state.status].kick_off is not None:
             return EventType.PASS
 
         if last_event.outcome == EventOutcome.GOAL:
@@ -68,38 +66,32 @@ class EventFactory:
                 return EventType.FREE_KICK
 
         attacking_team, defensive_team = teams
-        transition_matrix = team_general_strategy(
-            attacking_team.team_strategy, defensive_team.team_strategy, state
+        return get_event_type(
+            attacking_team.team_strategy,
+            defensive_team.team_strategy,
+            state.position,
+            self.rng,
         )
 
-        events = [
-            EventType.PASS,
-            EventType.CROSS,
-            EventType.DRIBBLE,
-            EventType.FOUL,
-            EventType.SHOT,
-        ]
-        return random.choices(events, transition_matrix)[0]
-
     def get_event(self, _state: GameState, event_type: EventType) -> SimulationEvent:
-        state = deepcopy(_state)
+        state = _state.copy()
         if event_type == EventType.PASS:
-            return PassEvent(EventType.PASS, state)
+            return PassEvent(EventType.PASS, state, rng=self.rng)
         elif event_type == EventType.DRIBBLE:
-            return DribbleEvent(EventType.DRIBBLE, state)
+            return DribbleEvent(EventType.DRIBBLE, state, rng=self.rng)
         elif event_type == EventType.FOUL:
-            return FoulEvent(EventType.FOUL, state)
+            return FoulEvent(EventType.FOUL, state, rng=self.rng)
         elif event_type == EventType.SHOT:
-            return ShotEvent(EventType.SHOT, state)
+            return ShotEvent(EventType.SHOT, state, rng=self.rng)
         elif event_type == EventType.CROSS:
-            return CrossEvent(EventType.CROSS, state)
+            return CrossEvent(EventType.CROSS, state, rng=self.rng)
         elif event_type == EventType.CORNER_KICK:
-            return CornerKickEvent(EventType.CORNER_KICK, state)
+            return CornerKickEvent(EventType.CORNER_KICK, state, rng=self.rng)
         elif event_type == EventType.FREE_KICK:
-            return FreeKickEvent(EventType.FREE_KICK, state)
+            return FreeKickEvent(EventType.FREE_KICK, state, rng=self.rng)
         elif event_type == EventType.GOAL_KICK:
-            return GoalKickEvent(EventType.GOAL_KICK, state)
+            return GoalKickEvent(EventType.GOAL_KICK, state, rng=self.rng)
         elif event_type == EventType.PENALTY_KICK:
-            return PenaltyKickEvent(EventType.PENALTY_KICK, state)
+            return PenaltyKickEvent(EventType.PENALTY_KICK, state, rng=self.rng)
 
         return NotImplemented
@@ -13,17 +13,18 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Optional
 
 from .cross_event import CrossEvent
 from .pass_event import PassEvent
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, SimulationEvent
 from ..event_type import EventType
 from ..game_state import GameState
-from ..team_strategy import team_corner_kick_strategy
+from ..sampling import weighted_choice
+from ..team_strategy import CORNER_KICK_TABLES
 from ...football.team_simulation import TeamSimulation
 
 
@@ -32,17 +33,18 @@ class CornerKickType(Enum):
     CROSS = auto()
 
 
-@dataclass
+CORNER_KICK_TYPES = tuple(CornerKickType)
+
+
+@dataclass(slots=True)
 class CornerKickEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.MEDIUM
     corner_kick_type: Optional[CornerKickType] = None
     sub_event: Optional[PassEvent | CrossEvent] = None
 
     def get_corner_kick_type(self, attacking_team: TeamSimulation) -> CornerKickType:
-        team_strategy = attacking_team.team_strategy
-        probabilities = team_corner_kick_strategy(team_strategy)
-        corner_types = list(CornerKickType)
-        return random.choices(corner_types, probabilities)
+        cum_weights = CORNER_KICK_TABLES[attacking_team.team_strategy]
+        return weighted_choice(self.rng, CORNER_KICK_TYPES, cum_weights)
 
     def calculate_event(
         self,
@@ -53,15 +55,14 @@ class CornerKickEvent(SimulationEvent):
         is_pass = self.corner_kick_type == CornerKickType.PASS
         self.attacking_player = attacking_team.get_best_corner_kick_taker(is_pass)
 
-        self.commentary.append(
-            f"{self.attacking_player} goes to the ball to take the corner kick!"
-        )
+        self.commentary.add(CommentaryTemplate.CORNER_KICK, self.attacking_player)
 
         if self.corner_kick_type == CornerKickType.PASS:
             self.sub_event = PassEvent(
                 EventType.CORNER_KICK,
                 self.state,
                 outcome=None,
+                rng=self.rng,
                 attacking_player=self.attacking_player,
             )
         else:
@@ -69,6 +70,7 @@ class CornerKickEvent(SimulationEvent):
                 EventType.CORNER_KICK,
                 self.state,
                 outcome=None,
+                rng=self.rng,
                 attacking_player=self.attacking_player,
             )
 
@@ -13,20 +13,30 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 from typing import Optional
 
 from .. import OFF_POSITIONS, PitchPosition
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, EventOutcome, SimulationEvent
 from ..event_type import EventType
 from ..game_state import GameState
-from ..team_strategy import team_cross_strategy
+from ..team_strategy import get_cross_end_position
 from ...football.player import PlayerSimulation
 from ...football.team_simulation import TeamSimulation
 
 
-@dataclass
+GOAL_KICK_END_POSITIONS = (
+    PitchPosition.MIDFIELD_CENTER,
+    PitchPosition.MIDFIELD_RIGHT,
+    PitchPosition.MIDFIELD_LEFT,
+    PitchPosition.OFF_MIDFIELD_LEFT,
+    PitchPosition.OFF_MIDFIELD_RIGHT,
+    PitchPosition.OFF_MIDFIELD_CENTER,
+)
+
+
+@dataclass(slots=True)
 class CrossEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.LOW
     receiving_player: Optional[PlayerSimulation] = None
@@ -35,20 +45,11 @@ class CrossEvent(SimulationEvent):
         if self.event_type == EventType.CORNER_KICK:
             return PitchPosition.OFF_BOX
         if self.event_type == EventType.GOAL_KICK:
-            positions = [
-                PitchPosition.MIDFIELD_CENTER,
-                PitchPosition.MIDFIELD_RIGHT,
-                PitchPosition.MIDFIELD_LEFT,
-                PitchPosition.OFF_MIDFIELD_LEFT,
-                PitchPosition.OFF_MIDFIELD_RIGHT,
-                PitchPosition.OFF_MIDFIELD_CENTER,
-            ]
-            return random.choice(positions)
-
-        team_strategy = attacking_team.team_strategy
-        transition_matrix = team_cross_strategy(team_strategy)
-        probabilities = transition_matrix[self.state.position]
-        return random.choices(list(PitchPosition), probabilities)[0]
+            return self.rng.choice(GOAL_KICK_END_POSITIONS)
+
+        return get_cross_end_position(
+            attacking_team.team_strategy, self.state.position, self.rng
+        )
 
     def get_cross_primary_outcome(self, distance) -> EventOutcome:
         outcomes = [
@@ -77,7 +78,7 @@ class CrossEvent(SimulationEvent):
             cross_success,  # CROSS_SUCCESS
         ]
 
-        return random.choices(outcomes, outcome_probability)[0]
+        return self.rng.choices(outcomes, outcome_probability)[0]
 
     def get_intercept_prob(self) -> EventOutcome:
         outcomes = [EventOutcome.CROSS_MISS, EventOutcome.CROSS_INTERCEPT]
@@ -90,7 +91,7 @@ class CrossEvent(SimulationEvent):
             cross_intercept,
         ]
 
-        return random.choices(outcomes, outcome_probability)[0]
+        return self.rng.choices(outcomes, outcome_probability)[0]
 
     def get_secondary_outcome(self) -> EventOutcome:
         outcomes = [EventOutcome.CROSS_SUCCESS, EventOutcome.CROSS_OFFSIDE]
@@ -105,7 +106,7 @@ class CrossEvent(SimulationEvent):
             1 - offside_probability,
             offside_probability,
         ]
-        return random.choices(outcomes, outcome_probability)[0]
+        return self.rng.choices(outcomes, outcome_probability)[0]
 
     def calculate_event(
         self,
@@ -144,12 +145,12 @@ class CrossEvent(SimulationEvent):
             EventOutcome.CROSS_OFFSIDE,
         ]:
             self.attacking_player.statistics.crosses_missed += 1
-            self.commentary.append(f"{self.attacking_player} failed to cross the ball!")
+            self.commentary.add(CommentaryTemplate.CROSS_FAILED, self.attacking_player)
             if self.outcome == EventOutcome.CROSS_INTERCEPT:
                 self.defending_player.statistics.interceptions += 1
             if self.outcome == EventOutcome.CROSS_OFFSIDE:
                 attacking_team.stats.offsides += 1
-                self.commentary.append(f"{self.attacking_player} was offside!")
+                self.commentary.add(CommentaryTemplate.OFFSIDE, self.attacking_player)
             self.attacking_player.received_ball = None
             self.defending_player.received_ball = None
             self.receiving_player.received_ball = None
@@ -158,14 +159,12 @@ class CrossEvent(SimulationEvent):
             )
         else:
             self.state.position = end_position
-            self.commentary.append(
-                f"{self.attacking_player} crossed the ball to {self.receiving_player}"
+            self.commentary.add(
+                CommentaryTemplate.CROSS, self.attacking_player, self.receiving_player
             )
             self.attacking_player.received_ball = None
             self.defending_player.received_ball = None
             self.receiving_player.received_ball = self.attacking_player
             attacking_team.player_in_possession = self.receiving_player
 
-        attacking_team.update_stats()
-        defending_team.update_stats()
         return self.state
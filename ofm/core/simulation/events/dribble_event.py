@@ -13,25 +13,24 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 
 from .. import PITCH_EQUIVALENTS, PitchPosition
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, EventOutcome, SimulationEvent
 from ..game_state import GameState
-from ..team_strategy import team_pass_strategy
+from ..team_strategy import get_pass_end_position
 from ...football.team_simulation import TeamSimulation
 
 
-@dataclass
+@dataclass(slots=True)
 class DribbleEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.LOW
 
     def get_end_position(self, attacking_team: TeamSimulation) -> PitchPosition:
-        team_strategy = attacking_team.team_strategy
-        transition_matrix = team_pass_strategy(team_strategy)
-        probabilities = transition_matrix[self.state.position]
-        return random.choices(list(PitchPosition), probabilities)[0]
+        return get_pass_end_position(
+            attacking_team.team_strategy, self.state.position, self.rng
+        )
 
     def get_dribble_primary_outcome(self, distance: int) -> EventOutcome:
         outcomes = [
@@ -62,7 +61,7 @@ class DribbleEvent(SimulationEvent):
             / 3,
         ]
 
-        return random.choices(outcomes, outcome_probability)[0]
+        return self.rng.choices(outcomes, outcome_probability)[0]
 
     def calculate_event(
         self, attacking_team: TeamSimulation, defending_team: TeamSimulation
@@ -80,7 +79,9 @@ class DribbleEvent(SimulationEvent):
         self.outcome = self.get_dribble_primary_outcome(distance)
 
         if self.outcome == EventOutcome.DRIBBLE_FAIL:
-            self.commentary.append(f"{self.defending_player} steals the ball!")
+            self.commentary.add(
+                CommentaryTemplate.DRIBBLE_FAILED, self.defending_player
+            )
             attacking_team.in_possession = False
             attacking_team.player_in_possession = None
             defending_team.player_in_possession = self.defending_player
@@ -90,8 +91,6 @@ class DribbleEvent(SimulationEvent):
             self.attacking_player.statistics.dribbles_failed += 1
         else:
             self.state.position = end_position
-            self.commentary.append(f"{self.attacking_player} dribbles the defender!")
+            self.commentary.add(CommentaryTemplate.DRIBBLE, self.attacking_player)
 
-        attacking_team.update_stats()
-        defending_team.update_stats()
         return self.state
@@ -13,10 +13,10 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 from typing import Optional
 
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, EventOutcome, SimulationEvent
 from ..event_type import FoulStrength, FoulType
 from ..game_state import GameState
@@ -24,7 +24,7 @@ from ...football.player import PlayerInjury, PlayerSimulation
 from ...football.team_simulation import TeamSimulation
 
 
-@dataclass
+@dataclass(slots=True)
 class FoulEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.MEDIUM
     foul_type: Optional[FoulType] = None
@@ -35,7 +35,7 @@ class FoulEvent(SimulationEvent):
             FoulType.DEFENSIVE_FOUL,
         ]
 
-        return random.choice(type_of_foul)
+        return self.rng.choice(type_of_foul)
 
     def get_player_injury(
         self, offending_player: PlayerSimulation, fouled_player: PlayerSimulation
@@ -48,7 +48,7 @@ class FoulEvent(SimulationEvent):
 
         foul_seriousness_values = [FoulStrength.LIGHT, None]
 
-        foul_seriousness = random.choices(
+        foul_seriousness = self.rng.choices(
             foul_seriousness_values,
             [offending_player_aggression, 1 - offending_player_aggression],
         )[0]
@@ -56,7 +56,7 @@ class FoulEvent(SimulationEvent):
         if foul_seriousness is not None:
             return PlayerInjury.NO_INJURY
 
-        foul_seriousness = random.choices(
+        foul_seriousness = self.rng.choices(
             [FoulStrength.MEDIUM, FoulStrength.HIGH], [0.9, 0.1]
         )[0]
 
@@ -76,7 +76,7 @@ class FoulEvent(SimulationEvent):
 
         probability_of_injury = [enduring_probability, not_enduring_prob]
 
-        enduring = random.choices(endures, probability_of_injury)[0]
+        enduring = self.rng.choices(endures, probability_of_injury)[0]
 
         if enduring is not None:
             return enduring
@@ -96,7 +96,7 @@ class FoulEvent(SimulationEvent):
             injuries_prob.remove(0.000099)
             injuries_prob.remove(0.000001)
 
-        injury = random.choices(injuries, injuries_prob)[0]
+        injury = self.rng.choices(injuries, injuries_prob)[0]
         if injury in [
             PlayerInjury.MEDIUM_INJURY,
             PlayerInjury.SEVERE_INJURY,
@@ -121,7 +121,7 @@ class FoulEvent(SimulationEvent):
         ]
         probability = [98, 2]
 
-        return random.choices(outcomes, probability)[0]
+        return self.rng.choices(outcomes, probability)[0]
 
     def calculate_event(
         self,
@@ -156,13 +156,11 @@ class FoulEvent(SimulationEvent):
             offending_team.add_yellow_card(
                 offending_player, self.state.minutes, self.state.additional_time_elapsed
             )
-            self.commentary.append(f"{offending_player} received a yellow card!")
+            self.commentary.add(CommentaryTemplate.YELLOW_CARD, offending_player)
 
         if offending_player.statistics.yellow_cards == 2:
             self.outcome = EventOutcome.FOUL_RED_CARD
-            self.commentary.append(
-                f"{offending_player} now has 2 yellow cards! That's a send off!"
-            )
+            self.commentary.add(CommentaryTemplate.SECOND_YELLOW_CARD, offending_player)
 
         if self.outcome == EventOutcome.FOUL_RED_CARD:
             offending_team.add_red_card(
@@ -170,6 +168,6 @@ class FoulEvent(SimulationEvent):
             )
             offending_player.statistics.red_cards += 1
             offending_player.able_to_play = False
-            self.commentary.append(f"{offending_player} received a red card!")
+            self.commentary.add(CommentaryTemplate.RED_CARD, offending_player)
 
         return self.state
@@ -13,7 +13,6 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 from typing import Optional
 
@@ -21,13 +20,14 @@ from .cross_event import CrossEvent
 from .pass_event import PassEvent
 from .shot_event import ShotEvent
 from .. import OFF_POSITIONS
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, SimulationEvent
 from ..event_type import EventType, FreeKickType
 from ..game_state import GameState
 from ...football.team_simulation import TeamSimulation
 
 
-@dataclass
+@dataclass(slots=True)
 class FreeKickEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.MEDIUM
     free_kick_type: Optional[FreeKickType] = None
@@ -42,7 +42,7 @@ class FreeKickEvent(SimulationEvent):
         if self.state.position in OFF_POSITIONS:
             free_kick_types.append(FreeKickType.DIRECT_SHOT)
 
-        return random.choice(free_kick_types)
+        return self.rng.choice(free_kick_types)
 
     def calculate_event(
         self,
@@ -58,15 +58,14 @@ class FreeKickEvent(SimulationEvent):
 
         self.free_kick_type = self.get_free_kick_type()
 
-        self.commentary.append(
-            f"{self.attacking_player} goes to the ball to take the free kick!"
-        )
+        self.commentary.add(CommentaryTemplate.FREE_KICK, self.attacking_player)
 
         if self.free_kick_type == FreeKickType.PASS:
             self.sub_event = PassEvent(
                 EventType.FREE_KICK,
                 self.state,
                 outcome=None,
+                rng=self.rng,
                 attacking_player=self.attacking_player,
             )
         elif self.free_kick_type == FreeKickType.DIRECT_SHOT:
@@ -74,6 +73,7 @@ class FreeKickEvent(SimulationEvent):
                 EventType.FREE_KICK,
                 self.state,
                 outcome=None,
+                rng=self.rng,
                 attacking_player=self.attacking_player,
             )
         else:
@@ -81,6 +81,7 @@ class FreeKickEvent(SimulationEvent):
                 EventType.FREE_KICK,
                 self.state,
                 outcome=None,
+                rng=self.rng,
                 attacking_player=self.attacking_player,
             )
 
@@ -13,13 +13,13 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Optional
 
 from .cross_event import CrossEvent
 from .pass_event import PassEvent
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, SimulationEvent
 from ..event_type import EventType
 from ..game_state import GameState
@@ -32,7 +32,7 @@ class GoalKickType(Enum):
     CROSS = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class GoalKickEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.LOW
     goal_kick_type: Optional[GoalKickType] = None
@@ -41,7 +41,7 @@ class GoalKickEvent(SimulationEvent):
 
     def get_goal_kick_type(self):
         goal_kick_types = list(GoalKickType)
-        return random.choice(goal_kick_types)
+        return self.rng.choice(goal_kick_types)
 
     def calculate_event(
         self,
@@ -50,7 +50,7 @@ class GoalKickEvent(SimulationEvent):
     ) -> GameState:
         self.attacking_player = attacking_team.formation.gk
 
-        self.commentary.append(f"Goal Kick {self.state.position.name}")
+        self.commentary.add(CommentaryTemplate.GOAL_KICK, self.state.position.name)
 
         self.goal_kick_type = self.get_goal_kick_type()
 
@@ -59,6 +59,7 @@ class GoalKickEvent(SimulationEvent):
                 EventType.GOAL_KICK,
                 self.state,
                 outcome=None,
+                rng=self.rng,
                 attacking_player=self.attacking_player,
             )
         else:
@@ -66,6 +67,7 @@ class GoalKickEvent(SimulationEvent):
                 EventType.GOAL_KICK,
                 self.state,
                 outcome=None,
+                rng=self.rng,
                 attacking_player=self.attacking_player,
             )
 
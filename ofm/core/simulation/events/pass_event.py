@@ -13,20 +13,20 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 from typing import Optional
 
 from .. import OFF_POSITIONS, PitchPosition
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, EventOutcome, SimulationEvent
 from ..event_type import EventType
 from ..game_state import GameState
-from ..team_strategy import team_pass_strategy
+from ..team_strategy import get_pass_end_position
 from ...football.player import PlayerSimulation
 from ...football.team_simulation import TeamSimulation
 
 
-@dataclass
+@dataclass(slots=True)
 class PassEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.LOW
     receiving_player: Optional[PlayerSimulation] = None
@@ -35,10 +35,9 @@ class PassEvent(SimulationEvent):
         if self.event_type == EventType.CORNER_KICK:
             return self.state.position
 
-        team_strategy = attacking_team.team_strategy
-        transition_matrix = team_pass_strategy(team_strategy)
-        probabilities = transition_matrix[self.state.position]
-        return random.choices(list(PitchPosition), probabilities)[0]
+        return get_pass_end_position(
+            attacking_team.team_strategy, self.state.position, self.rng
+        )
 
     def get_pass_primary_outcome(self, distance: int) -> EventOutcome:
         outcomes = [
@@ -67,7 +66,7 @@ class PassEvent(SimulationEvent):
             pass_success,  # PASS_SUCCESS
         ]
 
-        return random.choices(outcomes, outcome_probability)[0]
+        return self.rng.choices(outcomes, outcome_probability)[0]
 
     def get_intercept_prob(self) -> EventOutcome:
         outcomes = [EventOutcome.PASS_MISS, EventOutcome.PASS_INTERCEPT]
@@ -80,7 +79,7 @@ class PassEvent(SimulationEvent):
             pass_intercept,
         ]
 
-        return random.choices(outcomes, outcome_probability)[0]
+        return self.rng.choices(outcomes, outcome_probability)[0]
 
     def get_secondary_outcome(self) -> EventOutcome:
         outcomes = [EventOutcome.PASS_SUCCESS, EventOutcome.PASS_OFFSIDE]
@@ -95,7 +94,7 @@ class PassEvent(SimulationEvent):
             1 - offside_probability,
             offside_probability,
         ]
-        return random.choices(outcomes, outcome_probability)[0]
+        return self.rng.choices(outcomes, outcome_probability)[0]
 
     def calculate_event(
         self,
@@ -134,12 +133,12 @@ class PassEvent(SimulationEvent):
             EventOutcome.PASS_OFFSIDE,
         ]:
             self.attacking_player.statistics.passes_missed += 1
-            self.commentary.append(f"{self.attacking_player} failed to pass the ball!")
+            self.commentary.add(CommentaryTemplate.PASS_FAILED, self.attacking_player)
             if self.outcome == EventOutcome.PASS_INTERCEPT:
                 self.defending_player.statistics.interceptions += 1
             if self.outcome == EventOutcome.PASS_OFFSIDE:
                 attacking_team.stats.offsides += 1
-                self.commentary.append(f"{self.receiving_player} was offside!")
+                self.commentary.add(CommentaryTemplate.OFFSIDE, self.receiving_player)
             self.attacking_player.received_ball = None
             self.defending_player.received_ball = None
             self.receiving_player.received_ball = None
@@ -148,14 +147,12 @@ class PassEvent(SimulationEvent):
             )
         else:
             self.state.position = end_position
-            self.commentary.append(
-                f"{self.attacking_player} passed the ball to {self.receiving_player}"
+            self.commentary.add(
+                CommentaryTemplate.PASS, self.attacking_player, self.receiving_player
             )
             self.attacking_player.received_ball = None
             self.receiving_player.received_ball = self.attacking_player
             self.defending_player.received_ball = None
             attacking_team.player_in_possession = self.receiving_player
 
-        attacking_team.update_stats()
-        defending_team.update_stats()
         return self.state
@@ -17,13 +17,14 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .shot_event import ShotEvent
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, SimulationEvent
 from ..event_type import EventType
 from ..game_state import GameState
 from ...football.team_simulation import TeamSimulation
 
 
-@dataclass
+@dataclass(slots=True)
 class PenaltyKickEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.HIGH
     sub_event: Optional[ShotEvent] = None
@@ -33,15 +34,18 @@ class PenaltyKickEvent(SimulationEvent):
         attacking_team: TeamSimulation,
         defending_team: TeamSimulation,
     ) -> GameState:
-        self.commentary.append("Penalty Kick!")
+        self.commentary.add(CommentaryTemplate.PENALTY_KICK)
         self.defending_player = defending_team.formation.gk
         self.attacking_player = attacking_team.get_best_penalty_taker()
 
-        self.commentary.append(f"{self.attacking_player} goes to the ball")
+        self.commentary.add(
+            CommentaryTemplate.PENALTY_KICK_TAKER, self.attacking_player
+        )
         self.sub_event = ShotEvent(
             EventType.PENALTY_KICK,
             self.state,
             outcome=None,
+            rng=self.rng,
             attacking_player=self.attacking_player,
             defending_player=self.defending_player,
         )
@@ -13,18 +13,18 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import random
 from dataclasses import dataclass
 from datetime import timedelta
 
 from .. import PitchPosition
+from ..commentary import CommentaryTemplate
 from ..event import CommentaryImportance, EventOutcome, SimulationEvent
 from ..event_type import EventType
 from ..game_state import GameState
 from ...football.team_simulation import TeamSimulation
 
 
-@dataclass
+@dataclass(slots=True)
 class ShotEvent(SimulationEvent):
     commentary_importance = CommentaryImportance.HIGH
 
@@ -34,8 +34,8 @@ class ShotEvent(SimulationEvent):
             EventOutcome.SHOT_LEFT_CORNER_KICK,
             EventOutcome.SHOT_SAVED_SECURED,
         ]
-        self.commentary.append(f"{self.defending_player} saved the ball!")
-        return random.choice(final_outcomes)
+        self.commentary.add(CommentaryTemplate.SHOT_SAVED_BALL, self.defending_player)
+        return self.rng.choice(final_outcomes)
 
     def get_shot_on_goal(
         self, shot_on_goal: float, defending_team: TeamSimulation
@@ -59,15 +59,15 @@ class ShotEvent(SimulationEvent):
                 / 2
             )
 
-        return random.choices(basic_event_outcomes, event_probabilities)[0]
+        return self.rng.choices(basic_event_outcomes, event_probabilities)[0]
 
     def get_shot_blocked(self):
         outcomes = [
             EventOutcome.SHOT_BLOCKED_CHANGE_POSSESSION,
             EventOutcome.SHOT_BLOCKED_BACK,
         ]
-        outcome = random.choice(outcomes)
-        self.commentary.append(f"{self.defending_player} blocked the shot!")
+        outcome = self.rng.choice(outcomes)
+        self.commentary.add(CommentaryTemplate.SHOT_BLOCKED, self.defending_player)
 
         return outcome
 
@@ -91,7 +91,7 @@ class ShotEvent(SimulationEvent):
             gk_skills,
             120 - gk_skills,  # Even very good goalies can let balls pass sometimes
         ]
-        return random.choices(outcomes, probabilities)[0]
+        return self.rng.choices(outcomes, probabilities)[0]
 
     def get_shot_hit_post(self) -> EventOutcome:
         final_outcomes = [
@@ -100,7 +100,7 @@ class ShotEvent(SimulationEvent):
             EventOutcome.SHOT_GOAL_KICK,
         ]
 
-        return random.choice(final_outcomes)
+        return self.rng.choice(final_outcomes)
 
     def calculate_event(
         self,
@@ -133,7 +133,7 @@ class ShotEvent(SimulationEvent):
                 + self.attacking_player.attributes.offensive.shot_power
             ) / 2
 
-        self.commentary.append(f"{self.attacking_player} shoots!")
+        self.commentary.add(CommentaryTemplate.SHOT, self.attacking_player)
 
         first_outcome = self.get_shot_on_goal(shot_on_goal, defending_team)
 
@@ -151,15 +151,15 @@ class ShotEvent(SimulationEvent):
             self.outcome = self.get_shot_on_goal_outcomes(shot_on_goal)
 
         if self.outcome == EventOutcome.SHOT_HIT_POST:
-            self.commentary.append(f"{self.attacking_player} hits the post!")
+            self.commentary.add(CommentaryTemplate.SHOT_HIT_POST, self.attacking_player)
             self.outcome = self.get_shot_hit_post()
         elif self.outcome == EventOutcome.SHOT_SAVED:
-            self.commentary.append(f"{self.defending_player} saves the shot!")
+            self.commentary.add(CommentaryTemplate.SHOT_SAVED, self.defending_player)
             self.defending_player.statistics.shots_saved += 1
             self.attacking_player.statistics.shots_missed += 1
             self.outcome = self.get_shot_saved_outcomes()
         elif self.outcome == EventOutcome.GOAL:
-            self.commentary.append(f"GOAL! {self.attacking_player} scores!")
+            self.commentary.add(CommentaryTemplate.GOAL, self.attacking_player)
             self.attacking_player.statistics.goals += 1
             self.defending_player.statistics.goals_conceded += 1
             if self.attacking_player.received_ball is not None:
@@ -223,6 +223,4 @@ class ShotEvent(SimulationEvent):
 
         self.attacking_player.received_ball = None
         self.defending_player.received_ball = None
-        attacking_team.update_stats()
-        defending_team.update_stats()
         return self.state
@@ -34,10 +34,58 @@ class SimulationStatus(Enum):
     FINISHED = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
-    minutes: timedelta
+    """
+    The game clock is kept in whole seconds. minutes and additional_time_elapsed are
+    timedelta views of it, for code that shows or stores match times.
+    """
+
+    seconds: int
     status: SimulationStatus
     position: PitchPosition
     in_additional_time: bool = False
-    additional_time_elapsed: timedelta = timedelta(0)
+    additional_seconds: int = 0
+
+    def __post_init__(self):
+        if isinstance(self.seconds, timedelta):
+            self.seconds = int(self.seconds.total_seconds())
+        if isinstance(self.additional_seconds, timedelta):
+            self.additional_seconds = int(self.additional_seconds.total_seconds())
+
+    @property
+    def minutes(self) -> timedelta:
+        return timedelta(seconds=self.seconds)
+
+    @minutes.setter
+    def minutes(self, value: timedelta):
+        self.seconds = int(value.total_seconds())
+
+    @property
+    def additional_time_elapsed(self) -> timedelta:
+        return timedelta(seconds=self.additional_seconds)
+
+    @additional_time_elapsed.setter
+    def additional_time_elapsed(self, value: timedelta):
+        self.additional_seconds = int(value.total_seconds())
+
+    def copy(self) -> "GameState":
+        """
+        All the fields are immutable values, so a shallow copy is enough to get an independent state.
+        """
+        return GameState(
+            self.seconds,
+            self.status,
+            self.position,
+            self.in_additional_time,
+            self.additional_seconds,
+        )
+
+    def evolve(self, **changes) -> "GameState":
+        """
+        Returns a copy of the state with the given fields replaced.
+        """
+        state = self.copy()
+        for name, value in changes.items():
+            setattr(state, name, value)
+        return state
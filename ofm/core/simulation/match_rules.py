@@ -0,0 +1,141 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Optional
+
+from .game_state import SimulationStatus
+
+
+class KickOff(Enum):
+    STARTING_TEAM = auto()
+    SECONDARY_TEAM = auto()
+
+
+@dataclass(frozen=True, slots=True)
+class MatchPhase:
+    """
+    A row of the match phase table.
+
+    Phases with an end_seconds are played until that second of the game, plus the additional
+    time. The other phases (kick offs and breaks) only last for a single event.
+    """
+
+    status: SimulationStatus
+    next_status: Optional[SimulationStatus] = None
+    end_seconds: Optional[int] = None
+    is_break: bool = False
+    kick_off: Optional[KickOff] = None
+    is_extra_time: bool = False
+    # Where a tied game goes at the end of the phase
+    extra_time_status: Optional[SimulationStatus] = None
+    penalties_status: Optional[SimulationStatus] = None
+
+
+MATCH_PHASES: dict[SimulationStatus, MatchPhase] = {
+    phase.status: phase
+    for phase in (
+        MatchPhase(
+            SimulationStatus.NOT_STARTED,
+            SimulationStatus.FIRST_HALF,
+            kick_off=KickOff.STARTING_TEAM,
+        ),
+        MatchPhase(
+            SimulationStatus.FIRST_HALF,
+            SimulationStatus.FIRST_HALF_BREAK,
+            end_seconds=45 * 60,
+        ),
+        MatchPhase(
+            SimulationStatus.FIRST_HALF_BREAK,
+            SimulationStatus.SECOND_HALF,
+            is_break=True,
+            kick_off=KickOff.SECONDARY_TEAM,
+        ),
+        MatchPhase(
+            SimulationStatus.SECOND_HALF,
+            SimulationStatus.FINISHED,
+            end_seconds=90 * 60,
+            extra_time_status=SimulationStatus.SECOND_HALF_BREAK,
+            penalties_status=SimulationStatus.PENALTY_SHOOTOUT,
+        ),
+        MatchPhase(
+            SimulationStatus.SECOND_HALF_BREAK,
+            SimulationStatus.FIRST_HALF_EXTRA_TIME,
+            is_break=True,
+            kick_off=KickOff.STARTING_TEAM,
+        ),
+        MatchPhase(
+            SimulationStatus.FIRST_HALF_EXTRA_TIME,
+            SimulationStatus.FIRST_HALF_EXTRA_TIME_BREAK,
+            end_seconds=105 * 60,
+            is_extra_time=True,
+        ),
+        MatchPhase(
+            SimulationStatus.FIRST_HALF_EXTRA_TIME_BREAK,
+            SimulationStatus.SECOND_HALF_EXTRA_TIME,
+            is_break=True,
+            kick_off=KickOff.SECONDARY_TEAM,
+        ),
+        MatchPhase(
+            SimulationStatus.SECOND_HALF_EXTRA_TIME,
+            SimulationStatus.FINISHED,
+            end_seconds=120 * 60,
+            is_extra_time=True,
+            penalties_status=SimulationStatus.SECOND_HALF_EXTRA_TIME_BREAK,
+        ),
+        MatchPhase(
+            SimulationStatus.SECOND_HALF_EXTRA_TIME_BREAK,
+            SimulationStatus.PENALTY_SHOOTOUT,
+            is_break=True,
+        ),
+        MatchPhase(SimulationStatus.PENALTY_SHOOTOUT, SimulationStatus.FINISHED),
+        MatchPhase(SimulationStatus.FINISHED),
+    )
+}
+
+
+@dataclass
+class MatchRules:
+    """
+    Competition rules of a match.
+
+    first_leg_score is the (home, away) score of the first leg of a two-legged tie, from the
+    point of view of this match's home and away teams. If it is set, ties are decided by the
+    aggregate score and, with away_goals_rule, by the goals scored away from home.
+    """
+
+    extra_time: bool = False
+    penalties: bool = False
+    golden_goal: bool = False
+    first_leg_score: Optional[tuple[int, int]] = None
+    away_goals_rule: bool = False
+
+    def get_aggregate_score(self, home_score: int, away_score: int) -> tuple[int, int]:
+        if self.first_leg_score is None:
+            return home_score, away_score
+        first_leg_home, first_leg_away = self.first_leg_score
+        return home_score + first_leg_home, away_score + first_leg_away
+
+    def is_tie(self, home_score: int, away_score: int) -> bool:
+        home_aggregate, away_aggregate = self.get_aggregate_score(
+            home_score, away_score
+        )
+        if home_aggregate != away_aggregate:
+            return False
+        if self.first_leg_score is not None and self.away_goals_rule:
+            # This match's home team played the first leg away from home
+            return self.first_leg_score[0] == away_score
+        return True
@@ -0,0 +1,36 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from bisect import bisect
+from itertools import accumulate
+from random import Random
+from typing import Iterable, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def get_cumulative_weights(weights: Iterable[float]) -> tuple[float, ...]:
+    return tuple(accumulate(weights))
+
+
+def weighted_choice(
+    rng: Random, population: Sequence[T], cum_weights: Sequence[float]
+) -> T:
+    """
+    Same as rng.choices(population, cum_weights=cum_weights)[0], and draws the same values
+    from the random stream, but without allocating lists on every call.
+    """
+    hi = len(cum_weights) - 1
+    return population[bisect(cum_weights, rng.random() * cum_weights[-1], 0, hi)]
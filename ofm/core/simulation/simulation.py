@@ -21,9 +21,12 @@ from typing import Optional
 
 from . import PitchPosition
 from .event import SimulationEvent
+from .event_log import AWAY_TEAM, HOME_TEAM, EventLog
 from .events import EventFactory
 from .fixture import Fixture
 from .game_state import GameState, SimulationStatus
+from .match_rules import MATCH_PHASES, KickOff, MatchRules
+from ..football.player import PlayerSimulation
 from ..football.team_simulation import TeamSimulation
 
 
@@ -46,29 +49,50 @@ class LiveGame:
         no_break: bool,
         delay: DelayValue = DelayValue.NONE,
         max_substitutions: int = 5,
+        seed: Optional[int] = None,
+        rules: Optional[MatchRules] = None,
+        event_log: Optional[EventLog] = None,
     ):
+        """
+        If rules are given, they take precedence over possible_extra_time and possible_penalties.
+
+        If an event_log is given, events are recorded there instead of the engine's event_history.
+        """
         self.fixture = fixture
         self.is_game_over = False
-        self.possible_penalties = possible_penalties
-        self._possible_extra_time = possible_extra_time
+        if rules is None:
+            rules = MatchRules(possible_extra_time, possible_penalties)
+        self.rules = rules
         self.no_break = no_break
         self.delay = delay
         self.penalty_shootout = False
         self.attendance = self.calculate_attendance()
-        self.engine = SimulationEngine(home_team, away_team, max_substitutions)
-        self.added_time: Optional[timedelta] = None
-        self.total_elapsed_time: timedelta = timedelta(0)
+        if seed is None:
+            seed = fixture.fixture_id.int
+        self.engine = SimulationEngine(
+            home_team, away_team, max_substitutions, seed, event_log
+        )
+        self.added_seconds: Optional[int] = None
+        self.total_elapsed_seconds: int = 0
 
     @property
     def possible_extra_time(self):
-        return self._possible_extra_time
+        return self.rules.extra_time
 
     @possible_extra_time.setter
     def possible_extra_time(self, value: bool):
-        self._possible_extra_time = value
+        self.rules.extra_time = value
         if not self.possible_penalties:
             self.possible_penalties = True
 
+    @property
+    def possible_penalties(self):
+        return self.rules.penalties
+
+    @possible_penalties.setter
+    def possible_penalties(self, value: bool):
+        self.rules.penalties = value
+
     @property
     def minutes(self):
         return self.engine.state.minutes
@@ -77,6 +101,16 @@ class LiveGame:
     def minutes(self, minutes):
         self.engine.state.minutes = minutes
 
+    @property
+    def added_time(self) -> Optional[timedelta]:
+        if self.added_seconds is None:
+            return None
+        return timedelta(seconds=self.added_seconds)
+
+    @property
+    def total_elapsed_time(self) -> timedelta:
+        return timedelta(seconds=self.total_elapsed_seconds)
+
     @property
     def state(self):
         return self.engine.state
@@ -87,149 +121,89 @@ class LiveGame:
 
     def get_added_time(self):
         if (
-            (
-                self.state.status == SimulationStatus.FIRST_HALF
-                and self.state.in_additional_time is False
-                and self.state.minutes == timedelta(minutes=45)
-            )
-            or (
-                self.state.status == SimulationStatus.SECOND_HALF
-                and self.state.in_additional_time is False
-                and self.state.minutes == timedelta(minutes=90)
-            )
-            or (
-                self.state.status == SimulationStatus.FIRST_HALF_EXTRA_TIME
-                and self.state.in_additional_time is False
-                and self.state.minutes == timedelta(minutes=105)
-            )
-            or (
-                self.state.status == SimulationStatus.SECOND_HALF_EXTRA_TIME
-                and self.state.in_additional_time is False
-                and self.state.minutes == timedelta(minutes=120)
-            )
+            not self.state.in_additional_time
+            and MATCH_PHASES[self.state.status].end_seconds == self.state.seconds
         ):
-            added_time = random.randint(0, 5)
+            added_time = self.engine.rng.randint(0, 5)
             self.state.in_additional_time = True
-            self.added_time = timedelta(minutes=float(added_time))
+            self.added_seconds = added_time * 60
 
     def calculate_attendance(self) -> int:
         pass
 
     def reset_state_additional_time(self):
         self.state.in_additional_time = False
-        self.state.additional_time_elapsed = timedelta(0)
+        self.state.additional_seconds = 0
+
+    def is_tied(self) -> bool:
+        return self.rules.is_tie(
+            self.engine.home_team.score, self.engine.away_team.score
+        )
+
+    def finish_game(self):
+        self.state.status = SimulationStatus.FINISHED
+        self.is_game_over = True
 
     def transition_game_status(self):
-        if self.state.status == SimulationStatus.NOT_STARTED:
-            self.state.status = SimulationStatus.FIRST_HALF
-        elif (
-            self.state.status == SimulationStatus.FIRST_HALF
-            and self.state.minutes == timedelta(minutes=45)
-        ):
-            if not self.state.in_additional_time:
-                self.get_added_time()
-            elif (
-                self.state.additional_time_elapsed.total_seconds()
-                >= self.added_time.total_seconds()
-            ):
-                self.state.status = SimulationStatus.FIRST_HALF_BREAK
-                self.reset_state_additional_time()
-        elif self.state.status == SimulationStatus.FIRST_HALF_BREAK:
-            self.state.status = SimulationStatus.SECOND_HALF
-        elif (
-            self.state.status == SimulationStatus.SECOND_HALF
-            and self.state.minutes == timedelta(minutes=90)
-        ):
-            if not self.state.in_additional_time:
-                self.get_added_time()
-            elif (
-                self.state.additional_time_elapsed.total_seconds()
-                >= self.added_time.total_seconds()
-            ):
-                if self.possible_extra_time and self.engine.is_game_a_draw():
-                    self.state.status = SimulationStatus.SECOND_HALF_BREAK
-                    self.reset_state_additional_time()
-                else:
-                    self.state.status = SimulationStatus.FINISHED
-                    self.is_game_over = True
-        elif self.state.status == SimulationStatus.SECOND_HALF_BREAK:
-            self.state.status = SimulationStatus.FIRST_HALF_EXTRA_TIME
-        elif (
-            self.state.status == SimulationStatus.FIRST_HALF_EXTRA_TIME
-            and self.state.minutes == timedelta(minutes=105)
-        ):
-            if not self.state.in_additional_time:
-                self.get_added_time()
-            elif (
-                self.state.additional_time_elapsed.total_seconds()
-                >= self.added_time.total_seconds()
-            ):
-                self.state.status = SimulationStatus.FIRST_HALF_EXTRA_TIME_BREAK
-                self.reset_state_additional_time()
-        elif self.state.status == SimulationStatus.FIRST_HALF_EXTRA_TIME_BREAK:
-            self.state.status = SimulationStatus.SECOND_HALF_EXTRA_TIME
-        elif (
-            self.state.status == SimulationStatus.SECOND_HALF_EXTRA_TIME
-            and self.state.minutes == timedelta(minutes=120)
-        ):
-            if not self.state.in_additional_time:
-                self.get_added_time()
-            elif (
-                self.state.additional_time_elapsed.total_seconds()
-                >= self.added_time.total_seconds()
+        phase = MATCH_PHASES[self.state.status]
+        if phase.end_seconds is None:
+            self.state.status = phase.next_status
+            return
+
+        if phase.is_extra_time and self.rules.golden_goal and not self.is_tied():
+            self.finish_game()
+            return
+
+        if self.state.seconds != phase.end_seconds:
+            return
+
+        if not self.state.in_additional_time:
+            self.get_added_time()
+            return
+
+        if self.state.additional_seconds < self.added_seconds:
+            return
+
+        self.reset_state_additional_time()
+        next_status = phase.next_status
+        if next_status == SimulationStatus.FINISHED and self.is_tied():
+            if phase.extra_time_status is not None and self.rules.extra_time:
+                next_status = phase.extra_time_status
+            elif phase.penalties_status is not None and (
+                self.rules.penalties or phase.is_extra_time
             ):
-                if self.engine.is_game_a_draw():
-                    self.state.status = SimulationStatus.SECOND_HALF_EXTRA_TIME_BREAK
-                else:
-                    self.state.status = SimulationStatus.FINISHED
-                    self.is_game_over = True
-        elif self.state.status == SimulationStatus.SECOND_HALF_EXTRA_TIME_BREAK:
-            self.state.status = SimulationStatus.PENALTY_SHOOTOUT
+                # A game that is still tied after extra time always goes to penalties
+                next_status = phase.penalties_status
+
+        if next_status == SimulationStatus.FINISHED:
+            self.finish_game()
+        else:
+            self.state.status = next_status
 
     def add_minutes(self):
         duration = self.engine.get_event_duration()
-        self.state.minutes += duration
-        self.total_elapsed_time += duration
+        state = self.state
+        state.seconds += duration
+        self.total_elapsed_seconds += duration
 
-        if (
-            self.state.minutes >= timedelta(minutes=45)
-            and self.state.status == SimulationStatus.FIRST_HALF
-        ):
-            additional_time = self.state.minutes - timedelta(minutes=45)
-            self.state.additional_time_elapsed += additional_time
-            self.state.minutes = timedelta(minutes=45)
-        elif (
-            self.state.minutes >= timedelta(minutes=90)
-            and self.state.status == SimulationStatus.SECOND_HALF
-        ):
-            additional_time = self.state.minutes - timedelta(minutes=90)
-            self.state.additional_time_elapsed += additional_time
-            self.state.minutes = timedelta(minutes=90)
-        elif (
-            self.state.minutes >= timedelta(minutes=105)
-            and self.state.status == SimulationStatus.FIRST_HALF_EXTRA_TIME
-        ):
-            additional_time = self.state.minutes - timedelta(minutes=105)
-            self.state.additional_time_elapsed += additional_time
-            self.state.minutes = timedelta(minutes=105)
-        elif (
-            self.state.minutes >= timedelta(minutes=120)
-            and self.state.status == SimulationStatus.SECOND_HALF_EXTRA_TIME
-        ):
-            additional_time = self.state.minutes - timedelta(minutes=120)
-            self.state.additional_time_elapsed += additional_time
-            self.state.minutes = timedelta(minutes=120)
+        half_end = MATCH_PHASES[state.status].end_seconds
+        if half_end is not None and state.seconds >= half_end:
+            state.additional_seconds += state.seconds - half_end
+            state.seconds = half_end
 
     def is_game_on_break(self) -> bool:
-        return (
-            self.state.status == SimulationStatus.FIRST_HALF_BREAK
-            or self.state.status == SimulationStatus.SECOND_HALF_BREAK
-            or self.state.status == SimulationStatus.FIRST_HALF_EXTRA_TIME_BREAK
-            or self.state.status == SimulationStatus.SECOND_HALF_EXTRA_TIME_BREAK
-        )
+        return MATCH_PHASES[self.state.status].is_break
+
+    def run_penalty_shootout(self):
+        self.penalty_shootout = True
+        self.engine.run_penalty_shootout()
+        self.finish_game()
 
     def run(self):
         while not self.is_game_over:
+            if self.state.status == SimulationStatus.PENALTY_SHOOTOUT:
+                self.run_penalty_shootout()
+                break
             self.engine.run()
             self.add_minutes()
             self.transition_game_status()
@@ -245,31 +219,49 @@ class SimulationEngine:
         home_team: TeamSimulation,
         away_team: TeamSimulation,
         max_substitutions: int,
+        seed: Optional[int] = None,
+        event_log: Optional[EventLog] = None,
     ):
+        """
+        All the randomness of a match comes from the engine's own random stream, so a match
+        played with the same teams and the same seed always has the same result, no matter
+        which thread or process runs it.
+
+        Every event is kept in event_history, unless an event_log is given. In that case events
+        are only recorded in the log, and the engine only keeps the last event.
+        """
+        self.rng = random.Random(seed)
         self.home_team = home_team
         self.away_team = away_team
         self.home_team.max_substitutions = max_substitutions
         self.away_team.max_substitutions = max_substitutions
+        self.home_team.rng = self.rng
+        self.away_team.rng = self.rng
         self.event_history: list[SimulationEvent] = []
+        self.event_log = event_log
+        if event_log is not None:
+            event_log.register_teams(home_team, away_team)
+        self.last_event: Optional[SimulationEvent] = None
         self.state = GameState(
-            timedelta(seconds=0),
+            0,
             SimulationStatus.NOT_STARTED,
             PitchPosition.MIDFIELD_CENTER,
         )
-        self.starting_the_game = random.choice([self.home_team, self.away_team])
+        self.starting_the_game = self.rng.choice([self.home_team, self.away_team])
         if self.starting_the_game == self.home_team:
             self.secondary_start = self.away_team
         else:
             self.secondary_start = self.home_team
-        self.event_factory = EventFactory()
+        self.event_factory = EventFactory(self.rng)
 
     def generate_event(self) -> SimulationEvent:
-        last_event = self.event_history[-1] if self.event_history else None
         event_type = self.event_factory.get_event_type(
-            self.get_team_in_possession(), self.state, last_event
+            self.get_team_in_possession(), self.state, self.last_event
         )
         event = self.event_factory.get_event(self.state, event_type)
-        self.event_history.append(event)
+        if self.event_log is None:
+            self.event_history.append(event)
+        self.last_event = event
         return event
 
     def is_game_a_draw(self) -> bool:
@@ -279,10 +271,8 @@ class SimulationEngine:
         """
         Returns (Attacking Team, Defending Team)
         """
-        if self.state.status in [
-            SimulationStatus.NOT_STARTED,
-            SimulationStatus.SECOND_HALF_BREAK,
-        ]:
+        kick_off = MATCH_PHASES[self.state.status].kick_off
+        if kick_off == KickOff.STARTING_TEAM:
             self.starting_the_game.in_possession = True
             self.secondary_start.in_possession = False
             self.starting_the_game.player_in_possession = (
@@ -290,10 +280,7 @@ class SimulationEngine:
                     PitchPosition.MIDFIELD_CENTER
                 )
             )
-        elif self.state.status in [
-            SimulationStatus.FIRST_HALF_BREAK,
-            SimulationStatus.FIRST_HALF_EXTRA_TIME_BREAK,
-        ]:
+        elif kick_off == KickOff.SECONDARY_TEAM:
             self.starting_the_game.in_possession = False
             self.secondary_start.in_possession = True
             self.secondary_start.player_in_possession = (
@@ -305,15 +292,73 @@ class SimulationEngine:
         else:
             return self.away_team, self.home_team
 
-    def get_event_duration(self):
-        if self.event_history:
-            return timedelta(seconds=self.event_history[-1].duration)
+    def get_penalty_takers(self, team: TeamSimulation) -> list[PlayerSimulation]:
+        players = [player for player in team.formation.players if not player.sent_off]
+        players.sort(
+            key=lambda player: player.attributes.offensive.penalty, reverse=True
+        )
+        return players
+
+    def take_penalty(self, taker: PlayerSimulation, gk: PlayerSimulation) -> bool:
+        """
+        Same odds as a penalty kick in the game (see ShotEvent), without the rebounds.
+        """
+        shot_on_goal = (
+            taker.attributes.offensive.penalty * 2
+            + taker.attributes.offensive.shot_power
+            + taker.attributes.offensive.shot_accuracy
+        ) / 4
+        gk_skills = (
+            gk.attributes.gk.penalty * 2
+            + gk.attributes.gk.jumping
+            + gk.attributes.gk.positioning
+        ) / 4
+        if self.rng.random() * 100 >= shot_on_goal:
+            return False
+        return self.rng.random() * (230 - shot_on_goal) < 120 - gk_skills
+
+    def run_penalty_shootout(self):
+        """
+        Five penalties for each team, then sudden death until one team misses and the other scores.
+        """
+        teams = [self.starting_the_game, self.secondary_start]
+        takers = [self.get_penalty_takers(team) for team in teams]
+        kicks = [0, 0]
+        for team in teams:
+            team.penalty_shootout_score = 0
+
+        while True:
+            for i, team in enumerate(teams):
+                opponent = teams[1 - i]
+                taker = takers[i][kicks[i] % len(takers[i])]
+                kicks[i] += 1
+                if self.take_penalty(taker, opponent.formation.gk):
+                    team.penalty_shootout_score += 1
+
+                remaining = [max(5 - kick, 0) for kick in kicks]
+                first, second = (team.penalty_shootout_score for team in teams)
+                if kicks[0] <= 5 and (
+                    first + remaining[0] < second or second + remaining[1] < first
+                ):
+                    return
+            if kicks[1] >= 5 and first != second:
+                return
+
+    def get_event_duration(self) -> int:
+        """
+        Duration of the last event in whole seconds.
+        """
+        if self.last_event is not None:
+            return int(self.last_event.duration)
 
     def run(self):
         event = self.generate_event()
         attacking_team, defending_team = self.get_team_in_possession()
         self.state = event.calculate_event(attacking_team, defending_team)
         attacking_team.stats.possession += event.duration
+        if self.event_log is not None:
+            team = HOME_TEAM if attacking_team is self.home_team else AWAY_TEAM
+            self.event_log.add_event(event, team)
 
-        self.home_team.update_player_stamina(event.state.minutes.total_seconds())
-        self.away_team.update_player_stamina(event.state.minutes.total_seconds())
+        self.home_team.update_player_stamina(event.state.seconds)
+        self.away_team.update_player_stamina(event.state.seconds)
@@ -14,9 +14,11 @@
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from enum import Enum, auto
+from random import Random
 
 from . import OFF_POSITIONS, PitchPosition
 from .game_state import GameState
+from .sampling import get_cumulative_weights, weighted_choice
 from ..simulation.event_type import EventType
 
 
@@ -188,6 +190,16 @@ def team_general_strategy(
     Returns:
         [ Probability of passing, probability of crossing, probability of dribble, probability of foul, probability of shot ]
     """
+    return team_general_strategy_in_position(
+        attacking_team_strategy, def_team_strategy, state.position
+    )
+
+
+def team_general_strategy_in_position(
+    attacking_team_strategy: TeamStrategy,
+    def_team_strategy: TeamStrategy,
+    position: PitchPosition,
+) -> list[int]:
     foul_value = get_team_foul_values(def_team_strategy)
     probability = {
         EventType.PASS: 20,
@@ -206,22 +218,22 @@ def team_general_strategy(
                 EventType.SHOT: 0,
             }
 
-            if state.position in OFF_POSITIONS:
+            if position in OFF_POSITIONS:
                 probability[EventType.DRIBBLE] = 4
 
-            if state.position == PitchPosition.DEF_BOX:
+            if position == PitchPosition.DEF_BOX:
                 probability[EventType.FOUL] = 1
 
-            if state.position == PitchPosition.OFF_BOX:
+            if position == PitchPosition.OFF_BOX:
                 probability[EventType.SHOT] = 5
                 probability[EventType.FOUL] = 1
-            if state.position in [
+            if position in [
                 PitchPosition.OFF_LEFT,
                 PitchPosition.OFF_RIGHT,
             ]:
                 probability[EventType.SHOT] = 2
                 probability[EventType.CROSS] = 30
-            if state.position == PitchPosition.OFF_MIDFIELD_CENTER:
+            if position == PitchPosition.OFF_MIDFIELD_CENTER:
                 probability[EventType.SHOT] = 1
         case TeamStrategy.KEEP_POSSESSION:
             probability = {
@@ -232,22 +244,22 @@ def team_general_strategy(
                 EventType.SHOT: 0,
             }
 
-            if state.position in OFF_POSITIONS:
+            if position in OFF_POSITIONS:
                 probability[EventType.DRIBBLE] = 2
 
-            if state.position == PitchPosition.DEF_BOX:
+            if position == PitchPosition.DEF_BOX:
                 probability[EventType.FOUL] = 1
 
-            if state.position == PitchPosition.OFF_BOX:
+            if position == PitchPosition.OFF_BOX:
                 probability[EventType.SHOT] = 5
                 probability[EventType.FOUL] = 1
-            if state.position in [
+            if position in [
                 PitchPosition.OFF_LEFT,
                 PitchPosition.OFF_RIGHT,
             ]:
                 probability[EventType.SHOT] = 2
                 probability[EventType.CROSS] = 20
-            if state.position == PitchPosition.OFF_MIDFIELD_CENTER:
+            if position == PitchPosition.OFF_MIDFIELD_CENTER:
                 probability[EventType.SHOT] = 1
         case TeamStrategy.COUNTER_ATTACK:
             probability = {
@@ -258,22 +270,93 @@ def team_general_strategy(
                 EventType.SHOT: 0,
             }
 
-            if state.position in OFF_POSITIONS:
+            if position in OFF_POSITIONS:
                 probability[EventType.DRIBBLE] = 3
 
-            if state.position == PitchPosition.DEF_BOX:
+            if position == PitchPosition.DEF_BOX:
                 probability[EventType.FOUL] = 1
 
-            if state.position == PitchPosition.OFF_BOX:
+            if position == PitchPosition.OFF_BOX:
                 probability[EventType.SHOT] = 5
                 probability[EventType.FOUL] = 1
-            if state.position in [
+            if position in [
                 PitchPosition.OFF_LEFT,
                 PitchPosition.OFF_RIGHT,
             ]:
                 probability[EventType.SHOT] = 2
                 probability[EventType.CROSS] = 50
-            if state.position == PitchPosition.OFF_MIDFIELD_CENTER:
+            if position == PitchPosition.OFF_MIDFIELD_CENTER:
                 probability[EventType.SHOT] = 1
 
     return list(probability.values())
+
+
+# Compiled strategies. The transition matrices above are turned into cumulative weights only once,
+# so sampling the next event or the end position of a play doesn't allocate anything.
+PITCH_POSITIONS = tuple(PitchPosition)
+GENERAL_EVENT_TYPES = (
+    EventType.PASS,
+    EventType.CROSS,
+    EventType.DRIBBLE,
+    EventType.FOUL,
+    EventType.SHOT,
+)
+
+
+def _compile_transition_matrix(
+    transition_matrix: dict[PitchPosition, list[int]]
+) -> dict[PitchPosition, tuple[float, ...]]:
+    return {
+        position: get_cumulative_weights(probabilities)
+        for position, probabilities in transition_matrix.items()
+    }
+
+
+PASS_TABLES = {
+    strategy: _compile_transition_matrix(team_pass_strategy(strategy))
+    for strategy in TeamStrategy
+}
+CROSS_TABLES = {
+    strategy: _compile_transition_matrix(team_cross_strategy(strategy))
+    for strategy in TeamStrategy
+}
+CORNER_KICK_TABLES = {
+    strategy: get_cumulative_weights(team_corner_kick_strategy(strategy))
+    for strategy in TeamStrategy
+}
+GENERAL_TABLES = {
+    attacking_strategy: {
+        def_strategy: {
+            position: get_cumulative_weights(
+                team_general_strategy_in_position(
+                    attacking_strategy, def_strategy, position
+                )
+            )
+            for position in PitchPosition
+        }
+        for def_strategy in TeamStrategy
+    }
+    for attacking_strategy in TeamStrategy
+}
+
+
+def get_pass_end_position(
+    strategy: TeamStrategy, position: PitchPosition, rng: Random
+) -> PitchPosition:
+    return weighted_choice(rng, PITCH_POSITIONS, PASS_TABLES[strategy][position])
+
+
+def get_cross_end_position(
+    strategy: TeamStrategy, position: PitchPosition, rng: Random
+) -> PitchPosition:
+    return weighted_choice(rng, PITCH_POSITIONS, CROSS_TABLES[strategy][position])
+
+
+def get_event_type(
+    attacking_team_strategy: TeamStrategy,
+    def_team_strategy: TeamStrategy,
+    position: PitchPosition,
+    rng: Random,
+) -> EventType:
+    cum_weights = GENERAL_TABLES[attacking_team_strategy][def_team_strategy][position]
+    return weighted_choice(rng, GENERAL_EVENT_TYPES, cum_weights)
@@ -16,11 +16,12 @@
 import datetime
 import json
 import uuid
+from copy import deepcopy
 
 import pytest
 
 from ..core.db.generators import PlayerGenerator, TeamGenerator
-from ..core.football.club import PlayerTeam
+from ..core.football.club import Club, PlayerTeam
 from ..core.football.formation import Formation
 from ..core.football.player import Player, PlayerInjury, PlayerSimulation, PreferredFoot
 from ..core.football.player_attributes import *
@@ -200,3 +201,18 @@ def simulation_teams(
     away_team_sim = TeamSimulation(away_team, away_team_formation)
 
     return home_team_sim, away_team_sim
+
+
+@pytest.fixture
+def competition_clubs(squads_def, confederations_file) -> list[Club]:
+    reserve_clubs = [
+        deepcopy(club_def) | {"name": f"{club_def['name']} II"}
+        for club_def in squads_def
+    ]
+    team_gen = TeamGenerator(
+        deepcopy(squads_def) + reserve_clubs,
+        confederations_file,
+        datetime.date(2024, 1, 1),
+        seed=1,
+    )
+    return team_gen.generate(1)
@@ -0,0 +1,140 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+
+from ofm.core.football.team_simulation import GameEventType
+from ofm.core.simulation.batch import MatchResult, simulate_match, simulate_matches
+from ofm.core.simulation.fixture import Fixture
+
+
+def get_matches(simulation_teams, amount: int):
+    home_team, away_team = simulation_teams
+    return [
+        (
+            Fixture(
+                uuid.uuid4(),
+                uuid.uuid4(),
+                home_team.club.club_id,
+                away_team.club.club_id,
+                home_team.club.stadium,
+            ),
+            deepcopy(home_team),
+            deepcopy(away_team),
+        )
+        for _ in range(amount)
+    ]
+
+
+def test_simulate_match(simulation_teams):
+    fixture, home_team, away_team = get_matches(simulation_teams, 1)[0]
+    result = simulate_match(fixture, home_team, away_team)
+    assert isinstance(result, MatchResult)
+    assert result.fixture_id == fixture.fixture_id
+    assert result.home_score == home_team.score
+    assert result.away_score == away_team.score
+    assert result.home_stats.club_id == home_team.club.club_id
+    assert result.away_stats.club_id == away_team.club.club_id
+
+
+def test_match_result_events_match_score(simulation_teams):
+    fixture, home_team, away_team = get_matches(simulation_teams, 1)[0]
+    result = simulate_match(fixture, home_team, away_team)
+    goals = [
+        event
+        for event in result.events
+        if event.event_type in [GameEventType.GOAL, GameEventType.PENALTY_GOAL]
+    ]
+    home_goals = [event for event in goals if event.club_id == result.home_club_id]
+    assert len(goals) == result.home_score + result.away_score
+    assert len(home_goals) == result.home_score
+    assert all(isinstance(event.player_id, uuid.UUID) for event in result.events)
+
+
+def test_simulate_matches_in_process_pool(simulation_teams):
+    matches = get_matches(simulation_teams, 4)
+    results = simulate_matches(matches, max_workers=2)
+    assert [result.fixture_id for result in results] == [
+        fixture.fixture_id for fixture, _, _ in matches
+    ]
+    for (_, home_team, away_team), result in zip(matches, results):
+        # Teams are simulated on the worker's copy
+        assert home_team.score == 0
+        assert away_team.score == 0
+        assert result.home_stats.passes > 0
+        assert result.away_stats.passes > 0
+
+
+def test_simulate_no_matches():
+    assert simulate_matches([]) == []
+
+
+def test_simulate_matches_is_reproducible(simulation_teams):
+    matches = get_matches(simulation_teams, 4)
+    pool_results = simulate_matches(deepcopy(matches), max_workers=2)
+    local_results = simulate_matches(deepcopy(matches), max_workers=1)
+    assert pool_results == local_results
+
+
+def test_pool_matches_do_not_share_teams(simulation_teams):
+    # Every match uses the same teams, and each chunk holds many matches
+    home_team, away_team = simulation_teams
+    matches = [
+        (match[0], home_team, away_team) for match in get_matches(simulation_teams, 8)
+    ]
+    pool_results = simulate_matches(matches, max_workers=2, chunksize=4)
+    local_results = simulate_matches(matches, max_workers=1)
+    assert pool_results == local_results
+    assert home_team.score == away_team.score == 0
+
+
+def test_simulate_matches_in_process_does_not_modify_teams(simulation_teams):
+    matches = get_matches(simulation_teams, 2)
+    stamina = [
+        player.details.stamina
+        for _, home_team, _ in matches
+        for player in home_team.club.squad
+    ]
+    results = simulate_matches(matches, max_workers=1)
+    for (_, home_team, away_team), result in zip(matches, results):
+        assert home_team.score == 0
+        assert away_team.score == 0
+        assert home_team.stats.passes == 0
+        assert result.home_stats.passes > 0
+    assert [
+        player.details.stamina
+        for _, home_team, _ in matches
+        for player in home_team.club.squad
+    ] == stamina
+
+
+class CountingExecutor(ProcessPoolExecutor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = 0
+
+    def map(self, *args, **kwargs):
+        self.batches += 1
+        return super().map(*args, **kwargs)
+
+
+def test_simulate_matches_uses_given_executor(simulation_teams):
+    matches = get_matches(simulation_teams, 2)
+    with CountingExecutor(max_workers=1) as executor:
+        results = simulate_matches(matches, max_workers=1, executor=executor)
+    assert executor.batches == 1
+    assert len(results) == 2
@@ -0,0 +1,100 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import uuid
+
+import pytest
+
+from ..core.football.cup import Cup, get_bracket_order, play_cups
+
+
+def test_bracket_order():
+    assert get_bracket_order(1) == [0]
+    assert get_bracket_order(2) == [0, 1]
+    assert get_bracket_order(8) == [0, 7, 3, 4, 1, 6, 2, 5]
+    assert sorted(get_bracket_order(128)) == list(range(128))
+
+
+def test_generate_bracket_with_byes():
+    club_ids = [uuid.UUID(int=i) for i in range(5)]
+    bracket = Cup.generate_bracket(club_ids)
+
+    assert [len(slots) for slots in bracket] == [8, 4, 2, 1]
+    assert bracket[0] == [
+        club_ids[0],
+        None,
+        club_ids[3],
+        club_ids[4],
+        club_ids[1],
+        None,
+        club_ids[2],
+        None,
+    ]
+    # The best seeds go straight to the second round
+    assert bracket[1] == [club_ids[0], None, club_ids[1], club_ids[2]]
+
+
+def test_play_cup(competition_clubs):
+    cup = Cup(uuid.uuid4(), "Cup", competition_clubs[:3], extra_time=False, seed=1)
+    assert cup.num_rounds == 2
+    assert len(cup.get_round_fixtures()) == 1
+    # Fixtures of a round are only created once
+    assert cup.get_round_fixtures() is cup.get_round_fixtures()
+
+    winner = cup.play(max_workers=1)
+    assert cup.is_finished
+    assert winner == cup.winner
+    assert winner in cup.clubs
+    assert [len(results) for results in cup.results] == [1, 1]
+    for results, next_slots in zip(cup.results, cup.bracket[1:]):
+        for result in results:
+            assert result.winner is not None
+            assert result.winner in next_slots
+            if result.is_draw:
+                assert (
+                    result.home_penalty_shootout_score
+                    != result.away_penalty_shootout_score
+                )
+    assert cup.results[-1][0].winner == winner
+
+    with pytest.raises(ValueError):
+        cup.play_round(max_workers=1)
+
+
+def test_play_cups_is_reproducible(competition_clubs):
+    def get_cups() -> list[Cup]:
+        return [
+            Cup(uuid.UUID(int=1), "Cup", competition_clubs, seed=1),
+            Cup(uuid.UUID(int=2), "Cup", competition_clubs[::-1], False, seed=2),
+        ]
+
+    def get_clubs_state():
+        return [
+            (player.details.serialize(), player.serialize())
+            for club in competition_clubs
+            for player in club.squad
+        ]
+
+    state = get_clubs_state()
+    cups = get_cups()
+    play_cups(cups, max_workers=2)
+    assert all(cup.is_finished for cup in cups)
+    assert get_clubs_state() == state
+
+    for cup, other_cup in zip(cups, get_cups()):
+        other_cup.play(max_workers=1)
+        assert other_cup.bracket == cup.bracket
+        assert other_cup.results == cup.results
+    assert get_clubs_state() == state
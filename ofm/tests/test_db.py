@@ -13,14 +13,26 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import io
 import json
+import os
 import uuid
 from unittest.mock import Mock
 
 import pytest
 
+from ofm.core.db import generators
 from ofm.core.db.database import DB, DatabaseLoadError, PlayerTeamLoadError
-from ofm.core.db.generators import PlayerGenerator
+from ofm.core.db.generators import PlayerGenerator, get_names_index
+from ofm.core.db.json_stream import (
+    JSONArrayWriter,
+    iter_json_array,
+    iter_json_file,
+    write_json_file,
+)
+from ofm.core.db.repository import ClubRepository
+from ofm.core.db.snapshot import SnapshotError
+from ofm.core.db.sqlite_database import SQLiteDB
 from ofm.core.settings import Settings
 
 
@@ -93,3 +105,377 @@ def test_generate_and_load_clubs_and_players(db: DB, squads_def):
     clubs_obj = db.load_club_objects(clubs_dict, players_dict)
     assert [club.serialize() for club in clubs_obj] == clubs_dict
     assert [player.serialize() for player in players_obj] == players_dict
+
+
+def test_load_club_objects_reads_squads_file_once(db: DB, squads_def, monkeypatch):
+    db.generate_teams_and_squads(squads_def)
+    clubs_dict = db.load_clubs()
+    players_dict = db.load_players()
+    squads_dict = db.load_squads_file()
+
+    load_squads_file = Mock(return_value=squads_dict)
+    monkeypatch.setattr(db, "load_squads_file", load_squads_file)
+    clubs_obj = db.load_club_objects(clubs_dict, players_dict)
+    load_squads_file.assert_called_once()
+
+    clubs_obj_with_squads = db.load_club_objects(clubs_dict, players_dict, squads_dict)
+    load_squads_file.assert_called_once()
+    assert [club.serialize() for club in clubs_obj] == clubs_dict
+    assert [club.serialize() for club in clubs_obj_with_squads] == clubs_dict
+    assert [[player.serialize() for player in club.squad] for club in clubs_obj] == [
+        db.load_club_squads(club["id"], squads_dict) for club in clubs_dict
+    ]
+
+
+def test_names_file_is_parsed_once(db: DB, squads_def, monkeypatch):
+    iter_json_file = Mock(wraps=generators.iter_json_file)
+    monkeypatch.setattr(generators, "iter_json_file", iter_json_file)
+    get_names_index.cache_clear()
+    try:
+        db.generate_teams_and_squads(squads_def)
+        db.generate_players()
+    finally:
+        get_names_index.cache_clear()
+    iter_json_file.assert_called_once_with(generators.NAMES_FILE)
+
+
+def test_generate_name_from_region():
+    player_gen = PlayerGenerator()
+    names = get_names_index()["BRA"]
+    for _ in range(20):
+        first_name, last_name, _ = player_gen.generate_name("BRA")
+        assert first_name in names.male
+        assert last_name in names.surnames
+
+
+@pytest.fixture
+def sqlite_db(db: DB) -> SQLiteDB:
+    with SQLiteDB(db.settings) as sqlite_db:
+        yield sqlite_db
+
+
+def test_sqlite_generate_and_load_clubs_and_players(sqlite_db: SQLiteDB, squads_def):
+    sqlite_db.generate_teams_and_squads(squads_def)
+    clubs_dict = sqlite_db.load_clubs()
+    players_dict = sqlite_db.load_players()
+    clubs_obj = sqlite_db.load_club_objects(clubs_dict, players_dict)
+
+    assert len(clubs_dict) == len(squads_def)
+    assert [club.serialize() for club in clubs_obj] == clubs_dict
+    players = {player["id"]: player for player in players_dict}
+    for club in clubs_obj:
+        for player in club.squad:
+            assert player.details.serialize() == players[player.details.player_id.int]
+
+
+def test_sqlite_load_single_club(sqlite_db: SQLiteDB, squads_def):
+    sqlite_db.generate_teams_and_squads(squads_def)
+    clubs_obj = sqlite_db.load_club_objects(
+        sqlite_db.load_clubs(), sqlite_db.load_players()
+    )
+
+    for club in clubs_obj:
+        loaded_club = sqlite_db.load_club(club.club_id)
+        assert loaded_club.serialize() == club.serialize()
+        assert [player.serialize() for player in loaded_club.squad] == [
+            player.serialize() for player in club.squad
+        ]
+
+    with pytest.raises(DatabaseLoadError):
+        sqlite_db.load_club(uuid.uuid4())
+
+
+def test_sqlite_save_only_changed_players(sqlite_db: SQLiteDB, squads_def):
+    sqlite_db.generate_teams_and_squads(squads_def)
+    club = sqlite_db.load_club(uuid.UUID(int=sqlite_db.load_clubs()[0]["id"]))
+    player = club.squad[0].details
+    player.stamina = 12.5
+
+    changes = sqlite_db.connection.total_changes
+    sqlite_db.save_players([player])
+    # The player's row and the database generation
+    assert sqlite_db.connection.total_changes - changes == 2
+    assert sqlite_db.load_player(player.player_id).stamina == 12.5
+
+
+@pytest.mark.parametrize("backend", [DB, SQLiteDB])
+def test_regenerate_into_populated_database(db: DB, squads_def, backend):
+    database = backend(db.settings)
+    database.generate_teams_and_squads(squads_def)
+    old_player_ids = {player["id"] for player in database.load_players()}
+
+    database.generate_teams_and_squads(squads_def[:1])
+    clubs_dict = database.load_clubs()
+    players_dict = database.load_players()
+    squads_dict = database.load_squads_file()
+    assert len(clubs_dict) == 1
+    squad_ids = clubs_dict[0]["squad"]
+    assert sorted(player["id"] for player in players_dict) == sorted(squad_ids)
+    assert sorted(player["player_id"] for player in squads_dict) == sorted(squad_ids)
+    assert not old_player_ids & set(squad_ids)
+
+
+def test_sqlite_failed_save_clubs_keeps_world(sqlite_db: SQLiteDB, squads_def):
+    sqlite_db.generate_teams_and_squads(squads_def)
+    clubs_dict = sqlite_db.load_clubs()
+    players_dict = sqlite_db.load_players()
+    club = sqlite_db.load_club(uuid.UUID(int=clubs_dict[0]["id"]))
+
+    def failing_clubs():
+        yield club
+        raise RuntimeError("Generation failed")
+
+    with pytest.raises(RuntimeError):
+        sqlite_db.save_clubs(failing_clubs())
+    assert sqlite_db.load_clubs() == clubs_dict
+    assert sqlite_db.load_players() == players_dict
+
+
+@pytest.mark.parametrize("backend", [DB, SQLiteDB])
+def test_club_repository_loads_squads_on_demand(db: DB, squads_def, backend):
+    database = backend(db.settings)
+    database.generate_teams_and_squads(squads_def)
+    clubs_dict = database.load_clubs()
+
+    repository = ClubRepository(database, max_clubs=1)
+    assert len(repository) == len(clubs_dict)
+    assert repository.loaded_clubs == []
+
+    club_id = uuid.UUID(int=clubs_dict[0]["id"])
+    club = repository.get_club(club_id)
+    assert club.serialize() == clubs_dict[0]
+    assert repository.get_club(club_id) is club
+    assert repository.loaded_clubs == [club_id]
+
+    player = club.squad[3]
+    assert repository.get_player(player.details.player_id) is player
+
+    # Least recently used club is dropped
+    other_club_id = uuid.UUID(int=clubs_dict[1]["id"])
+    repository.get_club(other_club_id)
+    assert repository.loaded_clubs == [other_club_id]
+    assert repository.get_club(club_id) is not club
+
+    with pytest.raises(DatabaseLoadError):
+        repository.get_club(uuid.uuid4())
+
+
+@pytest.mark.parametrize("backend", [DB, SQLiteDB])
+def test_club_repository_saves_only_changed_players(
+    db: DB, squads_def, backend, monkeypatch
+):
+    database = backend(db.settings)
+    database.generate_teams_and_squads(squads_def)
+    clubs_dict = database.load_clubs()
+    club_id, other_club_id = (uuid.UUID(int=club["id"]) for club in clubs_dict[:2])
+
+    repository = ClubRepository(database, max_clubs=1)
+    club = repository.get_club(club_id)
+    tired_player, new_contract_player = club.squad[0], club.squad[1]
+    tired_player.details.stamina = 12.5
+    new_contract_player.contract.wage = 1234.0
+
+    # A club with unsaved changes is not dropped
+    repository.get_club(other_club_id)
+    assert repository.get_club(club_id) is club
+    assert repository.get_changed_players() == [tired_player, new_contract_player]
+
+    save_players = Mock(wraps=database.save_players)
+    save_contracts = Mock(wraps=database.save_contracts)
+    monkeypatch.setattr(database, "save_players", save_players)
+    monkeypatch.setattr(database, "save_contracts", save_contracts)
+    assert repository.save() == 2
+    assert save_players.call_args.args[0] == [tired_player.details]
+    assert save_contracts.call_args.args[0] == [new_contract_player]
+    assert repository.get_changed_players() == []
+    assert repository.save() == 0
+
+    # Reloaded clubs get the saved changes
+    repository.get_club(other_club_id)
+    reloaded_club = repository.get_club(club_id)
+    assert reloaded_club is not club
+    assert reloaded_club.squad[0].details.stamina == 12.5
+    assert reloaded_club.squad[1].contract.wage == 1234.0
+
+    new_repository = ClubRepository(database)
+    new_club = new_repository.get_club(club_id)
+    assert [player.serialize() for player in new_club.squad] == [
+        player.serialize() for player in club.squad
+    ]
+    assert [player.details.serialize() for player in new_club.squad] == [
+        player.details.serialize() for player in club.squad
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_iter_json_array(chunk_size):
+    data = [
+        {"id": uuid.uuid4().int, "name": 'Club "A" [1], {2}', "values": [1, -2.5e10]},
+        12345678901234567890,
+        -0.125,
+        [],
+        {},
+        None,
+        True,
+        "",
+    ]
+    for text in (json.dumps(data), json.dumps(data, indent=4), "[]", " [ ] "):
+        expected = json.loads(text)
+        assert list(iter_json_array(io.StringIO(text), chunk_size)) == expected
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1, 2", "[1 2]", "[1,]"])
+def test_iter_json_array_invalid(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), 2))
+
+
+def test_json_array_writer(tmp_path):
+    data = [{"id": uuid.uuid4().int, "name": "Club"}, -0.125, [], None, "", True]
+    stream = io.StringIO()
+    with JSONArrayWriter(stream) as writer:
+        writer.write_all(data)
+    assert stream.getvalue() == json.dumps(data)
+
+    path = str(tmp_path / "data.json")
+    assert write_json_file(path, data) == len(data)
+    # Elements can be read from the file that is replaced
+    assert write_json_file(path, iter_json_file(path)) == len(data)
+    assert list(iter_json_file(path)) == data
+
+
+def test_failed_save_clubs_keeps_database_files(db: DB, squads_def):
+    db.generate_teams_and_squads(squads_def)
+    files = (db.clubs_file, db.players_file, db.squads_file, db.snapshot_file)
+    contents = []
+    for file in files:
+        with open(file, "rb") as fp:
+            contents.append(fp.read())
+
+    def failing_clubs():
+        yield from db.load_club_objects(db.load_clubs(), db.load_players())[:1]
+        raise RuntimeError("Generation failed")
+
+    with pytest.raises(RuntimeError):
+        db.save_clubs(failing_clubs())
+
+    for file, content in zip(files, contents):
+        with open(file, "rb") as fp:
+            assert fp.read() == content
+        assert not os.path.exists(f"{file}.tmp")
+
+    stream = io.StringIO()
+    with pytest.raises(RuntimeError):
+        with JSONArrayWriter(stream) as writer:
+            writer.write(1)
+            raise RuntimeError
+    # The array is not closed, so it can't be loaded as a complete file
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(stream.getvalue())
+
+
+def test_iter_players(db: DB):
+    expected_players = db.generate_players(50)
+    assert list(db.iter_players()) == expected_players
+    assert db.load_player_objects(db.iter_players()) == db.load_player_objects(
+        expected_players
+    )
+
+
+def test_sample_club_definitions(db: DB, squads_def):
+    with open(db.clubs_def_file, "w", encoding="utf-8") as fp:
+        json.dump(squads_def * 5, fp)
+
+    sample = db.sample_club_definitions(3)
+    assert len(sample) == 3
+    assert all(club_def in squads_def for club_def in sample)
+    assert len(db.sample_club_definitions(100)) == len(squads_def) * 5
+
+
+def get_squads_dicts(clubs: list) -> list[list[dict]]:
+    return [[player.serialize() for player in club.squad] for club in clubs]
+
+
+def test_snapshot_has_same_clubs_and_players(db: DB, squads_def):
+    db.generate_teams_and_squads(squads_def)
+    clubs = db.load_club_objects(db.load_clubs(), db.load_players())
+    extra_player = PlayerGenerator().generate_player()
+    db.save_snapshot(clubs, [extra_player])
+
+    with db.open_snapshot() as snapshot:
+        assert snapshot.num_clubs == len(clubs)
+        assert snapshot.num_players == sum(len(club.squad) for club in clubs) + 1
+        assert snapshot.get_player(0) == extra_player
+
+        snapshot_clubs = snapshot.load_clubs()
+        assert [club.serialize() for club in snapshot_clubs] == [
+            club.serialize() for club in clubs
+        ]
+        assert get_squads_dicts(snapshot_clubs) == get_squads_dicts(clubs)
+        assert [
+            player.details.serialize()
+            for club in snapshot_clubs
+            for player in club.squad
+        ] == [player.details.serialize() for club in clubs for player in club.squad]
+
+        # Players are decoded once and shared with the squads
+        club = snapshot.get_club_by_id(clubs[1].club_id)
+        player = club.squad[0].details
+        assert snapshot.get_player_by_id(player.player_id) is player
+        with pytest.raises(SnapshotError):
+            snapshot.get_player_by_id(uuid.uuid4())
+
+
+def test_snapshot_version_is_checked(db: DB, squads_def):
+    db.generate_teams_and_squads(squads_def)
+    with open(db.snapshot_file, "r+b") as fp:
+        fp.seek(4)
+        fp.write(b"\xff\xff")
+
+    with pytest.raises(SnapshotError):
+        db.open_snapshot()
+
+
+def test_load_all_club_objects_uses_current_snapshot(db: DB, squads_def, monkeypatch):
+    db.generate_teams_and_squads(squads_def)
+    clubs_dict = db.load_clubs()
+    assert db.is_snapshot_current()
+
+    load_players = Mock(side_effect=db.load_players)
+    monkeypatch.setattr(db, "load_players", load_players)
+    clubs = db.load_all_club_objects()
+    load_players.assert_not_called()
+    assert [club.serialize() for club in clubs] == clubs_dict
+
+    # Changing the JSON files makes the snapshot outdated, it is written again
+    os.utime(db.snapshot_file, (os.path.getmtime(db.players_file) - 10,) * 2)
+    assert not db.is_snapshot_current()
+    clubs = db.load_all_club_objects()
+    load_players.assert_called_once()
+    assert [club.serialize() for club in clubs] == clubs_dict
+    assert db.is_snapshot_current()
+
+
+def test_sqlite_snapshot_is_outdated_after_saving(sqlite_db: SQLiteDB, squads_def):
+    sqlite_db.generate_teams_and_squads(squads_def)
+    clubs = sqlite_db.load_all_club_objects()
+    assert sqlite_db.is_snapshot_current()
+
+    player = clubs[0].squad[0].details
+    player.stamina = 12.5
+    sqlite_db.save_players([player])
+    assert not sqlite_db.is_snapshot_current()
+    assert sqlite_db.load_all_club_objects()[0].squad[0].details.stamina == 12.5
+    assert sqlite_db.is_snapshot_current()
+
+    contract = clubs[0].squad[1]
+    contract.contract.wage = 1234.0
+    sqlite_db.save_contracts([contract])
+    assert not sqlite_db.is_snapshot_current()
+    assert sqlite_db.load_all_club_objects()[0].squad[1].contract.wage == 1234.0
+
+
+def test_sqlite_ignores_snapshot_of_json_files(db: DB, sqlite_db: SQLiteDB, squads_def):
+    db.generate_teams_and_squads(squads_def)
+    assert db.is_snapshot_current()
+    assert not sqlite_db.is_snapshot_current()
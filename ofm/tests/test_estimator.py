@@ -0,0 +1,105 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import statistics
+import uuid
+from collections import Counter
+
+from ofm.core.football.team_simulation import get_team_simulation
+from ofm.core.simulation.batch import simulate_matches
+from ofm.core.simulation.estimator import MatchOutcomeEstimator
+from ofm.core.simulation.fixture import Fixture
+
+
+def get_scalar_results(simulation_teams, amount: int) -> list[tuple[int, int]]:
+    home_team, away_team = simulation_teams
+    matches = [
+        (
+            Fixture(
+                uuid.UUID(int=i + 1),
+                uuid.uuid4(),
+                home_team.club.club_id,
+                away_team.club.club_id,
+                home_team.club.stadium,
+            ),
+            home_team,
+            away_team,
+        )
+        for i in range(amount)
+    ]
+    # Each match is simulated on its own copy of the teams
+    return [
+        (result.home_score, result.away_score) for result in simulate_matches(matches)
+    ]
+
+
+def test_estimate_histograms_are_consistent(simulation_teams):
+    estimator = MatchOutcomeEstimator(*simulation_teams, seed=1)
+    estimate = estimator.estimate(200)
+    assert estimate.home_wins + estimate.draws + estimate.away_wins == 200
+    assert sum(estimate.scores.values()) == 200
+    assert sum(estimate.home_goals.values()) == 200
+    assert estimate.home_wins == sum(
+        n for (home, away), n in estimate.scores.items() if home > away
+    )
+    assert (
+        estimate.expected_home_goals
+        == sum(home * n for (home, _), n in estimate.scores.items()) / 200
+    )
+
+
+def test_estimate_is_reproducible(simulation_teams):
+    home_team, away_team = simulation_teams
+    first = MatchOutcomeEstimator(home_team, away_team, seed=42).estimate(100)
+    second = MatchOutcomeEstimator(home_team, away_team, seed=42).estimate(100)
+    assert first == second
+
+
+def test_estimate_matches_simulation_engine(competition_clubs):
+    home_team = get_team_simulation(competition_clubs[0])
+    away_team = get_team_simulation(competition_clubs[1])
+    scalar_results = get_scalar_results((home_team, away_team), 200)
+    estimate = MatchOutcomeEstimator(home_team, away_team, seed=1).estimate(5000)
+
+    # Pearson's chi-squared test of the engine's wins, draws and losses against the
+    # estimated probabilities, which are much more precise than the engine samples.
+    # 13.82 is the critical value for 2 degrees of freedom at p = 0.001.
+    observed = Counter((home > away) - (home < away) for home, away in scalar_results)
+    expected = {
+        1: estimate.home_win_probability,
+        0: estimate.draw_probability,
+        -1: estimate.away_win_probability,
+    }
+    n = len(scalar_results)
+    chi_squared = sum(
+        (observed[outcome] - n * probability) ** 2 / (n * probability)
+        for outcome, probability in expected.items()
+    )
+    assert chi_squared < 13.82
+
+    # The estimator must agree with the engine on the goals within 4 standard errors
+    for get_value in (lambda h, a: h + a, lambda h, a: h - a):
+        scalar_values = [get_value(home, away) for home, away in scalar_results]
+        estimated_values = [
+            get_value(home, away)
+            for (home, away), count in estimate.scores.items()
+            for _ in range(count)
+        ]
+        standard_error = (
+            statistics.variance(scalar_values) / len(scalar_values)
+            + statistics.variance(estimated_values) / len(estimated_values)
+        ) ** 0.5
+        difference = statistics.mean(scalar_values) - statistics.mean(estimated_values)
+        assert abs(difference) < 4 * standard_error
@@ -0,0 +1,142 @@
+#      Openfoot Manager - A free and open source soccer management simulation
+#      Copyright (C) 2020-2024  Pedrenrique G. Guimarães
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import uuid
+from collections import Counter
+from copy import deepcopy
+
+import pytest
+
+from ..core.football.league import League, get_round_robin_rounds
+
+
+@pytest.mark.parametrize("num_clubs", [2, 5, 6, 20])
+def test_round_robin_rounds(num_clubs):
+    club_ids = [uuid.UUID(int=i) for i in range(num_clubs)]
+    rounds = get_round_robin_rounds(club_ids)
+
+    assert len(rounds) == num_clubs - 1 + num_clubs % 2
+    pairs = [pair for pairs in rounds for pair in pairs]
+    assert len({frozenset(pair) for pair in pairs}) == len(pairs)
+    assert len(pairs) == num_clubs * (num_clubs - 1) // 2
+    for pairs in rounds:
+        clubs = [club_id for pair in pairs for club_id in pair]
+        assert len(clubs) == len(set(clubs)) == num_clubs - num_clubs % 2
+
+    home_games = Counter(home for home, _ in pairs)
+    assert max(home_games.values()) - min(home_games.values()) <= 1
+
+
+@pytest.mark.parametrize("num_clubs", [3, 4, 6, 20])
+def test_league_schedule_has_no_long_home_or_away_runs(num_clubs, competition_clubs):
+    clubs = [
+        deepcopy(competition_clubs[i % len(competition_clubs)])
+        for i in range(num_clubs)
+    ]
+    for i, club in enumerate(clubs):
+        club.club_id = uuid.UUID(int=i + 1)
+    league = League(uuid.uuid4(), "League", clubs)
+
+    for club in clubs:
+        venues = "".join(
+            "H" if fixture.home_team == club.club_id else "A"
+            for fixtures in league.matchdays
+            for fixture in fixtures
+            if club.club_id in (fixture.home_team, fixture.away_team)
+        )
+        assert len(venues) == 2 * (num_clubs - 1)
+        assert "HHH" not in venues and "AAA" not in venues
+
+
+def test_league_schedule(competition_clubs):
+    league = League(uuid.uuid4(), "League", competition_clubs, seed=1)
+
+    assert len(league.matchdays) == 6
+    assert all(len(fixtures) == 2 for fixtures in league.matchdays)
+    fixtures = [fixture for fixtures in league.matchdays for fixture in fixtures]
+    assert len({(f.home_team, f.away_team) for f in fixtures}) == len(fixtures)
+    for fixture in fixtures:
+        assert fixture.championship_id == league.league_id
+        assert fixture.stadium == league.clubs[fixture.home_team].stadium
+
+    other_league = League(league.league_id, "League", competition_clubs, seed=1)
+    assert [f.fixture_id for fixtures in other_league.matchdays for f in fixtures] == [
+        f.fixture_id for f in fixtures
+    ]
+
+
+def test_play_league_season(competition_clubs):
+    league = League(uuid.uuid4(), "League", competition_clubs, seed=1)
+    results = league.play_season(max_workers=1)
+
+    assert league.is_finished
+    assert len(results) == len(league.results) == 12
+    with pytest.raises(ValueError):
+        league.play_matchday(max_workers=1)
+
+    standings = league.get_standings()
+    assert [entry.points for entry in standings] == sorted(
+        (entry.points for entry in standings), reverse=True
+    )
+    for entry in standings:
+        club_results = [
+            result
+            for result in results
+            if entry.club_id in (result.home_club_id, result.away_club_id)
+        ]
+        goals_for = sum(
+            result.home_score
+            if result.home_club_id == entry.club_id
+            else result.away_score
+            for result in club_results
+        )
+        wins = sum(result.winner == entry.club_id for result in club_results)
+        draws = sum(result.is_draw for result in club_results)
+        assert entry.played == len(club_results) == 6
+        assert entry.goals_for == goals_for
+        assert (entry.wins, entry.draws) == (wins, draws)
+        assert entry.points == 3 * wins + draws
+    assert sum(entry.goals_for for entry in standings) == sum(
+        entry.goals_against for entry in standings
+    )
+
+
+def test_league_matchday_is_reproducible(competition_clubs):
+    league = League(uuid.uuid4(), "League", competition_clubs, seed=1)
+    results = league.play_matchday(max_workers=2)
+    assert all(entry.played == 1 for entry in league.table.values())
+
+    other_league = League(league.league_id, "League", competition_clubs, seed=1)
+    assert other_league.play_matchday(max_workers=1) == results
+
+
+def test_league_does_not_change_clubs(competition_clubs):
+    def get_clubs_state(clubs):
+        return [
+            (player.details.serialize(), player.serialize())
+            for club in clubs
+            for player in club.squad
+        ]
+
+    state = get_clubs_state(competition_clubs)
+    results = {}
+    for max_workers in (1, 2):
+        clubs = deepcopy(competition_clubs)
+        league = League(uuid.UUID(int=1), "League", clubs, seed=1)
+        results[max_workers] = league.play_matchday(max_workers=max_workers)
+        results[max_workers] += league.play_matchday(max_workers=max_workers)
+        assert get_clubs_state(clubs) == state
+
+    assert results[1] == results[2]
@@ -13,8 +13,21 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
-from ..core.db.generators import PlayerGenerator
+import random
+from datetime import date
+from uuid import UUID
+
+import pytest
+
+from ..core.db.generators import GeneratePlayerError, PlayerGenerator
+from ..core.football.attribute_store import (
+    ROW_SIZE,
+    AttributeStore,
+    StoredPlayerAttributes,
+)
 from ..core.football.player import Player, PlayerTeam, get_player_from_player_id
+from ..core.football.player_attributes import OffensiveAttributes
+from ..core.football.positions import Positions
 
 
 def test_get_from_dictionary(player_dict, player_obj):
@@ -83,3 +96,165 @@ def test_serialized_player_has_no_none(player_gen: PlayerGenerator):
         player_dict = player.serialize()
         for key in player_dict.keys():
             assert player_dict[key] is not None
+
+
+def test_player_attributes_overall(player_attributes):
+    # Groups: offensive 83, physical 65, defensive 56, intelligence 79, gk 15
+    assert player_attributes.offensive.get_overall() == 83
+    assert player_attributes.gk.get_overall() == 15
+    assert player_attributes.get_overall(Positions.GK) == int(
+        (15 * 3 + 56 * 2 + 65 + 79) / 7
+    )
+    assert player_attributes.get_overall(Positions.FW) == int(
+        (56 + 65 + 79 * 2 + 83 * 3) / 7
+    )
+
+
+def test_player_attributes_overall_is_invalidated(player_attributes):
+    fw_overall = player_attributes.get_overall(Positions.FW)
+    gk_overall = player_attributes.get_overall(Positions.GK)
+
+    player_attributes.offensive.shot_power += 15
+    assert player_attributes.offensive.get_overall() == 86
+    assert player_attributes.get_overall(Positions.FW) == fw_overall + 1
+    assert player_attributes.get_overall(Positions.GK) == gk_overall
+
+    player_attributes.offensive = OffensiveAttributes(99, 99, 99, 99, 99)
+    assert player_attributes.get_overall(Positions.FW) == int(
+        (56 + 65 + 79 * 2 + 99 * 3) / 7
+    )
+    player_attributes.offensive.penalty = 49
+    assert player_attributes.offensive.get_overall() == 89
+
+
+def test_player_attributes_serialize(player_attributes):
+    player_attributes.get_overall(Positions.MF)
+    assert player_attributes.serialize()["offensive"] == {
+        "shot_power": 85,
+        "shot_accuracy": 80,
+        "free_kick": 75,
+        "penalty": 88,
+        "positioning": 90,
+    }
+
+
+def test_attribute_store_views(player_gen: PlayerGenerator):
+    players = [player_gen.generate_player() for _ in range(20)]
+    attributes = [player.attributes for player in players]
+    store = AttributeStore()
+    store.add_players(players)
+
+    assert len(store) == 20
+    assert store.nbytes == 20 * ROW_SIZE
+    for player, expected in zip(players, attributes):
+        assert isinstance(player.attributes, StoredPlayerAttributes)
+        assert player.attributes == expected
+        assert player.attributes.serialize() == expected.serialize()
+        for position in Positions:
+            assert player.attributes.get_overall(position) == expected.get_overall(
+                position
+            )
+
+    for position in Positions:
+        assert list(store.get_overalls(position)) == [
+            attrs.get_overall(position) for attrs in attributes
+        ]
+
+    player = players[0]
+    player.attributes.offensive.shot_power = 12
+    assert store.get_row(player.player_id)[0] == 12
+    assert store.get_attributes(player.player_id).offensive.shot_power == 12
+
+
+def test_attribute_store_bulk_operations(player_attributes):
+    store = AttributeStore()
+    store.add(UUID(int=1), player_attributes)
+    player_attributes.offensive = OffensiveAttributes(99, 99, 99, 99, 99)
+    store.add(UUID(int=2), player_attributes)
+
+    assert store.sort_by_overall([UUID(int=1), UUID(int=2)], Positions.FW) == [
+        UUID(int=2),
+        UUID(int=1),
+    ]
+
+    store.progress({UUID(int=1): 15, UUID(int=2): [-100] + [0] * (ROW_SIZE - 1)})
+    assert store.get_attributes(UUID(int=1)).offensive.shot_power == 99
+    assert store.get_attributes(UUID(int=1)).gk.reflexes == 35
+    assert store.get_attributes(UUID(int=2)).offensive.shot_power == 0
+    assert store.get_attributes(UUID(int=2)).offensive.penalty == 99
+
+
+def test_generate_players_in_bulk(player_gen: PlayerGenerator):
+    positions = [[position] for position in Positions] * 10
+    nationalities = ["BRA", None] * 20
+    players = player_gen.generate_players(positions, nationalities, 60, 10)
+
+    assert [player.positions for player in players] == positions
+    assert [player.nationality for player in players[::2]] == ["BRA"] * 20
+    for player in players:
+        overall = player.attributes.get_overall(player.positions[0])
+        for group in player.attributes.serialize().values():
+            assert all(25 <= value <= 95 for value in group.values())
+        assert overall <= player.potential_skill <= min(overall + 20, 99)
+        assert player.international_reputation == (
+            player_gen.generate_international_reputation(overall)
+        )
+        # The value is generate_player_value's formula with a base value from 5500 to 8000
+        age = int((player_gen.today - player.dob).days * 0.0027379070)
+        base_value = player.value - (
+            player.international_reputation * 150
+            + player_gen.get_age_diff(age) * 100
+            + overall * 50
+            + player.potential_skill * 10
+        )
+        assert base_value in range(5500, 8001, 100)
+        assert Player.get_from_dict(player.serialize()).serialize() == (
+            player.serialize()
+        )
+
+    store = AttributeStore()
+    stored_players = player_gen.generate_players(positions, nationalities, store=store)
+    assert len(store) == len(positions)
+    for player in stored_players:
+        assert isinstance(player.attributes, StoredPlayerAttributes)
+        assert store.get_attributes(player.player_id) == player.attributes
+
+    with pytest.raises(GeneratePlayerError):
+        player_gen.generate_players(positions, nationalities[:-1])
+
+
+def test_generate_international_reputation(player_gen: PlayerGenerator):
+    skills = [0, 64, 65, 69, 70, 74, 75, 81, 82, 89, 90, 99]
+    assert [
+        player_gen.generate_international_reputation(skill) for skill in skills
+    ] == [
+        0,
+        0,
+        1,
+        1,
+        2,
+        2,
+        3,
+        3,
+        4,
+        4,
+        5,
+        5,
+    ]
+
+
+def test_player_generator_uses_its_own_rng():
+    positions = [[position] for position in Positions] * 5
+    nationalities = [None] * len(positions)
+
+    def generate() -> list[dict]:
+        player_gen = PlayerGenerator(date(2024, 1, 1), rng=random.Random(7))
+        players = player_gen.generate_players(positions, nationalities)
+        players.append(player_gen.generate_player())
+        return [player.serialize() for player in players]
+
+    random_state = random.getstate()
+    players = generate()
+    assert random.getstate() == random_state
+    random.random()
+    assert generate() == players
@@ -38,6 +38,8 @@ def test_get_settings(settings, tmp_path):
         "squads": os.path.join(tmp_path, "res", "db", "squads.json"),
         "players": os.path.join(tmp_path, "res", "db", "players.json"),
         "clubs": os.path.join(tmp_path, "res", "db", "clubs.json"),
+        "database": os.path.join(tmp_path, "res", "db", "ofm.sqlite3"),
+        "snapshot": os.path.join(tmp_path, "res", "db", "world.ofms"),
     }
     settings.create_settings()
     settings.load_settings()
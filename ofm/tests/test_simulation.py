@@ -13,7 +13,10 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import threading
 import uuid
+from copy import deepcopy
 from datetime import timedelta
 
 import pytest
@@ -26,11 +29,26 @@ from ofm.core.football.team_simulation import (
     GameEventType,
 )
 from ofm.core.simulation import PitchPosition
+from ofm.core.simulation.commentary import (
+    Commentary,
+    CommentaryTemplate,
+    get_commentary,
+    no_commentary,
+)
+from ofm.core.simulation.event import EventOutcome
+from ofm.core.simulation.event_log import HOME_TEAM, EventLog
 from ofm.core.simulation.event_type import EventType
 from ofm.core.simulation.events import EventFactory, PassEvent
 from ofm.core.simulation.fixture import Fixture
 from ofm.core.simulation.game_state import GameState, SimulationStatus
+from ofm.core.simulation.match_rules import MATCH_PHASES, MatchRules
 from ofm.core.simulation.simulation import LiveGame, SimulationEngine
+from ofm.core.simulation.team_strategy import (
+    TeamStrategy,
+    get_event_type,
+    get_pass_end_position,
+    team_pass_strategy,
+)
 
 
 class MockSimulationEngine:
@@ -55,7 +73,7 @@ def live_game(monkeypatch, simulation_teams) -> LiveGame:
     )
 
     def get_event_duration(self):
-        return timedelta(seconds=5)
+        return 5
 
     monkeypatch.setattr(SimulationEngine, "run", get_simulation_engine)
     monkeypatch.setattr(SimulationEngine, "get_event_duration", get_event_duration)
@@ -340,3 +358,343 @@ def test_get_player_on_pitch(live_game):
             player = home_team.get_player_on_pitch(position)
             assert isinstance(player, PlayerSimulation) is True
             assert player != unable_player
+
+
+def get_live_game(simulation_teams, seed: int) -> LiveGame:
+    home_team, away_team = deepcopy(simulation_teams)
+    fixture = Fixture(
+        uuid.uuid4(),
+        uuid.uuid4(),
+        home_team.club.club_id,
+        away_team.club.club_id,
+        home_team.club.stadium,
+    )
+    return LiveGame(fixture, home_team, away_team, False, False, True, seed=seed)
+
+
+def get_match_events(live_game: LiveGame) -> list:
+    return [
+        (event.event_type, event.outcome, event.state.minutes)
+        for event in live_game.engine.event_history
+    ]
+
+
+def test_same_seed_gives_same_match(simulation_teams):
+    first_game = get_live_game(simulation_teams, 42)
+    second_game = get_live_game(simulation_teams, 42)
+    first_game.run()
+    second_game.run()
+    assert get_match_events(first_game) == get_match_events(second_game)
+    assert first_game.engine.home_team.stats == second_game.engine.home_team.stats
+    assert first_game.engine.away_team.stats == second_game.engine.away_team.stats
+
+
+def test_seed_defaults_to_fixture_id(simulation_teams):
+    seeded_game = get_live_game(simulation_teams, 42)
+    home_team, away_team = deepcopy(simulation_teams)
+    fixture = Fixture(
+        uuid.UUID(int=42),
+        uuid.uuid4(),
+        home_team.club.club_id,
+        away_team.club.club_id,
+        home_team.club.stadium,
+    )
+    default_game = LiveGame(fixture, home_team, away_team, False, False, True)
+    seeded_game.run()
+    default_game.run()
+    assert get_match_events(seeded_game) == get_match_events(default_game)
+
+
+def test_game_state_copy_is_independent():
+    game_state = GameState(
+        timedelta(minutes=10),
+        SimulationStatus.FIRST_HALF,
+        PitchPosition.MIDFIELD_CENTER,
+    )
+    state_copy = game_state.copy()
+    state_copy.position = PitchPosition.OFF_BOX
+    state_copy.minutes += timedelta(seconds=5)
+    assert state_copy != game_state
+    assert game_state.position == PitchPosition.MIDFIELD_CENTER
+    assert game_state.minutes == timedelta(minutes=10)
+
+
+def test_game_state_evolve():
+    game_state = GameState(
+        timedelta(minutes=45),
+        SimulationStatus.FIRST_HALF,
+        PitchPosition.MIDFIELD_CENTER,
+        True,
+        timedelta(minutes=1),
+    )
+    new_state = game_state.evolve(position=PitchPosition.DEF_BOX)
+    assert new_state.position == PitchPosition.DEF_BOX
+    assert new_state.minutes == game_state.minutes
+    assert new_state.additional_time_elapsed == game_state.additional_time_elapsed
+    assert game_state.position == PitchPosition.MIDFIELD_CENTER
+    with pytest.raises(AttributeError):
+        game_state.evolve(unknown_field=1)
+
+
+def test_player_stats_update_team_stats(simulation_teams):
+    home_team, _ = simulation_teams
+    player = home_team.formation.fw[0]
+    passes = home_team.stats.passes
+    player.statistics.passes += 1
+    player.statistics.passes += 1
+    assert home_team.stats.passes == passes + 2
+    assert home_team.check_stats()
+
+
+def test_team_stats_are_consistent_after_game(simulation_teams):
+    live_game = get_live_game(simulation_teams, 42)
+    live_game.run()
+    assert live_game.engine.home_team.check_stats()
+    assert live_game.engine.away_team.check_stats()
+
+
+def test_get_player_on_pitch_excludes_player_in_possession(live_game):
+    home_team = live_game.engine.home_team
+    home_team.player_in_possession = home_team.formation.mf[0]
+    for _ in range(500):
+        for position in list(PitchPosition):
+            player = home_team.get_player_on_pitch(position)
+            assert player is not home_team.player_in_possession
+
+
+def test_get_player_on_pitch_after_substitution(live_game):
+    home_team = live_game.engine.home_team
+    home_team.get_player_on_pitch(PitchPosition.MIDFIELD_CENTER)
+    player_in = home_team.formation.bench[-1]
+    player_out = home_team.formation.fw[0]
+    home_team.sub_player(
+        player_out, player_in, timedelta(minutes=45), timedelta(minutes=0)
+    )
+    players = {
+        id(home_team.get_player_on_pitch(PitchPosition.OFF_BOX)) for _ in range(2000)
+    }
+    assert id(player_in) in players
+    assert id(player_out) not in players
+
+
+def test_compiled_strategies_skip_impossible_positions():
+    rng = random.Random(1)
+    for strategy in TeamStrategy:
+        transition_matrix = team_pass_strategy(strategy)
+        for position in PitchPosition:
+            probabilities = transition_matrix[position]
+            for _ in range(200):
+                end_position = get_pass_end_position(strategy, position, rng)
+                assert probabilities[end_position.value] > 0
+
+
+def test_compiled_general_strategy_does_not_shoot_from_defense():
+    rng = random.Random(1)
+    for _ in range(1000):
+        event_type = get_event_type(
+            TeamStrategy.NORMAL,
+            TeamStrategy.NORMAL,
+            PitchPosition.DEF_BOX,
+            rng,
+        )
+        assert event_type != EventType.SHOT
+
+
+def test_game_state_clock_is_kept_in_seconds():
+    game_state = GameState(
+        timedelta(minutes=10),
+        SimulationStatus.FIRST_HALF,
+        PitchPosition.MIDFIELD_CENTER,
+        False,
+        timedelta(seconds=30),
+    )
+    assert game_state.seconds == 600
+    assert game_state.additional_seconds == 30
+    game_state.minutes += timedelta(seconds=5)
+    assert game_state.seconds == 605
+    assert game_state.minutes == timedelta(minutes=10, seconds=5)
+    assert game_state.additional_time_elapsed == timedelta(seconds=30)
+
+
+def test_add_minutes_stops_the_clock_at_the_end_of_the_half(live_game):
+    live_game.state = GameState(
+        44 * 60 + 58,
+        SimulationStatus.FIRST_HALF,
+        PitchPosition.MIDFIELD_CENTER,
+    )
+    live_game.add_minutes()
+    assert live_game.state.seconds == 45 * 60
+    assert live_game.state.additional_seconds == 3
+    assert live_game.total_elapsed_time == timedelta(seconds=5)
+    live_game.transition_game_status()
+    assert live_game.state.in_additional_time
+    assert live_game.added_time == timedelta(seconds=live_game.added_seconds)
+
+
+def test_match_phases_cover_every_status():
+    assert set(MATCH_PHASES) == set(SimulationStatus)
+    for status, phase in MATCH_PHASES.items():
+        assert phase.status == status
+
+
+def test_game_goes_to_penalties_without_extra_time(live_game):
+    live_game.rules = MatchRules(extra_time=False, penalties=True)
+    live_game.run()
+    assert live_game.minutes == timedelta(minutes=90)
+    assert live_game.penalty_shootout is True
+    assert live_game.state.status == SimulationStatus.FINISHED
+    home_team, away_team = live_game.engine.home_team, live_game.engine.away_team
+    assert home_team.penalty_shootout_score != away_team.penalty_shootout_score
+
+
+def test_game_goes_to_penalties_after_extra_time(live_game):
+    live_game.rules = MatchRules(extra_time=True, penalties=False)
+    live_game.run()
+    assert live_game.minutes >= timedelta(minutes=120)
+    assert live_game.penalty_shootout is True
+    assert live_game.state.status == SimulationStatus.FINISHED
+
+
+def test_game_ends_with_golden_goal(live_game, player_sim):
+    live_game.no_break = False
+    live_game.rules = MatchRules(extra_time=True, penalties=True, golden_goal=True)
+    live_game.run()  # first half
+    live_game.run()  # second half
+    assert live_game.state.status == SimulationStatus.SECOND_HALF_BREAK
+    live_game.engine.home_team.add_goal(player_sim, timedelta(minutes=91))
+    live_game.run()
+    assert live_game.state.status == SimulationStatus.FINISHED
+    assert live_game.minutes < timedelta(minutes=105)
+    assert live_game.penalty_shootout is False
+
+
+def test_two_legged_tie_goes_to_extra_time_on_aggregate(live_game, player_sim):
+    live_game.no_break = False
+    live_game.rules = MatchRules(extra_time=True, first_leg_score=(0, 1))
+    live_game.run()  # first half
+    live_game.engine.home_team.add_goal(player_sim, timedelta(minutes=45))
+    live_game.run()  # second half
+    assert live_game.state.status == SimulationStatus.SECOND_HALF_BREAK
+
+
+def test_two_legged_tie_is_decided_on_away_goals():
+    rules = MatchRules(first_leg_score=(1, 2), away_goals_rule=True)
+    assert rules.get_aggregate_score(1, 0) == (2, 2)
+    assert rules.is_tie(1, 0) is False
+    assert rules.is_tie(2, 1) is True
+    assert MatchRules(first_leg_score=(1, 2)).is_tie(1, 0) is True
+
+
+def test_event_log_records_the_same_events(simulation_teams):
+    history_game = get_live_game(simulation_teams, 42)
+    history_game.run()
+
+    streamed = []
+    event_log = EventLog(streamed.append)
+    log_game = get_live_game(simulation_teams, 42)
+    log_game.engine = SimulationEngine(
+        log_game.engine.home_team,
+        log_game.engine.away_team,
+        5,
+        42,
+        event_log,
+    )
+    log_game.run()
+
+    assert log_game.engine.event_history == []
+    assert log_game.engine.last_event is not None
+    assert list(event_log) == streamed
+    assert len(event_log) == len(history_game.engine.event_history)
+    assert [(record.event_type, record.outcome) for record in event_log] == [
+        (event.event_type, event.outcome) for event in history_game.engine.event_history
+    ]
+    goals = [record for record in event_log if record.outcome == EventOutcome.GOAL]
+    home_goals = [record for record in goals if record.team == HOME_TEAM]
+    assert (
+        len(goals) == log_game.engine.home_team.score + log_game.engine.away_team.score
+    )
+    assert len(home_goals) == log_game.engine.home_team.score
+    scorer = (
+        event_log.get_player(home_goals[0].attacking_player) if home_goals else None
+    )
+    assert scorer is None or scorer in log_game.engine.home_team.formation.all_players
+
+
+def test_event_log_without_records_only_streams(simulation_teams):
+    streamed = []
+    event_log = EventLog(streamed.append, keep_records=False)
+    live_game = get_live_game(simulation_teams, 1)
+    live_game.engine = SimulationEngine(
+        live_game.engine.home_team, live_game.engine.away_team, 5, 1, event_log
+    )
+    live_game.run()
+    assert len(event_log) == 0
+    assert len(streamed) > 0
+    assert streamed[-1].seconds >= streamed[0].seconds
+
+
+def test_commentary_is_rendered_on_demand(player_sim):
+    commentary = Commentary()
+    commentary.add(CommentaryTemplate.PASS, player_sim, player_sim)
+    commentary.add(CommentaryTemplate.PENALTY_KICK)
+    assert commentary.render() == [
+        f"{player_sim} passed the ball to {player_sim}",
+        "Penalty Kick!",
+    ]
+    assert list(commentary) == commentary.render()
+
+
+def test_no_commentary_mode(simulation_teams):
+    commented_game = get_live_game(simulation_teams, 42)
+    commented_game.run()
+    silent_game = get_live_game(simulation_teams, 42)
+    with no_commentary():
+        silent_game.run()
+
+    assert any(len(event.commentary) for event in commented_game.engine.event_history)
+    assert all(len(event.commentary) == 0 for event in silent_game.engine.event_history)
+    assert get_match_events(commented_game) == get_match_events(silent_game)
+    assert get_commentary() is not silent_game.engine.event_history[-1].commentary
+
+
+def test_no_commentary_does_not_affect_other_threads(simulation_teams):
+    watched_game = get_live_game(simulation_teams, 42)
+    with no_commentary():
+        thread = threading.Thread(target=watched_game.run)
+        thread.start()
+        thread.join()
+        assert len(get_commentary()) == 0
+
+    assert any(len(event.commentary) for event in watched_game.engine.event_history)
+
+
+def test_simulation_objects_are_slotted(simulation_teams):
+    live_game = get_live_game(simulation_teams, 42)
+    live_game.run()
+    home_team = live_game.engine.home_team
+    player = home_team.formation.players[0]
+    objects = [
+        player,
+        player.statistics,
+        home_team.stats,
+        live_game.state,
+        *home_team.game_events,
+        *live_game.engine.event_history,
+    ]
+    assert all(not hasattr(obj, "__dict__") for obj in objects)
+
+
+def test_copied_player_stats_keep_team_stats(simulation_teams):
+    home_team, _ = simulation_teams
+    player = home_team.formation.players[5]
+    player.statistics.passes += 3
+    team_passes = home_team.stats.passes
+
+    copied_team = deepcopy(home_team)
+    copied_player = copied_team.formation.players[5]
+    assert copied_team.stats.passes == team_passes
+    assert copied_player.statistics.team_stats is copied_team.stats
+
+    copied_player.statistics.passes += 1
+    assert copied_team.stats.passes == team_passes + 1
+    assert home_team.stats.passes == team_passes
@@ -13,9 +13,12 @@
 #
 #      You should have received a copy of the GNU General Public License
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import copy
 import datetime
+import random
 import uuid
 
+from ..core.db import generators
 from ..core.db.generators import TeamGenerator
 from ..core.football.club import Club, PlayerTeam
 
@@ -55,3 +58,31 @@ def test_generate_team_squads(squads_def, confederations_file):
         assert isinstance(club, Club)
         for player in club.squad:
             assert isinstance(player, PlayerTeam)
+
+
+def test_generate_team_squads_is_reproducible(
+    squads_def, confederations_file, monkeypatch
+):
+    monkeypatch.setattr(generators, "MIN_CLUBS_PER_WORKER", 1)
+
+    def generate(max_workers: int) -> list[dict]:
+        team_gen = TeamGenerator(
+            copy.deepcopy(squads_def),
+            confederations_file,
+            datetime.date(2024, 1, 1),
+            seed=42,
+        )
+        clubs = team_gen.generate(max_workers)
+        assert [club["id"] for club in team_gen.club_definitions] == [
+            club.club_id.int for club in clubs
+        ]
+        return [
+            [club.serialize()] + [player.serialize() for player in club.squad]
+            for club in clubs
+        ]
+
+    random_state = random.getstate()
+    clubs = generate(1)
+    assert random.getstate() == random_state
+    assert generate(1) == clubs
+    assert generate(2) == clubs
@@ -15,11 +15,13 @@
 #      along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import random
 import uuid
+from copy import deepcopy
 from datetime import timedelta
 from threading import Thread
 from typing import Optional
 
 from ...core.db.database import DB
+from ...core.db.repository import ClubRepository
 from ...core.football.formation import Formation
 from ...core.football.player import PlayerSimulation
 from ...core.football.team_simulation import TeamSimulation, TeamStrategy
@@ -35,6 +37,7 @@ class DebugMatchController(ControllerInterface):
         self.controller = controller
         self.page = page
         self.db = db
+        self.repository: Optional[ClubRepository] = None
         self.teams: Optional[list[TeamSimulation]] = None
         self.live_game: Optional[LiveGame] = None
         self.game_thread: Optional[Thread] = None
@@ -104,20 +107,23 @@ class DebugMatchController(ControllerInterface):
         Naive implementation of loading random teams. We can transfer this to a
         Core module later to avoid having the low-level implementation on the Controller side.
         """
-        # Creates files if they don't exist
-        self.db.check_clubs_file(amount=50)
+        if self.repository is None:
+            # Creates files if they don't exist
+            self.db.check_clubs_file(amount=50)
+            self.repository = ClubRepository(self.db)
 
-        clubs = self.db.load_clubs()
-        players = self.db.load_players()
-
-        clubs = random.sample(clubs, 2)
-        team1, team2 = self.db.load_club_objects(clubs, players)
+        # Only the squads of the two clubs are loaded. The match changes the players'
+        # stamina and injuries, so it is played on copies and every debug match starts
+        # from the clubs as they are in the database.
+        club_ids = random.sample(self.repository.get_club_ids(), 2)
+        team1, team2 = deepcopy(self.repository.get_clubs(club_ids))
 
         formation_team1 = Formation(team1.default_formation)
         formation_team2 = Formation(team2.default_formation)
 
-        formation_team1.get_best_players(team1.squad)
-        formation_team2.get_best_players(team2.squad)
+        # get_best_players removes the players from the list
+        formation_team1.get_best_players(list(team1.squad))
+        formation_team2.get_best_players(list(team2.squad))
 
         return [
             TeamSimulation(
@@ -256,13 +262,14 @@ class DebugMatchController(ControllerInterface):
             return
 
         events = []
+        commentary_verbosity = self.update_commentary_verbosity()
         for event in self.live_game.engine.event_history:
+            if event.commentary_importance not in commentary_verbosity:
+                continue
             minutes = event.state.minutes.total_seconds() / 60
             commentary = ""
-            for comment in event.commentary:
-                commentary_verbosity = self.update_commentary_verbosity()
-                if event.commentary_importance in commentary_verbosity:
-                    commentary += comment + "\n"
+            for comment in event.commentary.render():
+                commentary += comment + "\n"
             if commentary:
                 events.append(f"{int(minutes)}' - {commentary}")
 